@@ -0,0 +1,145 @@
+# STRESS TEST: Parallel checkouts.
+#
+# OBJECTIVE: To verify that checkouts running in parallel neither collide nor fail, by:
+#            1. Seeding a small scratch database (see "load_test.py").
+#            2. Running many checkouts at once: each of several threads repeatedly fills its own user's cart and checks out
+#               (via "update_database_with_trans", as the "checkout_successful" route does), all against the same products.
+#            3. Checking that every checkout succeeded, that every order ID assigned is unique, that every order (and its
+#               order details) was committed, that quantities in stock were reduced by exactly the quantities ordered, that
+#               the in-memory catalog snapshot (patched after each checkout) agrees with the database, and that the sales
+#               rollups (updated by each checkout) agree with rollups rebuilt from all orders.
+#            With "--qty-in-stock", every product starts with only that quantity in stock, so that later checkouts fall
+#            short: those checkouts must fail (leaving no trace), and no quantity in stock may fall below zero.
+#
+# USAGE: python benchmarks/checkout_stress.py [--db PATH | --database-uri URI] [--threads N] [--checkouts N] [--products-per-cart N]
+#                                             [--qty-in-stock N]  (exits with a non-zero status if any check fails)
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy import insert
+
+import load_test
+
+# Define constant for the number of products seeded (all checkouts order from the same few products, to maximize contention):
+PRODUCT_COUNT = 20
+
+
+def run_checkouts(user_id, checkouts, products_per_cart, rng, start_barrier, order_ids, failures):
+    """Function to repeatedly fill one user's cart and check out, recording the order ID assigned by each checkout"""
+    main = load_test.main
+    start_barrier.wait()
+    for _ in range(checkouts):
+        with main.app.test_request_context("/"):
+            # Fill the user's cart:
+            product_ids = rng.sample(range(1, PRODUCT_COUNT + 1), products_per_cart)
+            main.db.session.execute(insert(main.CartDetails), [{"user_id": user_id, "product_id": product_id, "qty_ordered": 1, "uom_id": 1,
+                                                                "unit_price": 1.0, "sales_amt": 1.0, "unit_price_updated": False}
+                                                               for product_id in product_ids])
+            main.db.session.commit()
+
+            # Check out:
+            order_id = main.update_database_with_trans("create_order", user_id=user_id)
+            if order_id is False:
+                failures.append(f"User {user_id}: checkout failed (see system log)")
+
+                # Empty the cart, so that the next checkout starts afresh:
+                main.db.session.execute(main.db.delete(main.CartDetails).where(main.CartDetails.user_id == user_id))
+                main.db.session.commit()
+            else:
+                order_ids.append((order_id, user_id, tuple(product_ids)))
+
+
+def read_sales_rollups():
+    """Function to return the contents of each sales rollup table (with amounts rounded to the cent, since amounts summed in a different order may differ in the last digits)"""
+    main = load_test.main
+    with main.app.app_context():
+        return {model.__tablename__: sorted(tuple(round(value, 2) if isinstance(value, float) else value for value in row)
+                                            for row in main.db.session.execute(main.db.select(*model.__table__.columns)).all())
+                for model in (main.SalesByCategory, main.SalesByDay, main.SalesByProduct)}
+
+
+def main_checkout_stress():
+    """Main function for this stress test"""
+    parser = argparse.ArgumentParser(description="Stress test parallel checkouts.")
+    parser.add_argument("--db", help="path of the scratch SQLite database (default: a temporary file)")
+    parser.add_argument("--database-uri", help="URI of an empty, throwaway database, for backends other than SQLite (overrides --db)")
+    parser.add_argument("--threads", type=int, default=16, help="number of threads checking out in parallel (default: 16)")
+    parser.add_argument("--checkouts", type=int, default=25, help="number of checkouts per thread (default: 25)")
+    parser.add_argument("--products-per-cart", type=int, default=3, help="number of products in each cart (default: 3)")
+    parser.add_argument("--qty-in-stock", type=int, help="quantity in stock of every product at the start (default: as seeded, which is enough for every checkout)")
+    args = parser.parse_args()
+
+    database_uri = args.database_uri or "sqlite:///" + os.path.abspath(args.db or os.path.join(tempfile.mkdtemp(prefix="checkout_stress_"), "shop.db"))
+    load_test.import_app(database_uri)
+    main = load_test.main
+    load_test.seed_database(products=PRODUCT_COUNT, users=args.threads + 1, order_details=100, rng=random.Random(0))
+    assert main.rebuild_sales_rollups()
+    with main.app.app_context():
+        if args.qty_in_stock is not None:
+            main.db.session.execute(main.db.update(main.Products).values(qty_in_stock=args.qty_in_stock))
+            main.db.session.commit()
+        stock_before = dict(main.db.session.execute(main.db.select(main.Products.product_id, main.Products.qty_in_stock)).all())
+        order_ids_before = set(main.db.session.execute(main.db.select(main.Orders.order_id)).scalars().all())
+
+        # Build the catalog snapshot, so that each checkout patches it with the reduced quantities in stock:
+        main.get_catalog_snapshot()
+
+    # Run the checkouts (users 2 and above, one per thread), starting all threads at once:
+    order_ids = []
+    failures = []
+    start_barrier = threading.Barrier(args.threads)
+    threads = [threading.Thread(target=run_checkouts, args=(2 + i, args.checkouts, args.products_per_cart, random.Random(i), start_barrier, order_ids, failures))
+               for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    attempted = args.threads * args.checkouts
+    print(f"{attempted} checkouts by {args.threads} thread(s) in {elapsed:.1f} s: {len(order_ids) / elapsed:.1f} checkouts/s")
+
+    # Check the results against the database:
+    with main.app.app_context():
+        orders = dict(main.db.session.execute(main.db.select(main.Orders.order_id, main.Orders.user_id).where(main.Orders.order_id.not_in(order_ids_before))).all())
+        order_detail_counts = dict(main.db.session.execute(main.db.select(main.OrderDetails.order_id, main.func.count()).where(main.OrderDetails.order_id.in_(list(orders))).group_by(main.OrderDetails.order_id)).all())
+        stock_after = dict(main.db.session.execute(main.db.select(main.Products.product_id, main.Products.qty_in_stock)).all())
+    catalog_stock_after = {product.product_id: product.qty_in_stock for product in main.catalog_snapshot_state["snapshot"].products}
+    sales_rollups_after = read_sales_rollups()
+    assert main.rebuild_sales_rollups()
+    sales_rollups_rebuilt = read_sales_rollups()
+
+    qty_ordered = {product_id: 0 for product_id in stock_before}
+    for _, _, product_ids in order_ids:
+        for product_id in product_ids:
+            qty_ordered[product_id] += 1
+
+    if args.qty_in_stock is None:
+        checks = [("every checkout succeeded", len(order_ids) == attempted and not failures)]
+    else:
+        checks = [("checkouts succeeded until stock ran short, then failed", 0 < len(order_ids) < attempted and len(order_ids) + len(failures) == attempted),
+                  ("no quantity in stock fell below zero", all(qty_in_stock >= 0 for qty_in_stock in stock_after.values()))]
+    checks += [
+        ("every order ID assigned is unique", len({order_id for order_id, _, _ in order_ids}) == len(order_ids)),
+        ("every order was committed, for the user who checked out", all(orders.get(order_id) == user_id for order_id, user_id, _ in order_ids) and len(orders) == len(order_ids)),
+        ("every order's details were committed", all(order_detail_counts.get(order_id) == len(product_ids) for order_id, _, product_ids in order_ids)),
+        ("quantities in stock were reduced by exactly the quantities ordered", all(stock_before[product_id] - stock_after[product_id] == qty_ordered[product_id] for product_id in stock_before)),
+        ("the catalog snapshot's quantities in stock match the database", catalog_stock_after == stock_after),
+        ("the sales rollups match rollups rebuilt from all orders", sales_rollups_after == sales_rollups_rebuilt),
+    ]
+    for description, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'}    {description}")
+    if args.qty_in_stock is None:
+        for failure in failures[:10]:
+            print(failure)
+    sys.exit(0 if all(passed for _, passed in checks) else 1)
+
+
+if __name__ == "__main__":
+    main_checkout_stress()
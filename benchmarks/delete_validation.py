@@ -0,0 +1,85 @@
+# BENCHMARK: Time taken to check whether records can be deleted, loading referencing rows vs. "EXISTS" queries.
+#
+# OBJECTIVE: To measure, for records referenced by many other records (e.g., a product ordered thousands of times), the time
+#            taken by "validate_delete" to decide that the record cannot be deleted when:
+#            1. Every referencing row is loaded (as database objects) from each referencing table, and the resulting list
+#               compared to an empty list (as "validate_delete" once did).
+#            2. One query of "EXISTS" subqueries checks all referencing tables at once (as "validate_delete" does).
+#            Then, to measure checking every product at once: one "validate_delete" call per product vs. one batch check
+#            via "get_referenced_ids".  All run against a seeded scratch database (see "load_test.py").
+#
+# USAGE: python benchmarks/delete_validation.py [--products N] [--order-details N] [--repeats N]
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import load_test
+
+# Define the referencing tables checked for each entity, as the models and columns which reference the entity's ID (in the
+# order checked by "validate_delete" before it used "EXISTS" queries):
+REFERENCING_COLUMNS = {
+    "prod_cat": [("Products", "category_id")],
+    "product": [("CartDetails", "product_id"), ("OrderDetails", "product_id")],
+    "uom": [("CartDetails", "uom_id"), ("OrderDetails", "uom_id"), ("Products", "uom_id")],
+    "user": [("Orders", "user_id"), ("CartDetails", "user_id")],
+}
+
+
+def validate_delete_by_loading_rows(entity, record_id):
+    """Function to check whether a record can be deleted by loading every row which references it, one referencing table at a time"""
+    main = load_test.main
+    for model_name, column_name in REFERENCING_COLUMNS[entity]:
+        model = getattr(main, model_name)
+        if main.db.session.execute(main.db.select(model).where(getattr(model, column_name) == record_id)).scalars().all() != []:
+            return False
+    return True
+
+
+def time_runs(function, repeats):
+    """Function to return the median time taken (in milliseconds) by a function, each run in a new request"""
+    main = load_test.main
+    times_ms = []
+    for _ in range(repeats):
+        with main.app.test_request_context("/"):
+            start = time.perf_counter()
+            result = function()
+            times_ms.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times_ms), result
+
+
+def main_delete_validation():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the time taken to check whether records can be deleted, loading referencing rows vs. EXISTS queries.")
+    parser.add_argument("--products", type=int, default=20, help="number of products seeded (default: 20)")
+    parser.add_argument("--order-details", type=int, default=100000, help="number of order details seeded (default: 100000)")
+    parser.add_argument("--repeats", type=int, default=5, help="number of timed runs per check (default: 5)")
+    args = parser.parse_args()
+
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="delete_validation_"), "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=args.products, users=50, order_details=args.order_details, rng=random.Random(0))
+
+    # Check one referenced record of each entity:
+    print(f"{'check':<24}{'loading rows (ms)':>20}{'EXISTS (ms)':>14}")
+    for entity, record_id in [("prod_cat", 1), ("product", 1), ("uom", 1), ("user", 2)]:
+        loading_ms, loading_result = time_runs(lambda: validate_delete_by_loading_rows(entity, record_id), args.repeats)
+        exists_ms, (exists_result, _) = time_runs(lambda: main.validate_delete(entity, **{f"{entity}_id": record_id}), args.repeats)
+        assert loading_result == exists_result
+        print(f"{entity + ' ' + str(record_id):<24}{loading_ms:>20.1f}{exists_ms:>14.2f}")
+
+    # Check every product at once:
+    product_ids = list(range(1, args.products + 1))
+    one_by_one_ms, one_by_one_result = time_runs(lambda: {product_id for product_id in product_ids if not main.validate_delete("product", product_id=product_id)[0]}, args.repeats)
+    batch_ms, batch_result = time_runs(lambda: main.get_referenced_ids("product", product_ids), args.repeats)
+    assert one_by_one_result == batch_result
+    print(f"\nAll {len(product_ids)} products: one \"validate_delete\" call each {one_by_one_ms:.1f} ms, one \"get_referenced_ids\" call {batch_ms:.1f} ms "
+          f"({len(batch_result)} referenced)")
+
+
+if __name__ == "__main__":
+    main_delete_validation()
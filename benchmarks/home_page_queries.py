@@ -0,0 +1,97 @@
+# CHECK: SQL statements run by the home page, as the number of product categories grows.
+#
+# OBJECTIVE: To verify that the home page retrieves the products of all active product categories via a fixed number of
+#            SQL statements (rather than one query per product category), by:
+#            1. Seeding a scratch database (see "load_test.py") with each number of active product categories in turn (by
+#               default, 5, 40, and 200, each with 10 products per category), emptying the database between sizes.
+#            2. Requesting the home page as an anonymous visitor, counting the SQL statements run: once with every in-memory
+#               copy of catalog data discarded beforehand (the cached page, the active product categories, and the catalog
+#               snapshot, which is rebuilt by the request), and once with only the cached page and active product categories
+#               discarded (so the products are served by the catalog snapshot).
+#            3. Checking that every product category is shown, and that each count is the same for every number of categories.
+#
+# USAGE: python benchmarks/home_page_queries.py [--prod-cats N [N ...]] [--products-per-category N]  (exits with a non-zero status if any check fails)
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import sys
+import tempfile
+from sqlalchemy import event
+
+import load_test
+
+
+def clear_database():
+    """Function to delete all rows seeded into the scratch database (children before parents)"""
+    main = load_test.main
+    with main.app.app_context():
+        for model in (main.CartDetails, main.OrderDetails, main.Orders, main.Products, main.ProductCategories, main.UnitsOfMeasure, main.Users):
+            main.db.session.execute(main.db.delete(model))
+        main.db.session.commit()
+
+
+def count_home_page_statements(client, discard_snapshot, statements):
+    """Function to request the home page with in-memory copies of catalog data discarded, returning the response and the number of SQL statements run"""
+    main = load_test.main
+
+    # Discard the cached rendering of the home page and the cached active product categories (and, if desired, the
+    # catalog snapshot, so that it is rebuilt by the request):
+    main.invalidate_active_product_categories_cache()
+    with main.page_cache_lock:
+        main.page_cache["pages"].clear()
+        main.page_cache["bytes"] = 0
+    if discard_snapshot:
+        with main.catalog_snapshot_lock:
+            main.catalog_snapshot_state["snapshot"] = None
+
+    del statements[:]
+    response = client.get("/")
+    return response, len(statements)
+
+
+def main_home_page_queries():
+    """Main function for this check"""
+    parser = argparse.ArgumentParser(description="Check that the home page runs a fixed number of SQL statements, however many product categories there are.")
+    parser.add_argument("--prod-cats", type=int, nargs="+", default=[5, 40, 200], help="numbers of active product categories seeded in turn (default: 5 40 200)")
+    parser.add_argument("--products-per-category", type=int, default=10, help="number of products seeded per product category (default: 10)")
+    args = parser.parse_args()
+
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="home_page_queries_"), "shop.db"))
+    main = load_test.main
+    statements = []
+    with main.app.app_context():
+        event.listen(main.db.engine, "before_cursor_execute", lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement))
+
+    # Request the home page against each number of product categories:
+    counts = {}
+    checks = []
+    print(f"{'categories':>12}{'products':>10}{'statements (snapshot rebuilt)':>32}{'statements (from snapshot)':>29}")
+    for prod_cats in args.prod_cats:
+        clear_database()
+        products = prod_cats * args.products_per_category
+        load_test.seed_database(products=products, users=2, order_details=0, rng=random.Random(0), prod_cats=prod_cats)
+        client = main.app.test_client()
+        client.get("/")  # Warm up (e.g., compile templates).
+
+        cold_response, cold_count = count_home_page_statements(client, True, statements)
+        warm_response, warm_count = count_home_page_statements(client, False, statements)
+        counts[prod_cats] = (cold_count, warm_count)
+        print(f"{prod_cats:>12}{products:>10}{cold_count:>32}{warm_count:>29}")
+
+        # Check that every product category is shown (each as a tab, whichever way the products were retrieved):
+        checks.append((f"all {prod_cats} product categories are shown", all(response.status_code == 200 and response.data.count(b'data-bs-toggle="pill"') == prod_cats
+                                                                           for response in (cold_response, warm_response))))
+
+    checks.append(("the statements run with the catalog snapshot rebuilt are the same for every number of categories", len({cold for cold, _ in counts.values()}) == 1))
+    checks.append(("the statements run with the products served by the catalog snapshot are the same for every number of categories", len({warm for _, warm in counts.values()}) == 1))
+
+    print()
+    for description, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'}    {description}")
+    sys.exit(0 if all(passed for _, passed in checks) else 1)
+
+
+if __name__ == "__main__":
+    main_home_page_queries()
@@ -0,0 +1,257 @@
+# BENCHMARK: Load test of the shop's main user journeys.
+#
+# OBJECTIVE: To measure the throughput of this website under concurrent use, reproducibly, by:
+#            1. Seeding a scratch database (created via "config_database", so its schema matches "shop.db") with
+#               realistic volumes of product categories, products, users, orders, and order details.
+#            2. Driving the real routes through the Flask test client with concurrent virtual users, each of which
+#               repeatedly browses the home page, views a product, adds it to the cart, views the cart, and checks out
+#               (with Stripe stubbed, so no payment requests leave this machine).
+#            3. Reporting requests per second, p50/p95/p99 latency per route, and SQL statements per request.
+#
+# USAGE: python benchmarks/load_test.py [--db PATH | --database-uri URI] [--products N] [--users N] [--order-details N]
+#                                       [--virtual-users N] [--iterations N] [--seed N]
+#
+# NOTE: Seeding the default volumes takes a while.  Pass "--db PATH" to keep the seeded database, and pass the same
+#       path again to reuse it (a database which already holds products is never re-seeded).  To load test against
+#       another database backend, pass the URI of an empty, throwaway database (e.g., a local PostgreSQL database).
+
+# Import necessary libraries:
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert
+from types import SimpleNamespace
+
+# Define constant for the directory containing this application:
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Define constants for the data seeded into the scratch database:
+SEED_PASSWORD = "load-test"
+SEED_PROD_CAT_COUNT = 20
+SEED_DETAILS_PER_ORDER = 5
+SEED_BATCH_SIZE = 10000
+
+# Define constant for the order in which routes are reported:
+ROUTES = ["/", "/view_product", "/view_product (add to cart)", "/cart", "/checkout", "/checkout_successful"]
+
+# Initialize variable to represent this application's "main" module (imported once the database URI has been set):
+main = None
+
+# Initialize per-thread state, used to attribute each SQL statement executed to the route being requested:
+request_state = threading.local()
+
+
+def import_app(database_uri):
+    """Function to import this application, pointed at the scratch database, with Stripe stubbed and CSRF protection disabled"""
+    global main
+
+    # Point the application at the scratch database before it is configured (which takes place upon import):
+    os.environ["DATABASE_URI"] = database_uri
+    os.environ.setdefault("SECRET_KEY_FOR_CSRF_PROTECTION", "load-test")
+    os.environ.setdefault("SITE_DOMAIN", "http://localhost")  # Used to build the (stubbed) Stripe checkout's return URLs.
+    sys.path.insert(0, APP_DIR)
+    os.chdir(APP_DIR)
+    import main as app_main
+    main = app_main
+
+    # Virtual users post forms directly, without first retrieving the CSRF tokens embedded in the forms:
+    main.app.config["WTF_CSRF_ENABLED"] = False
+
+    # Stub the Stripe calls made during checkout:
+    main.stripe.TaxRate.create = lambda **kwargs: SimpleNamespace(id="txr_load_test")
+    main.stripe.checkout.Session.create = lambda **kwargs: SimpleNamespace(url=kwargs["success_url"])
+
+
+def seed_database(products, users, order_details, rng, prod_cats=SEED_PROD_CAT_COUNT):
+    """Function to seed the scratch database with product categories, units of measure, products, users, orders, and order details"""
+    db = main.db
+    password_hash = main.generate_password_hash(SEED_PASSWORD, method='pbkdf2:sha256', salt_length=8)  # Hashed once (as this application hashes passwords), since hashing is deliberately slow.
+
+    def insert_rows(model, rows):
+        for i in range(0, len(rows), SEED_BATCH_SIZE):
+            db.session.execute(insert(model), rows[i:i + SEED_BATCH_SIZE])
+
+    with main.app.app_context():
+        insert_rows(main.UnitsOfMeasure, [{"uom_id": 1, "code": "EA", "description": "Each"},
+                                          {"uom_id": 2, "code": "DZ", "description": "Dozen"}])
+        insert_rows(main.ProductCategories, [{"category_id": i, "name": f"Category {i:02d}", "description": f"Desserts of type {i}", "active": True}
+                                             for i in range(1, prod_cats + 1)])
+
+        product_rows = []
+        for i in range(1, products + 1):
+            unit_price_regular = round(rng.uniform(1, 60), 2)
+            product_rows.append({"product_id": i,
+                                 "name": f"Product {i:06d}",
+                                 "category_id": rng.randint(1, prod_cats),
+                                 "unit_price_regular": unit_price_regular,
+                                 "unit_price_discounted": round(unit_price_regular * 0.8, 2) if rng.random() < 0.2 else None,
+                                 "qty_in_stock": 1000000000,  # Ample stock, so that checkouts never fall short.
+                                 "uom_id": rng.randint(1, 2),
+                                 "description": f"Description of product {i}",
+                                 "active": rng.random() < 0.95,
+                                 "product_image": "product.jpg"})
+        insert_rows(main.Products, product_rows)
+
+        # User 1 is the admin, so virtual users log in as users 2 and above:
+        insert_rows(main.Users, [{"id": i, "name": f"User {i}", "username": f"user{i}@example.com", "password": password_hash, "active": True}
+                                 for i in range(1, users + 1)])
+
+        order_count = math.ceil(order_details / SEED_DETAILS_PER_ORDER)
+        start_date = datetime.now() - timedelta(days=730)
+        order_rows = []
+        order_detail_rows = []
+        for order_id in range(1, order_count + 1):
+            sales_amt = 0
+            for _ in range(min(SEED_DETAILS_PER_ORDER, order_details - len(order_detail_rows))):
+                product = product_rows[rng.randrange(products)]
+                unit_price = product["unit_price_discounted"] or product["unit_price_regular"]
+                qty_ordered = rng.randint(1, 5)
+                order_detail_rows.append({"order_id": order_id, "product_id": product["product_id"], "qty_ordered": qty_ordered,
+                                          "uom_id": product["uom_id"], "unit_price": unit_price, "sales_amt": round(qty_ordered * unit_price, 2),
+                                          "category_id": product["category_id"]})
+                sales_amt += round(qty_ordered * unit_price, 2)
+            date_ordered = start_date + timedelta(days=rng.randrange(730))
+            tax_amt = round(sales_amt * main.RATE_SALES_TAX, 2)
+            ship_amt = round(sales_amt * main.RATE_SHIPPING, 2)
+            order_rows.append({"order_id": order_id, "date_ordered": date_ordered, "date_paid": date_ordered, "user_id": rng.randint(2, users),
+                               "sales_amt": sales_amt, "tax_amt": tax_amt, "ship_amt": ship_amt, "total_amt": sales_amt + tax_amt + ship_amt})
+        insert_rows(main.Orders, order_rows)
+        insert_rows(main.OrderDetails, order_detail_rows)
+
+        # Since IDs were supplied explicitly, advance PostgreSQL's ID sequences past them:
+        if db.engine.dialect.name == "postgresql":
+            for table, column in [("units_of_measure", "uom_id"), ("product_categories", "category_id"), ("products", "product_id"),
+                                  ("users", "id"), ("orders", "order_id"), ("order_details", "order_detail_id")]:
+                db.session.execute(main.text(f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), (SELECT MAX({column}) FROM {table}))"))
+
+        db.session.commit()
+
+
+def count_sql_statement(conn, cursor, statement, parameters, context, executemany):
+    """Function to count each SQL statement executed against the route being requested by the current thread"""
+    stats = getattr(request_state, "stats", None)
+    if stats is not None:
+        stats["sql_statements"] += 1
+
+
+def request_route(client, results, label, method, url, **kwargs):
+    """Function to request a route, recording its latency, status code, and the number of SQL statements it executed"""
+    stats = {"sql_statements": 0}
+    request_state.stats = stats
+    start = time.perf_counter()
+    response = getattr(client, method)(url, **kwargs)
+    elapsed = time.perf_counter() - start
+    request_state.stats = None
+    results.append((label, elapsed, stats["sql_statements"], response.status_code))
+    return response
+
+
+def run_journey(client, product_id, results):
+    """Function to run one journey: browse the home page, view a product, add it to the cart, view the cart, and check out"""
+    request_route(client, results, "/", "get", "/")
+    request_route(client, results, "/view_product", "get", f"/view_product?product_id={product_id}")
+    request_route(client, results, "/view_product (add to cart)", "post", f"/view_product?product_id={product_id}", data={"txt_qty_ordered": 1})
+    request_route(client, results, "/cart", "get", "/cart")
+    request_route(client, results, "/checkout", "get", "/checkout")
+    request_route(client, results, "/checkout_successful", "get", "/checkout_successful")
+
+
+def run_virtual_user(user_id, product_ids, iterations, warmup, rng, start_barrier, results, errors):
+    """Function to log in as one virtual user, warm up, then (once all virtual users are ready) run the measured journeys"""
+    try:
+        client = main.app.test_client()
+        client.post("/login", data={"txt_username": f"user{user_id}@example.com", "txt_password": SEED_PASSWORD})
+        for _ in range(warmup):
+            run_journey(client, rng.choice(product_ids), [])
+        start_barrier.wait()
+        for _ in range(iterations):
+            run_journey(client, rng.choice(product_ids), results)
+    except Exception as e:  # An error has occurred.
+        start_barrier.abort()
+        errors.append(f"Virtual user {user_id}: {e!r}")
+
+
+def percentile(sorted_values, pct):
+    """Function to return the given percentile (nearest-rank method) of an ascending list of values"""
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def print_report(results, elapsed, virtual_users):
+    """Function to print requests per second, along with latency percentiles and SQL statements per request for each route"""
+    print(f"{len(results)} requests by {virtual_users} virtual user(s) in {elapsed:.2f} s: {len(results) / elapsed:.1f} requests/s")
+    print(f"{'route':<30}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'SQL/req':>10}{'errors':>10}")
+    for route in ROUTES:
+        route_results = [result for result in results if result[0] == route]
+        if not route_results:
+            continue
+        latencies = sorted(result[1] * 1000 for result in route_results)
+        sql_per_request = sum(result[2] for result in route_results) / len(route_results)
+        error_count = sum(1 for result in route_results if result[3] >= 400)
+        print(f"{route:<30}{len(route_results):>10}{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}{percentile(latencies, 99):>10.1f}{sql_per_request:>10.1f}{error_count:>10}")
+
+
+def main_load_test():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Load test the shop's main user journeys against a seeded scratch database.")
+    parser.add_argument("--db", help="path of the scratch SQLite database (seeded if it does not exist; default: a temporary file)")
+    parser.add_argument("--database-uri", help="URI of the scratch database, for backends other than SQLite (seeded if empty; overrides --db)")
+    parser.add_argument("--products", type=int, default=5000, help="number of products to seed (default: 5000)")
+    parser.add_argument("--users", type=int, default=50000, help="number of users to seed (default: 50000)")
+    parser.add_argument("--order-details", type=int, default=500000, help="number of order details to seed (default: 500000)")
+    parser.add_argument("--virtual-users", type=int, default=8, help="number of concurrent virtual users (default: 8)")
+    parser.add_argument("--iterations", type=int, default=10, help="number of journeys per virtual user (default: 10)")
+    parser.add_argument("--warmup", type=int, default=1, help="number of unreported journeys per virtual user before measuring (default: 1)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed, for reproducible data and journeys (default: 1)")
+    args = parser.parse_args()
+
+    if args.users < args.virtual_users + 1:
+        parser.error("--users must exceed --virtual-users (user 1 is reserved for the admin)")
+
+    database_uri = args.database_uri or "sqlite:///" + os.path.abspath(args.db or os.path.join(tempfile.mkdtemp(prefix="load_test_"), "shop.db"))
+    import_app(database_uri)
+
+    rng = random.Random(args.seed)
+    with main.app.app_context():
+        seed_needed = main.db.session.execute(main.db.select(main.func.count()).select_from(main.Products)).scalar() == 0
+    if seed_needed:
+        start = time.perf_counter()
+        seed_database(args.products, args.users, args.order_details, rng)
+        print(f"Seeded {database_uri} in {time.perf_counter() - start:.1f} s")
+    else:
+        print(f"Reusing {database_uri}")
+
+    # Virtual users view active products only:
+    with main.app.app_context():
+        product_ids = main.db.session.execute(main.db.select(main.Products.product_id).where(main.Products.active == True)).scalars().all()
+        event.listen(main.db.engine, "before_cursor_execute", count_sql_statement)
+
+    # Start the virtual users, timing from the moment all of them have logged in and warmed up:
+    results = []
+    errors = []
+    start_barrier = threading.Barrier(args.virtual_users + 1)
+    threads = [threading.Thread(target=run_virtual_user, args=(2 + i, product_ids, args.iterations, args.warmup, random.Random(args.seed + i), start_barrier, results, errors))
+               for i in range(args.virtual_users)]
+    for thread in threads:
+        thread.start()
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print_report(results, elapsed, args.virtual_users)
+    for error in errors:
+        print(error)
+
+
+if __name__ == "__main__":
+    main_load_test()
@@ -0,0 +1,126 @@
+# BENCHMARK: Time taken to create an order's details from a large cart, row by row vs. one "INSERT ... SELECT".
+#
+# OBJECTIVE: To measure, for carts of increasing size, the time taken (and SQL statements executed) to copy a user's cart
+#            details into the "order_details" table when:
+#            1. One database object is built and added to the session per cart detail, re-adding the growing list of new
+#               objects for each cart detail, then flushed row by row (as "create_order" once did).
+#            2. The database copies the cart details itself, via one "INSERT ... SELECT" statement (as "create_order" does).
+#            Each run creates an order, copies the cart details into it, then rolls back (so the cart is reused), within a
+#            request context against a seeded scratch database (see "load_test.py").  Full checkouts (via
+#            "update_database_with_trans", committed) are then timed for reference.
+#
+# USAGE: python benchmarks/order_details_insert.py [--cart-sizes N [N ...]] [--repeats N]
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from sqlalchemy import event, insert
+
+import load_test
+
+# Define constant for the user whose cart is checked out:
+USER_ID = 2
+
+
+def fill_cart(cart_size):
+    """Function to replace the user's cart with one cart detail for each of the first N products"""
+    main = load_test.main
+    main.db.session.execute(main.db.delete(main.CartDetails).where(main.CartDetails.user_id == USER_ID))
+    main.db.session.execute(insert(main.CartDetails), [{"user_id": USER_ID, "product_id": product_id, "qty_ordered": 1, "uom_id": 1, "unit_price": 1.0,
+                                                        "sales_amt": 1.0, "unit_price_updated": False} for product_id in range(1, cart_size + 1)])
+    main.db.session.commit()
+
+
+def create_order():
+    """Function to add a new order for the user (without committing it) and return its order ID"""
+    main = load_test.main
+    new_order = main.Orders(date_ordered=datetime.date(datetime.now()), date_paid=datetime.date(datetime.now()), user_id=USER_ID,
+                            sales_amt=0, tax_amt=0, ship_amt=0, total_amt=0)
+    main.db.session.add(new_order)
+    main.db.session.flush()
+    return new_order.order_id
+
+
+def insert_row_by_row():
+    """Function to copy the user's cart details into a new order one database object at a time"""
+    main = load_test.main
+    new_order_id = create_order()
+    existing_cart_details = main.retrieve_from_database("get_cart_details_by_user_id_with_added_details", user_id=USER_ID)
+    new_records = []
+    for detail in existing_cart_details:
+        new_record = main.OrderDetails(order_id=new_order_id, product_id=int(detail["product_id"]), qty_ordered=detail["qty_ordered"],
+                                       uom_id=int(detail["uom_id"]), unit_price=detail["unit_price"], sales_amt=detail["sales_amt"])
+        new_records.append(new_record)
+        main.db.session.add_all(new_records)
+    main.db.session.flush()
+
+
+def insert_select():
+    """Function to copy the user's cart details into a new order via one "INSERT ... SELECT" statement"""
+    main = load_test.main
+    CartDetails = main.CartDetails
+    new_order_id = create_order()
+    main.db.session.execute(main.db.insert(main.OrderDetails).from_select(
+        ["order_id", "product_id", "qty_ordered", "uom_id", "unit_price", "sales_amt", "category_id"],
+        main.db.select(main.literal(new_order_id), CartDetails.product_id, CartDetails.qty_ordered, CartDetails.uom_id, CartDetails.unit_price, CartDetails.sales_amt, main.Products.category_id).join(main.Products, CartDetails.product_id == main.Products.product_id).where(CartDetails.user_id == USER_ID).order_by(CartDetails.cart_detail_id)))
+
+
+def measure(function, repeats, statements):
+    """Function to return the median time taken (in milliseconds) and the number of SQL statements executed by a run (rolled back afterwards)"""
+    main = load_test.main
+    times_ms = []
+    for _ in range(repeats):
+        with main.app.test_request_context("/"):
+            del statements[:]
+            start = time.perf_counter()
+            function()
+            times_ms.append((time.perf_counter() - start) * 1000)
+            statement_count = len(statements)
+            main.db.session.rollback()
+    return statistics.median(times_ms), statement_count
+
+
+def main_order_details_insert():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the time taken to create an order's details from a large cart, row by row vs. one INSERT ... SELECT.")
+    parser.add_argument("--cart-sizes", type=int, nargs="+", default=[10, 200, 1000], help="numbers of cart details checked out (default: 10 200 1000)")
+    parser.add_argument("--repeats", type=int, default=5, help="number of timed runs per cart size (default: 5)")
+    args = parser.parse_args()
+
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="order_details_insert_"), "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=max(args.cart_sizes), users=10, order_details=1000, rng=random.Random(0))
+
+    # Count the SQL statements executed:
+    statements = []
+    with main.app.app_context():
+        engine = main.db.engine
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement))
+
+    print(f"{'cart details':>12}{'row by row':>24}{'INSERT ... SELECT':>24}{'checkout':>12}")
+    print(f"{'':>12}" + f"{'ms':>12}{'statements':>12}" * 2 + f"{'ms':>12}")
+    for cart_size in args.cart_sizes:
+        with main.app.app_context():
+            fill_cart(cart_size)
+        row_by_row = measure(insert_row_by_row, args.repeats, statements)
+        bulk = measure(insert_select, args.repeats, statements)
+
+        # Time full checkouts (each of which empties the cart, so it is refilled first):
+        checkout_ms = []
+        for _ in range(args.repeats):
+            with main.app.test_request_context("/"):
+                fill_cart(cart_size)
+                start = time.perf_counter()
+                assert main.update_database_with_trans("create_order", user_id=USER_ID) is not False
+                checkout_ms.append((time.perf_counter() - start) * 1000)
+
+        print(f"{cart_size:>12}{row_by_row[0]:>12.1f}{row_by_row[1]:>12}{bulk[0]:>12.1f}{bulk[1]:>12}{statistics.median(checkout_ms):>12.1f}")
+
+
+if __name__ == "__main__":
+    main_order_details_insert()
@@ -0,0 +1,126 @@
+# CHECK: Every database retrieval is served by an index.
+#
+# OBJECTIVE: To guard against regressions to full table scans, by:
+#            1. Creating a scratch database via "config_database" (so it carries every schema migration).
+#            2. Running each "retrieve_from_database" transaction type, capturing the SQL statements it executes.
+#            3. Running "EXPLAIN QUERY PLAN" on each captured statement, and reporting any table which is scanned
+#               without the use of an index.
+#
+# USAGE: python benchmarks/query_plans.py  (exits with a non-zero status if any check fails)
+
+# Import necessary libraries:
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+from sqlalchemy import event
+
+import load_test
+
+# Define the arguments passed to each transaction type checked:
+TRANS_TYPE_ARGS = {
+    "get_active_product_categories": {},
+    "get_all_product_categories": {},
+    "get_all_uoms": {},
+    "get_cart_detail_by_id": {"cart_detail_id": 1},
+    "get_cart_detail_by_user_id_and_prod_id": {"user_id": 2, "product_id": 1},
+    "get_cart_detail_count_by_user_id": {"user_id": 2},
+    "get_cart_product_ids_by_user_id": {"user_id": 2},
+    "get_cart_totals_by_user_id": {"user_id": 2},
+    "get_cart_details_by_user_id_with_added_details": {"user_id": 2},
+    "get_order_by_order_id_with_added_details": {"order_id": 1},
+    "get_order_details_by_order_id": {"order_id": 1},
+    "get_orders_by_user_id_page": {"user_id": 2, "page_limit": 51},
+    "get_orders_by_user_id_page_after": {"user_id": 2, "key": datetime(2024, 1, 1), "id": 1, "page_limit": 51},
+    "get_orders_by_user_id_page_before": {"user_id": 2, "key": datetime(2024, 1, 1), "id": 1, "page_limit": 51},
+    "get_orders_page": {"page_limit": 51},
+    "get_orders_page_after": {"key": datetime(2024, 1, 1), "id": 1, "page_limit": 51},
+    "get_orders_page_before": {"key": datetime(2024, 1, 1), "id": 1, "page_limit": 51},
+    "get_prod_by_id": {"product_id": 1},
+    "get_prod_cat_by_id": {"prod_cat_id": 1},
+    "get_prod_cat_references": {"prod_cat_id": 1},
+    "get_prod_cats_page": {"page_limit": 51},
+    "get_prod_cats_page_after": {"key": "Category 01", "id": 1, "page_limit": 51},
+    "get_prod_cats_page_before": {"key": "Category 01", "id": 1, "page_limit": 51},
+    "get_product_references": {"product_id": 1},
+    "get_qty_in_stock_by_product_ids": {"product_ids": [1, 2]},
+    "get_referenced_prod_cat_ids": {"prod_cat_ids": [1, 2]},
+    "get_referenced_product_ids": {"product_ids": [1, 2]},
+    "get_referenced_uom_ids": {"uom_ids": [1, 2]},
+    "get_referenced_user_ids": {"user_ids": [1, 2]},
+    "get_sales_by_category": {"start_date": date(2024, 1, 1)},
+    "get_sales_by_day": {"start_date": date(2024, 1, 1)},
+    "get_sales_by_product": {"start_date": date(2024, 1, 1)},
+    "get_uom_by_id": {"uom_id": 1},
+    "get_uom_references": {"uom_id": 1},
+    "get_uoms_page": {"page_limit": 51},
+    "get_uoms_page_after": {"key": "EA", "id": 1, "page_limit": 51},
+    "get_uoms_page_before": {"key": "EA", "id": 1, "page_limit": 51},
+    "get_user_by_id": {"user_id": 2},
+    "get_user_by_username": {"username": "User2@Example.com"},
+    "get_user_references": {"user_id": 2},
+    "get_users_page": {"page_limit": 51},
+    "get_users_page_after": {"key": "User 2", "id": 2, "page_limit": 51},
+    "get_users_page_before": {"key": "User 2", "id": 2, "page_limit": 51},
+}
+
+# Define the transaction types which read entire tables by design (and the reason why):
+TRANS_TYPES_EXEMPT = {
+    "get_cache_versions": "reads the few rows of the \"cache_versions\" table",
+    "get_catalog_snapshot": "loads the entire catalog into the in-memory catalog snapshot",
+}
+
+
+def find_unindexed_scans(conn, statement, parameters):
+    """Function to return each step of a statement's query plan which scans a table without the use of an index"""
+    plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+
+    # A statement which selects from no table at all (e.g., one which only selects "EXISTS" subqueries) "scans" a single
+    # constant row, which is not a table:
+    return [row.detail for row in plan if row.detail.startswith("SCAN ") and "USING " not in row.detail and row.detail != "SCAN CONSTANT ROW"]
+
+
+def main_query_plans():
+    """Main function for this check"""
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="query_plans_"), "shop.db"))
+    main = load_test.main
+
+    # Capture the SQL statements executed by each transaction type:
+    captured_statements = []
+    with main.app.app_context():
+        engine = main.db.engine
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, parameters, context, executemany: captured_statements.append((statement, parameters)))
+
+    # Check every query in the registry of queries run by "retrieve_from_database", so that none go unchecked:
+    trans_types = sorted(main.query_registry)
+
+    failures = []
+    with engine.connect() as conn:
+        for trans_type in trans_types:
+            if trans_type in TRANS_TYPES_EXEMPT:
+                print(f"EXEMPT  {trans_type}: {TRANS_TYPES_EXEMPT[trans_type]}")
+                continue
+            if trans_type not in TRANS_TYPE_ARGS:
+                failures.append(trans_type)
+                print(f"FAIL    {trans_type}: not covered by this check (add it to TRANS_TYPE_ARGS)")
+                continue
+
+            del captured_statements[:]
+            main.retrieve_from_database(trans_type, **TRANS_TYPE_ARGS[trans_type])
+            statements = list(captured_statements)
+            unindexed_scans = [scan for statement, parameters in statements for scan in find_unindexed_scans(conn, statement, parameters)]
+            if not statements:
+                failures.append(trans_type)
+                print(f"FAIL    {trans_type}: no SQL statement was executed")
+            elif unindexed_scans:
+                failures.append(trans_type)
+                print(f"FAIL    {trans_type}: {'; '.join(unindexed_scans)}")
+            else:
+                print(f"OK      {trans_type}")
+
+    print(f"{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main_query_plans()
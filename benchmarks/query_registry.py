@@ -0,0 +1,103 @@
+# BENCHMARK: Python overhead of hot database lookups, with vs. without the query registry.
+#
+# OBJECTIVE: To measure, per call, the time taken by frequently run lookups when:
+#            1. The statement is built on each call (as "retrieve_from_database" once did for every transaction type).
+#            2. The statement is taken from the query registry (built once by "config_queries", with bound parameters).
+#            Both run within one request context (so share one database session), against a small seeded scratch
+#            database (see "load_test.py"), so that the difference reflects Python overhead rather than database work.
+#            Lookups served by the in-memory catalog snapshot (e.g., "get_prod_by_id_with_uom") are timed for reference.
+#
+# USAGE: python benchmarks/query_registry.py [--calls N] [--repeats N]
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import load_test
+
+# Define the arguments passed to each lookup timed:
+LOOKUP_ARGS = {
+    "get_cart_detail_count_by_user_id": {"user_id": 2},
+    "get_prod_by_id": {"product_id": 1},
+    "get_user_by_id": {"user_id": 2},
+    "get_user_by_username": {"username": "User2@Example.com"},
+}
+
+# Define the lookups served by the in-memory catalog snapshot (timed for reference), along with their arguments:
+SNAPSHOT_LOOKUP_ARGS = {
+    "get_prod_by_id_with_uom": {"product_id": 1},
+}
+
+
+def build_statement(trans_type, **kwargs):
+    """Function to build the statement for a lookup on each call, as "retrieve_from_database" did before the query registry"""
+    main = load_test.main
+    if trans_type == "get_cart_detail_count_by_user_id":
+        return main.db.select(main.func.count()).select_from(main.CartDetails).where(main.CartDetails.user_id == kwargs["user_id"])
+    elif trans_type == "get_prod_by_id":
+        return main.db.select(main.Products).where(main.Products.product_id == kwargs["product_id"])
+    elif trans_type == "get_user_by_id":
+        return main.db.select(main.Users).where(main.Users.id == kwargs["user_id"])
+    elif trans_type == "get_user_by_username":
+        return main.db.select(main.Users).where(main.func.lower(main.Users.username) == main.func.lower(kwargs["username"]))
+
+
+def run_without_registry(trans_type, **kwargs):
+    """Function to run a lookup with its statement built on each call"""
+    main = load_test.main
+    with main.database_scope():
+        return main.db.session.execute(build_statement(trans_type, **kwargs)).scalar()
+
+
+def time_calls(function, calls, repeats):
+    """Function to return the median time (in microseconds) taken per call, across repeated batches of calls"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        samples.append((time.perf_counter() - start) / calls * 1000000)
+    return statistics.median(samples)
+
+
+def main_query_registry():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the Python overhead of hot database lookups, with vs. without the query registry.")
+    parser.add_argument("--calls", type=int, default=2000, help="number of calls per timed batch (default: 2000)")
+    parser.add_argument("--repeats", type=int, default=5, help="number of timed batches per lookup (default: 5)")
+    args = parser.parse_args()
+
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="query_registry_"), "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=1000, users=100, order_details=1000, rng=random.Random(0))
+
+    with main.app.test_request_context("/"):
+        print(f"Median of {args.repeats} batch(es) of {args.calls} call(s), in microseconds per call:")
+        print(f"{'lookup':<36}{'build only':>12}{'no registry':>14}{'registry':>12}{'saved':>10}")
+        for trans_type, kwargs in LOOKUP_ARGS.items():
+            # Check that both ways of running the lookup retrieve the same record:
+            assert run_without_registry(trans_type, **kwargs) is main.retrieve_from_database(trans_type, **kwargs)
+
+            build_us = time_calls(lambda: build_statement(trans_type, **kwargs), args.calls, args.repeats)
+            without_registry_us = time_calls(lambda: run_without_registry(trans_type, **kwargs), args.calls, args.repeats)
+            registry_us = time_calls(lambda: main.retrieve_from_database(trans_type, **kwargs), args.calls, args.repeats)
+            print(f"{trans_type:<36}{build_us:>12.1f}{without_registry_us:>14.1f}{registry_us:>12.1f}"
+                  f"{(without_registry_us - registry_us) / without_registry_us:>10.0%}")
+
+        for trans_type, kwargs in SNAPSHOT_LOOKUP_ARGS.items():
+            snapshot_us = time_calls(lambda: main.retrieve_from_database(trans_type, **kwargs), args.calls, args.repeats)
+            print(f"{trans_type + ' (catalog snapshot)':<36}{'':>12}{'':>14}{snapshot_us:>12.1f}")
+
+        # Report the timing statistics gathered by the query registry:
+        print("\nQuery registry timing statistics:")
+        for trans_type, stats in main.get_query_stats().items():
+            if stats["calls"]:
+                print(f"{trans_type:<36}{stats['calls']:>8} call(s){stats['avg_ms'] * 1000:>10.1f} us avg{stats['max_ms'] * 1000:>10.1f} us max")
+
+
+if __name__ == "__main__":
+    main_query_registry()
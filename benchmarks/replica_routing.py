@@ -0,0 +1,118 @@
+# CHECK: Routing of reads between the primary database and its read replicas.
+#
+# OBJECTIVE: To verify, locally, that reads are routed by intent between the primary database and its read replicas, by:
+#            1. Seeding a scratch SQLite database (see "load_test.py") and copying it into two SQLite read replicas (via
+#               "refresh_sqlite_replicas", as the "sync-sqlite-replicas" command does).
+#            2. Checking that reads which tolerate slightly stale data (e.g., order history) take turns across the replicas,
+#               while all other reads (e.g., the cart) are served by the primary database.
+#            3. Having a user check out, then checking that the user's order history shows the new order at once (read from
+#               the primary database), while the admin's order history (read from the replicas, which have yet to be synced)
+#               shows it only once the replicas have been synced, and that the user's reads return to the replicas once
+#               "DATABASE_REPLICA_LAG_SECS" have passed.
+#            4. Removing one replica, then checking that the reads it would have served are served by the primary database.
+#
+# USAGE: python benchmarks/replica_routing.py [--reads N]  (exits with a non-zero status if any check fails)
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import load_test
+
+# Define constants for the user who checks out (and whose reads are checked), and for the admin:
+USER_ID = 2
+ADMIN_ID = 1
+
+# Define constant for how long (in seconds) after a user's update that user's reads are served by the primary database:
+REPLICA_LAG_SECS = 1
+
+
+def log_in(user_id):
+    """Function to return a test client logged in as the desired seeded user"""
+    client = load_test.main.app.test_client()
+    client.post("/login", data={"txt_username": f"user{user_id}@example.com", "txt_password": load_test.SEED_PASSWORD})
+    return client
+
+
+def reads_served(client, url):
+    """Function to request a page, and return the number of reads served by the primary database and by each read replica"""
+    main = load_test.main
+    before = main.get_replica_stats()
+    assert client.get(url).status_code == 200
+    after = main.get_replica_stats()
+    return {"primary": after["primary_reads"] - before["primary_reads"],
+            **{bind_key: reads - before["replica_reads"].get(bind_key, 0) for bind_key, reads in after["replica_reads"].items()}}
+
+
+def main_replica_routing():
+    """Main function for this check"""
+    parser = argparse.ArgumentParser(description="Check the routing of reads between the primary database and its read replicas.")
+    parser.add_argument("--reads", type=int, default=20, help="number of order history pages requested to check the rotation of replicas (default: 20)")
+    args = parser.parse_args()
+
+    # Point the application at a scratch primary database and two SQLite read replicas (before the application is imported):
+    db_dir = tempfile.mkdtemp(prefix="replica_routing_")
+    replica_paths = [os.path.join(db_dir, f"replica_{i}.db") for i in (1, 2)]
+    os.environ["DATABASE_REPLICA_URIS"] = ",".join("sqlite:///" + path for path in replica_paths)
+    os.environ["DATABASE_REPLICA_LAG_SECS"] = str(REPLICA_LAG_SECS)
+    load_test.import_app("sqlite:///" + os.path.join(db_dir, "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=20, users=10, order_details=500, rng=random.Random(0))
+    assert main.refresh_sqlite_replicas() == 2
+
+    user = log_in(USER_ID)
+    admin = log_in(ADMIN_ID)
+    checks = []
+
+    # Check that order history pages take turns across the replicas, and that cart reads are served by the primary database:
+    rotation = [reads_served(user, "/orders") for _ in range(args.reads)]
+    replica_1_reads = sum(reads.get("replica_1", 0) for reads in rotation)
+    replica_2_reads = sum(reads.get("replica_2", 0) for reads in rotation)
+    print(f"{args.reads} order history pages: {replica_1_reads} read(s) from replica_1, {replica_2_reads} from replica_2, "
+          f"{sum(reads['primary'] for reads in rotation)} from the primary database")
+    checks.append(("order history reads take turns across the replicas", replica_1_reads > 0 and abs(replica_1_reads - replica_2_reads) <= 1))
+    cart_reads = reads_served(user, "/cart")
+    checks.append(("cart reads are served by the primary database", cart_reads["primary"] > 0 and not any(reads for bind_key, reads in cart_reads.items() if bind_key != "primary")))
+
+    # Have the user check out, as the "checkout_successful" route does once payment has been taken (without syncing the
+    # replicas afterwards):
+    user.post("/view_product?product_id=1", data={"txt_qty_ordered": 1})
+    user.get("/checkout_successful")
+    with main.app.app_context():
+        new_order_id = main.db.session.execute(main.db.select(main.func.max(main.Orders.order_id))).scalar()
+    new_order_link = f"/view_order?order_id={new_order_id}".encode()
+
+    # Check that the user sees the new order at once, while the admin (who has not updated the database) sees it only once
+    # the replicas have been synced:
+    user_reads = reads_served(user, "/orders")
+    checks.append(("the user's reads are served by the primary database right after checking out", user_reads["primary"] > 0 and not any(reads for bind_key, reads in user_reads.items() if bind_key != "primary")))
+    checks.append(("the user's order history shows the new order right after checking out", new_order_link in user.get("/orders").data))
+    checks.append(("the admin's order history (from the replicas) lags until the replicas are synced", new_order_link not in admin.get("/orders").data))
+    assert main.refresh_sqlite_replicas() == 2
+    checks.append(("the admin's order history shows the new order once the replicas are synced", new_order_link in admin.get("/orders").data))
+
+    # Check that the user's reads return to the replicas once the replicas have had time to catch up:
+    time.sleep(REPLICA_LAG_SECS)
+    user_reads = reads_served(user, "/orders")
+    checks.append((f"the user's reads return to the replicas after {REPLICA_LAG_SECS} s", user_reads.get("replica_1", 0) + user_reads.get("replica_2", 0) > 0))
+
+    # Remove one replica, and check that the reads it would have served are served by the primary database instead:
+    os.remove(replica_paths[1])
+    with main.app.app_context():
+        main.db.engines["replica_2"].dispose()
+    fallbacks_before = main.get_replica_stats()["fallbacks"]
+    pages_served = all(new_order_link in admin.get("/orders").data for _ in range(4))
+    fallbacks = main.get_replica_stats()["fallbacks"] - fallbacks_before
+    checks.append(("reads from a removed replica are served by the primary database", pages_served and fallbacks == 2))
+
+    for description, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'}    {description}")
+    sys.exit(0 if all(passed for _, passed in checks) else 1)
+
+
+if __name__ == "__main__":
+    main_replica_routing()
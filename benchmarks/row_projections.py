@@ -0,0 +1,129 @@
+# BENCHMARK: Memory and time taken by list pages' database retrievals, entities vs. column projections.
+#
+# OBJECTIVE: To measure, for the retrievals behind pages which list many rows (all orders, a user's orders, and a cart),
+#            the memory allocated and the time taken when:
+#            1. Whole database objects are selected (and held by the request's database session), with their fields
+#               copied into a new dictionary per row (as "retrieve_from_database" once did).
+#            2. Only the columns used by the templates are selected, into compact, read-only records.
+#            Memory is measured via "tracemalloc": the peak allocated during the retrieval, and the amount still allocated
+#            afterwards (i.e., retained for the rest of the request, including database objects held by the session).
+#
+# USAGE: python benchmarks/row_projections.py [--orders N] [--cart-details N] [--repeats N]
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from sqlalchemy import insert
+
+import load_test
+
+# Define constant for the user whose orders and cart are retrieved:
+USER_ID = 2
+
+
+def retrieve_entities(trans_type):
+    """Function to run a retrieval by selecting whole database objects and copying their fields into a dictionary per row"""
+    main = load_test.main
+    db, CartDetails, Orders, Products, UnitsOfMeasure, Users = main.db, main.CartDetails, main.Orders, main.Products, main.UnitsOfMeasure, main.Users
+    if trans_type == "get_cart_details_by_user_id_with_added_details":
+        query_results = db.session.execute(db.select(CartDetails, Products, UnitsOfMeasure, Users).join(Products, CartDetails.product_id == Products.product_id).join(UnitsOfMeasure, CartDetails.uom_id == UnitsOfMeasure.uom_id).join(Users, CartDetails.user_id == Users.id).where(CartDetails.user_id == USER_ID).order_by(main.func.lower(Products.name))).all()
+        return [{
+            "cart_detail_id": cart_detail.CartDetails.cart_detail_id,
+            "user_id": cart_detail.CartDetails.user_id,
+            "user_name": cart_detail.Users.name,
+            "user_username": cart_detail.Users.username,
+            "product_id": cart_detail.CartDetails.product_id,
+            "product_name": cart_detail.Products.name,
+            "product_image": cart_detail.Products.product_image,
+            "qty_ordered": cart_detail.CartDetails.qty_ordered,
+            "uom_id": cart_detail.CartDetails.uom_id,
+            "uom_name": cart_detail.UnitsOfMeasure.code,
+            "uom_desc": cart_detail.UnitsOfMeasure.description,
+            "unit_price": cart_detail.CartDetails.unit_price,
+            "sales_amt": cart_detail.CartDetails.sales_amt,
+            "unit_price_updated": cart_detail.CartDetails.unit_price_updated
+            } for cart_detail in query_results]
+
+    statement = db.select(Orders, Users).join(Users, Orders.user_id == Users.id).order_by(Orders.date_ordered.desc(), Orders.order_id)
+    if trans_type == "get_orders_by_user_id_with_added_details":
+        statement = statement.where(Orders.user_id == USER_ID)
+    query_results = db.session.execute(statement).all()
+    return [{
+        "order_id": order.Orders.order_id,
+        "date_ordered": order.Orders.date_ordered,
+        "date_paid": order.Orders.date_paid,
+        "date_shipped": order.Orders.date_shipped,
+        "user_id": order.Orders.user_id,
+        "user_name": order.Users.name,
+        "user_username": order.Users.username,
+        "sales_amt": order.Orders.sales_amt,
+        "tax_amt": order.Orders.tax_amt,
+        "ship_amt": order.Orders.ship_amt,
+        "total_amt": order.Orders.total_amt,
+        "notes": order.Orders.notes
+        } for order in query_results]
+
+
+def retrieve_projections(trans_type):
+    """Function to run a retrieval via "retrieve_from_database" (which selects only the columns used, into compact records)"""
+    # Orders are listed one page at a time, so retrieve them all as one (very large) page:
+    page_trans_types = {"get_all_orders_with_added_details": "get_orders_page", "get_orders_by_user_id_with_added_details": "get_orders_by_user_id_page"}
+    return load_test.main.retrieve_from_database(page_trans_types.get(trans_type, trans_type), user_id=USER_ID, page_limit=1000000000)
+
+
+def measure(retrieve, trans_type, repeats):
+    """Function to return the row count, median time taken (in milliseconds), and peak and retained memory (in KiB) of a retrieval"""
+    main = load_test.main
+
+    # Time the retrieval, each time in a new request (and so with a new database session):
+    times_ms = []
+    for _ in range(repeats):
+        with main.app.test_request_context("/"):
+            start = time.perf_counter()
+            records = retrieve(trans_type)
+            times_ms.append((time.perf_counter() - start) * 1000)
+
+    # Measure the memory allocated by the retrieval, including any still held by the request's database session:
+    with main.app.test_request_context("/"):
+        main.db.session.connection()  # Check out the database connection before measuring.
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        records = retrieve(trans_type)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return len(records), statistics.median(times_ms), (peak - baseline) / 1024, (retained - baseline) / 1024
+
+
+def main_row_projections():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the memory and time taken by list pages' database retrievals, entities vs. column projections.")
+    parser.add_argument("--orders", type=int, default=5000, help="number of orders seeded (default: 5000)")
+    parser.add_argument("--cart-details", type=int, default=500, help="number of cart details seeded for the user (default: 500)")
+    parser.add_argument("--repeats", type=int, default=5, help="number of timed runs per retrieval (default: 5)")
+    args = parser.parse_args()
+
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="row_projections_"), "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=max(1000, args.cart_details), users=50, order_details=args.orders * load_test.SEED_DETAILS_PER_ORDER, rng=random.Random(0))
+    with main.app.app_context():
+        main.db.session.execute(insert(main.CartDetails), [{"user_id": USER_ID, "product_id": product_id, "qty_ordered": 1, "uom_id": 1, "unit_price": 1.0, "sales_amt": 1.0, "unit_price_updated": False}
+                                                           for product_id in range(1, args.cart_details + 1)])
+        main.db.session.commit()
+
+    print(f"{'retrieval':<48}{'rows':>7}{'entities':>30}{'projections':>30}")
+    print(f"{'':<48}{'':>7}" + f"{'ms':>10}{'peak KiB':>10}{'kept KiB':>10}" * 2)
+    for trans_type in ["get_all_orders_with_added_details", "get_orders_by_user_id_with_added_details", "get_cart_details_by_user_id_with_added_details"]:
+        entities = measure(retrieve_entities, trans_type, args.repeats)
+        projections = measure(retrieve_projections, trans_type, args.repeats)
+        assert entities[0] == projections[0]
+        print(f"{trans_type:<48}{entities[0]:>7}" + "".join(f"{entities[i]:>10.1f}" for i in (1, 2, 3)) + "".join(f"{projections[i]:>10.1f}" for i in (1, 2, 3)))
+
+
+if __name__ == "__main__":
+    main_row_projections()
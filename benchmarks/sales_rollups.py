@@ -0,0 +1,77 @@
+# BENCHMARK: Time taken to report sales, from the sales rollups vs. aggregating all orders and order details.
+#
+# OBJECTIVE: To measure, for each period offered by the sales report, the time taken to retrieve sales per day, per product
+#            category, and per product when:
+#            1. The orders and order details placed within the period are aggregated on each request.
+#            2. The sales rollups are read (as the "sales_report" route does).
+#            Also reports the time taken to rebuild the sales rollups from all orders (as the "rebuild-sales-rollups"
+#            command does), and checks that both ways of reporting agree.  All run against a seeded scratch database (see
+#            "load_test.py"), whose orders are spread across the last two years.
+#
+# USAGE: python benchmarks/sales_rollups.py [--order-details N] [--repeats N]
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+import load_test
+
+
+def report_from_orders(start_date):
+    """Function to retrieve sales per day, per product category, and per product since the start date by aggregating orders and order details"""
+    main = load_test.main
+    return [(columns, main.db.session.execute(query).all()) for _, columns, query in main.get_sales_rollup_queries(main.Orders.date_ordered >= start_date)]
+
+
+def report_from_rollups(start_date):
+    """Function to retrieve sales per day, per product category, and per product since the start date from the sales rollups"""
+    main = load_test.main
+    return [main.retrieve_from_database(trans_type, start_date=start_date) for trans_type in ("get_sales_by_category", "get_sales_by_day", "get_sales_by_product")]
+
+
+def time_runs(function, repeats):
+    """Function to return the median time taken (in milliseconds) by a function, each run in a new request, and its result"""
+    main = load_test.main
+    times_ms = []
+    for _ in range(repeats):
+        with main.app.test_request_context("/"):
+            start = time.perf_counter()
+            result = function()
+            times_ms.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times_ms), result
+
+
+def main_sales_rollups():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the time taken to report sales, from the sales rollups vs. aggregating all orders and order details.")
+    parser.add_argument("--order-details", type=int, default=200000, help="number of order details seeded (default: 200000)")
+    parser.add_argument("--repeats", type=int, default=5, help="number of timed runs per period (default: 5)")
+    args = parser.parse_args()
+
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sales_rollups_"), "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=1000, users=1000, order_details=args.order_details, rng=random.Random(0))
+
+    start = time.perf_counter()
+    assert main.rebuild_sales_rollups()
+    print(f"Rebuilt the sales rollups from {args.order_details} order details in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print(f"\n{'period (days)':>14}{'from orders (ms)':>20}{'from rollups (ms)':>20}")
+    for days in main.SALES_REPORT_PERIODS:
+        start_date = date.today() - timedelta(days=days - 1)
+        orders_ms, orders_result = time_runs(lambda: report_from_orders(start_date), args.repeats)
+        rollups_ms, rollups_result = time_runs(lambda: report_from_rollups(start_date), args.repeats)
+
+        # Check that both ways of reporting agree on the total sales (rounded to the cent) in each part of the report:
+        assert [round(sum(row[columns.index("sales_amt")] for row in rows), 2) for columns, rows in orders_result] == \
+               [round(sum(record.sales_amt for record in records), 2) for records in rollups_result]
+        print(f"{days:>14}{orders_ms:>20.1f}{rollups_ms:>20.1f}")
+
+
+if __name__ == "__main__":
+    main_sales_rollups()
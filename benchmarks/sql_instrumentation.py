@@ -0,0 +1,113 @@
+# CHECK: Per-request SQL instrumentation (statement counts, time, and repeated statements, shown on the "Diagnostics" page).
+#
+# OBJECTIVE: To verify the SQL statements recorded for each request, and measure what recording them costs, by:
+#            1. Seeding a scratch database (see "load_test.py"), then running the load test's journeys (home page, product,
+#               add to cart, cart, checkout) while counting SQL statements independently (as "load_test.py" does), and
+#               checking that the statements recorded per route add up to the same counts.
+#            2. Running a request which retrieves products one at a time (an "N+1" query pattern), and checking that a
+#               warning naming the repeated statement's transaction type is recorded, along with a statement budget warning.
+#            3. Checking that the "Diagnostics" page is served to the admin only.
+#            4. Timing the journeys with and without the instrumentation's engine event listeners (alternately, over several
+#               rounds, reporting the fastest round of each).
+#
+# USAGE: python benchmarks/sql_instrumentation.py [--journeys N] [--rounds N]  (exits with a non-zero status if any check fails)
+
+# Import necessary libraries:
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from sqlalchemy import event
+
+import load_test
+
+# Define constants for the SQL budgets applied during this check (low enough for the "N+1" request to exceed them):
+SQL_BUDGET_STATEMENTS = 8
+SQL_REPEAT_THRESHOLD = 5
+
+# Define constant for the number of products retrieved one at a time by the "N+1" request:
+N_PLUS_ONE_PRODUCTS = 10
+
+# Define constant for the endpoint of each route requested by the load test's journeys:
+ROUTE_ENDPOINTS = {"/": "home", "/view_product": "view_product", "/view_product (add to cart)": "view_product", "/cart": "cart",
+                   "/checkout": "checkout", "/checkout_successful": "checkout_successful"}
+
+
+def run_journeys(client, journeys, rng):
+    """Function to run the load test's journeys, returning the time taken and the SQL statements counted (independently of the instrumentation) per endpoint"""
+    results = []
+    start = time.perf_counter()
+    for _ in range(journeys):
+        load_test.run_journey(client, rng.randint(1, 20), results)
+    elapsed = time.perf_counter() - start
+    statements = Counter()
+    for label, _, sql_statements, _ in results:
+        statements[ROUTE_ENDPOINTS[label]] += sql_statements
+    return elapsed, len(results), statements
+
+
+def main_sql_instrumentation():
+    """Main function for this check"""
+    parser = argparse.ArgumentParser(description="Check the per-request SQL instrumentation, and measure what it costs.")
+    parser.add_argument("--journeys", type=int, default=50, help="number of journeys run per round (default: 50)")
+    parser.add_argument("--rounds", type=int, default=3, help="number of timed rounds with and without the instrumentation (default: 3)")
+    args = parser.parse_args()
+
+    os.environ["SQL_BUDGET_STATEMENTS"] = str(SQL_BUDGET_STATEMENTS)
+    os.environ["SQL_REPEAT_THRESHOLD"] = str(SQL_REPEAT_THRESHOLD)
+    load_test.import_app("sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sql_instrumentation_"), "shop.db"))
+    main = load_test.main
+    load_test.seed_database(products=20, users=10, order_details=1000, rng=random.Random(0))
+    with main.app.app_context():
+        engine = main.db.engine
+    event.listen(engine, "before_cursor_execute", load_test.count_sql_statement)
+    checks = []
+
+    # Run the journeys, and check that the statements recorded per route match those counted independently:
+    client = main.app.test_client()
+    client.post("/login", data={"txt_username": "user2@example.com", "txt_password": load_test.SEED_PASSWORD})
+    run_journeys(client, 10, random.Random(0))  # Warm up (e.g., build the catalog snapshot and compile templates).
+    main.request_sql_stats["routes"].clear()
+    elapsed_with, requests, statements_counted = run_journeys(client, args.journeys, random.Random(1))
+    sql_stats_by_route, _ = main.get_request_sql_stats()
+    statements_recorded = {route: round(stats["avg_statements"] * stats["requests"]) for route, stats in sql_stats_by_route.items()}
+    print(f"{'route':<24}{'requests':>10}{'avg statements':>16}{'max statements':>16}{'avg ms':>10}")
+    for route, stats in sql_stats_by_route.items():
+        print(f"{route:<24}{stats['requests']:>10}{stats['avg_statements']:>16.1f}{stats['max_statements']:>16}{stats['avg_ms']:>10.2f}")
+    checks.append(("the statements recorded per route match those counted independently", statements_recorded == {route: count for route, count in statements_counted.items() if count}))
+
+    # Run a request which retrieves products one at a time, and check that the repeated statement and the exceeded statement
+    # budget are both reported:
+    with main.app.test_request_context("/n_plus_one"):
+        for product_id in range(1, N_PLUS_ONE_PRODUCTS + 1):
+            main.retrieve_from_database("get_prod_by_id", product_id=product_id)
+    warnings = [warning for _, request_path, warning in main.get_request_sql_stats()[1] if request_path == "/n_plus_one"]
+    checks.append(("a statement run once per product is reported, with its transaction type", any(f"(trans. type: get_prod_by_id) was run {N_PLUS_ONE_PRODUCTS} times" in warning for warning in warnings)))
+    checks.append(("the statement budget is reported as exceeded", any(f"{N_PLUS_ONE_PRODUCTS} SQL statements were run (budget: {SQL_BUDGET_STATEMENTS})" in warning for warning in warnings)))
+
+    # Check that the "Diagnostics" page is served to the admin only:
+    admin = main.app.test_client()
+    admin.post("/login", data={"txt_username": "user1@example.com", "txt_password": load_test.SEED_PASSWORD})
+    diagnostics_page = admin.get("/diagnostics")
+    checks.append(("the diagnostics page is served to the admin, showing the routes' statistics", diagnostics_page.status_code == 200 and b"checkout_successful" in diagnostics_page.data and b"get_prod_by_id" in diagnostics_page.data))
+    checks.append(("the diagnostics page is refused to other users", client.get("/diagnostics").status_code == 403))
+
+    # Time the journeys with and without the instrumentation's engine event listeners, alternately:
+    fastest = {True: elapsed_with, False: float("inf")}
+    for instrumented in [False, True] * args.rounds:
+        for identifier, listener in (("before_cursor_execute", main.start_sql_statement_timer), ("after_cursor_execute", main.record_sql_statement)):
+            (event.listen if instrumented else event.remove)(engine, identifier, listener)
+        fastest[instrumented] = min(fastest[instrumented], run_journeys(client, args.journeys, random.Random(1))[0])
+    print(f"\n{requests} requests per round (fastest of {args.rounds + 1} with, {args.rounds} without): {requests / fastest[True]:.1f} requests/s with the instrumentation, "
+          f"{requests / fastest[False]:.1f} requests/s without")
+
+    for description, passed in checks:
+        print(f"{'OK  ' if passed else 'FAIL'}    {description}")
+    sys.exit(0 if all(passed for _, passed in checks) else 1)
+
+
+if __name__ == "__main__":
+    main_sql_instrumentation()
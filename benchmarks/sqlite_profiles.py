@@ -0,0 +1,59 @@
+# BENCHMARK: Concurrent mixed read/write traffic under each SQLite tuning profile.
+#
+# OBJECTIVE: To compare the SQLite tuning profiles defined in "data.py" (e.g., "default" vs. "tuned"), by:
+#            1. Seeding one scratch database (see "load_test.py").
+#            2. For each profile, running the load test (whose journeys mix page views with cart updates and checkouts)
+#               against a fresh copy of that database, in a separate process with the profile applied.
+#
+# USAGE: python benchmarks/sqlite_profiles.py [--db PATH] [--profiles NAME ...] [any other "load_test.py" options]
+
+# Import necessary libraries:
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Define constant for the load-test script run for each profile:
+LOAD_TEST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_test.py")
+
+# Define constant for the load-test options which only apply to seeding:
+SEED_OPTIONS = ("--products", "--users", "--order-details", "--seed")
+
+
+def run_load_test(db_path, profile, options):
+    """Function to run the load test against a database, in a separate process with the SQLite tuning profile applied"""
+    env = dict(os.environ, SQLITE_PROFILE=profile)
+    subprocess.run([sys.executable, LOAD_TEST_SCRIPT, "--db", db_path] + options, env=env, check=True)
+
+
+def main():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Compare SQLite tuning profiles under concurrent mixed read/write traffic.")
+    parser.add_argument("--db", help="path of the seeded scratch SQLite database (seeded if it does not exist; default: a temporary file)")
+    parser.add_argument("--profiles", nargs="+", default=["default", "tuned"], help="profiles to compare (default: default tuned)")
+    args, load_test_options = parser.parse_known_args()
+
+    work_dir = tempfile.mkdtemp(prefix="sqlite_profiles_")
+    try:
+        # Seed the database once (using SQLite's own settings, so the copies start out identical):
+        db_path = args.db or os.path.join(work_dir, "shop.db")
+        if not os.path.exists(db_path):
+            seed_options = [option for i, option in enumerate(load_test_options)
+                            if option.split("=")[0] in SEED_OPTIONS or (i > 0 and load_test_options[i - 1] in SEED_OPTIONS)]
+            run_load_test(db_path, "default", seed_options + ["--virtual-users", "1", "--iterations", "0", "--warmup", "0"])
+
+        # Run the load test against a fresh copy of the seeded database for each profile:
+        for profile in args.profiles:
+            print(f"\n*** SQLite profile: {profile} ***", flush=True)
+            profile_db_path = os.path.join(work_dir, f"shop_{profile}.db")
+            shutil.copyfile(db_path, profile_db_path)
+            run_load_test(profile_db_path, profile, load_test_options)
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# BENCHMARK: Application startup and first-request latency, by template mode.
+#
+# OBJECTIVE: To measure, in fresh Python processes (as seen by each new worker process), the time taken to start this
+#            application and the time taken by the first request to each of several web pages, for each of:
+#            1. Development mode (templates compiled on first use and checked for changes each time they are used).
+#            2. Production mode with an empty bytecode cache (templates compiled once at startup and cached on disk).
+#            3. Production mode with a warm bytecode cache (as seen by the second and subsequent worker processes).
+#
+# USAGE: python benchmarks/template_startup.py [--runs N]
+
+# Import necessary libraries:
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Define constant for the directory containing this application:
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Define constant for the web pages whose first request is timed:
+ROUTES = ["/", "/about", "/contact", "/login", "/register"]
+
+# Define the script run in each fresh process.  Development mode mirrors "app.run(debug=True)", which turns on
+# template auto-reload:
+CHILD_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+import main
+startup_secs = time.perf_counter() - start
+if os.environ["APP_MODE"] == "development":
+    main.app.debug = True
+client = main.app.test_client()
+first_request_secs = {}
+for route in json.loads(sys.argv[1]):
+    start = time.perf_counter()
+    client.get(route)
+    first_request_secs[route] = time.perf_counter() - start
+print(json.dumps({"startup": startup_secs, "first_requests": first_request_secs}))
+"""
+
+
+def run_child(app_mode, bytecode_cache_dir):
+    """Function to start this application in a fresh process and return its startup and first-request timings"""
+    env = dict(os.environ, APP_MODE=app_mode, TEMPLATE_BYTECODE_CACHE_DIR=bytecode_cache_dir)
+    result = subprocess.run([sys.executable, "-c", CHILD_SCRIPT, json.dumps(ROUTES)], cwd=APP_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(label, samples):
+    """Function to print the median startup and first-request timings (in milliseconds) across samples"""
+    startup_ms = statistics.median(sample["startup"] for sample in samples) * 1000
+    first_request_ms = {route: statistics.median(sample["first_requests"][route] for sample in samples) * 1000 for route in ROUTES}
+    print(f"{label:<32}{startup_ms:>12.1f}" + "".join(f"{first_request_ms[route]:>12.1f}" for route in ROUTES) + f"{sum(first_request_ms.values()):>12.1f}")
+
+
+def main():
+    """Main function for this benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark application startup and first-request latency, by template mode.")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh processes to time per mode (default: 5)")
+    args = parser.parse_args()
+
+    samples = {"development": [], "production (cold cache)": [], "production (warm cache)": []}
+    for _ in range(args.runs):
+        bytecode_cache_dir = tempfile.mkdtemp(prefix="template_cache_")
+        try:
+            samples["development"].append(run_child("development", bytecode_cache_dir))
+            samples["production (cold cache)"].append(run_child("production", bytecode_cache_dir))
+            samples["production (warm cache)"].append(run_child("production", bytecode_cache_dir))
+        finally:
+            shutil.rmtree(bytecode_cache_dir, ignore_errors=True)
+
+    print(f"Median of {args.runs} run(s), in milliseconds:")
+    print(f"{'mode':<32}{'startup':>12}" + "".join(f"{route:>12}" for route in ROUTES) + f"{'all pages':>12}")
+    for label, mode_samples in samples.items():
+        summarize(label, mode_samples)
+
+
+if __name__ == "__main__":
+    main()
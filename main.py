@@ -6,24 +6,37 @@
 #            3. Have login/registration authentication features.
 
 # Import necessary libraries:
-from data import app, db, API_STRIPE_KEY_TEST_SECRET, RATE_SALES_TAX, RATE_SHIPPING, SECRET_KEY_FOR_CSRF_PROTECTION, SENDER_EMAIL_GMAIL, SENDER_HOST, SENDER_PASSWORD_GMAIL, SENDER_PORT, SITE_DOMAIN
-from data import CartDetails, Orders, OrderDetails, ProductCategories, Products, UnitsOfMeasure, Users
+from data import app, db, ADMIN_PAGE_SIZE, API_STRIPE_KEY_TEST_SECRET, APP_MODE, CACHE_SYNC_INTERVAL, DATABASE_MAX_OVERFLOW, DATABASE_POOL_RECYCLE, DATABASE_POOL_SIZE, DATABASE_POOL_TIMEOUT, DATABASE_REPLICA_LAG_SECS, DATABASE_REPLICA_URIS, DATABASE_URI, PAGE_CACHE_MAX_BYTES, PAGE_CACHE_MAX_ENTRIES, RATE_SALES_TAX, RATE_SHIPPING, SECRET_KEY_FOR_CSRF_PROTECTION, SENDER_EMAIL_GMAIL, SENDER_HOST, SENDER_PASSWORD_GMAIL, SENDER_PORT, SITE_DOMAIN, SQLITE_PROFILE, SQLITE_PROFILES, SQL_BUDGET_MS, SQL_BUDGET_STATEMENTS, SQL_REPEAT_THRESHOLD, SQL_WARNINGS_KEPT, TEMPLATE_BYTECODE_CACHE_DIR
+from data import CacheVersions, CartDetails, Orders, OrderDetails, ProductCategories, Products, SalesByCategory, SalesByDay, SalesByProduct, SchemaMigrations, UnitsOfMeasure, Users
 from data import AddProductToCartForm, AddOrEditProductForm, AddOrEditProductCategoryForm, AddOrEditUOMForm, AddOrEditUserForm, ContactForm, EditCartDetailForm, EditOrderForm, LoginForm, RegisterForm
-from datetime import datetime
+import base64
+from collections import Counter, deque, OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
 import email_validator
-from flask import abort, Flask, flash, redirect, render_template, request, url_for
+from flask import abort, Flask, flash, g, has_app_context, has_request_context, make_response, redirect, render_template, request, session, url_for
 from flask_bootstrap import Bootstrap5
 from flask_login import current_user, login_required, login_user, LoginManager, logout_user, UserMixin
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileAllowed, FileField
 from functools import wraps  # Used in 'admin_only" decorator function
+import hashlib
+import json
+from jinja2 import FileSystemBytecodeCache, pass_context
+from markupsafe import escape, Markup
 import os
-from sqlalchemy import and_, Boolean, DateTime, Float, ForeignKey, func, Integer, String
+import re
+from sqlalchemy import and_, bindparam, Boolean, Date, DateTime, event, exists, Float, ForeignKey, func, inspect, Integer, literal, or_, String, text, true
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import smtplib
+import sqlite3
 import stripe
+import threading
+import time
 import traceback
+from werkzeug.local import LocalProxy
 from werkzeug.security import check_password_hash, generate_password_hash
 from wtforms import BooleanField, DateField, DecimalField, EmailField, IntegerField, PasswordField, SelectField, StringField, SubmitField, TextAreaField, validators
 from wtforms.validators import Email, InputRequired, Length, NumberRange, Optional
@@ -41,6 +54,150 @@ app = Flask(__name__)
 # Initialize variable to track whether a logged-in user is an admin
 admin = False
 
+# Initialize in-memory cache of active product categories (used for population of the navigation bar).  The cache
+# is invalidated (by bumping its version number) whenever a product category is added, edited, or deleted:
+active_prod_cat_cache = {"version": 0, "cached_version": None, "records": None, "hits": 0, "misses": 0}
+active_prod_cat_cache_lock = threading.Lock()
+
+# Initialize in-memory counters of cart details per user (used for population of the cart badge on the navigation bar).
+# Counters are kept up to date by the cart-related database updates; the "writes" counter allows a count retrieved
+# from the database to be discarded if a cart update took place while that count was being retrieved:
+cart_detail_counts = {"counts": {}, "writes": 0}
+cart_detail_counts_lock = threading.Lock()
+
+# Initialize in-memory cache of cart totals per user (used for population of the cart and checkout pages), tagged by the
+# version of the cart from which they were computed.  A user's cart version is bumped by every update to that user's cart,
+# and every cart's version by every price update, so cached totals are only reused while the cart remains unchanged:
+cart_totals_cache = {"versions": {}, "price_version": 0, "totals": {}, "hits": 0, "misses": 0}
+cart_totals_cache_lock = threading.Lock()
+
+# Initialize variable to track the version of the product catalog (products, product categories, and units of measure).
+# The version is bumped whenever the catalog is updated, which invalidates any cached renderings of catalog pages.  The
+# time of the last catalog update, along with a revision number and time of last update for each product updated since
+# this application was started, is also tracked (for validation of pages cached by browsers and proxies):
+catalog_state = {"version": 0, "started": datetime.now(timezone.utc).replace(microsecond=0), "last_modified": datetime.now(timezone.utc).replace(microsecond=0), "product_revisions": {}}
+
+# Initialize in-memory cache of pages rendered for anonymous visitors (keyed by route, catalog version, and admin status).
+# The cache is bounded in both number of pages and total size, with least recently used pages evicted first:
+page_cache = {"pages": OrderedDict(), "bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+page_cache_lock = threading.Lock()
+
+# Initialize in-memory cache of rendered page fragments (header and footer) shared by all web pages, keyed by fragment
+# template, active-product-category cache version, and user state.  Values which vary per request (cart detail count
+# and user's name) are rendered as placeholders, which are filled in each time a cached fragment is used:
+fragment_cache = {"fragments": {}, "hits": 0, "misses": 0}
+fragment_cache_lock = threading.Lock()
+FRAGMENT_PLACEHOLDER_CART_DETAIL_COUNT = "__fragment_cart_detail_count__"
+FRAGMENT_PLACEHOLDER_USER_NAME = "__fragment_user_name__"
+
+# Initialize in-memory snapshot of the product catalog (products, product categories, and units of measure), which serves
+# read-only catalog lookups without querying the database.  The snapshot is never modified; instead, a new snapshot is
+# built and swapped in whenever a catalog update has been committed (or, for a stock update via order creation, a copy
+# of the snapshot is swapped in with the affected products' quantities in stock patched):
+catalog_snapshot_state = {"snapshot": None, "builds": 0, "patches": 0}
+catalog_snapshot_lock = threading.Lock()
+CATALOG_SNAPSHOT_TRANS_TYPES = ("get_active_products_with_category", "get_prod_by_id_with_uom", "get_prod_by_name", "get_prod_cat_by_name", "get_products_page", "get_products_page_after", "get_products_page_before", "get_uom_by_code")
+
+# Define, for each admin list retrieved one page at a time (see "get_page"), the fields which identify a row's position
+# within the list (its sort key and ID).  The next and previous pages are identified by the position of the last and first
+# row of the current page, respectively, so each page is retrieved via an index (however far into the list it is):
+PAGE_KEYS = {"get_orders_by_user_id_page": ("date_ordered", "order_id"),
+             "get_orders_page": ("date_ordered", "order_id"),
+             "get_prod_cats_page": ("name", "category_id"),
+             "get_products_page": ("name", "product_id"),
+             "get_uoms_page": ("code", "uom_id"),
+             "get_users_page": ("name", "id")}
+
+# Define the name, as shown to the user, of each entity whose records can be deleted (see "validate_delete"):
+DELETE_ENTITY_NAMES = {"prod_cat": "Product category", "product": "Product", "uom": "UOM", "user": "User"}
+
+# Define the periods (in days, up to and including today) for which the sales report can be shown, and the period shown by default:
+SALES_REPORT_PERIODS = (7, 30, 90, 365)
+SALES_REPORT_DEFAULT_PERIOD = 30
+
+# Initialize variable to track the versions (as last seen in the "cache_versions" database table) of data cached in memory
+# by this worker process, along with when they were last checked.  Only used if more than one worker process serves this
+# website (see "CACHE_SYNC_INTERVAL"):
+shared_cache_state = {"versions": None, "checked": 0.0}
+shared_cache_state_lock = threading.Lock()
+
+# Initialize the rotation of read replicas (see "DATABASE_REPLICA_URIS"), along with counters of the reads served by the
+# primary database and by each replica, and of replica reads which failed (and so were served by the primary database):
+replica_state = {"next": 0, "primary_reads": 0, "replica_reads": {}, "fallbacks": 0}
+replica_state_lock = threading.Lock()
+
+# Define the transaction types whose reads may be served by a read replica: order history, admin lists, selection lists,
+# and the sales report.  All other reads are served by the primary database, including cart reads (which must reflect the
+# user's latest cart updates) and the reads which fill in-memory caches (which would otherwise keep any stale data
+# retrieved from a replica until the next catalog update):
+REPLICA_TRANS_TYPES = ("get_all_product_categories", "get_all_uoms", "get_order_by_order_id_with_added_details", "get_order_details_by_order_id",
+                       "get_orders_by_user_id_page", "get_orders_by_user_id_page_after", "get_orders_by_user_id_page_before",
+                       "get_orders_page", "get_orders_page_after", "get_orders_page_before",
+                       "get_prod_cats_page", "get_prod_cats_page_after", "get_prod_cats_page_before",
+                       "get_sales_by_category", "get_sales_by_day", "get_sales_by_product",
+                       "get_uoms_page", "get_uoms_page_after", "get_uoms_page_before",
+                       "get_users_page", "get_users_page_after", "get_users_page_before")
+
+# Initialize registry of the database queries run by "retrieve_from_database", keyed by transaction type.  Each query's
+# statement is built once (by the "config_queries" function), with bound parameters supplied each time it is run:
+query_registry = {}
+
+# Initialize timing statistics for each registered query, along with a list of functions (hooks) to be called, with
+# the transaction type and elapsed seconds, each time a registered query has been run:
+query_stats = {}
+query_stats_lock = threading.Lock()
+query_timing_hooks = []
+
+# Initialize statistics of the SQL statements run on behalf of each route (number of requests, statements run, and time
+# spent running them), along with the most recent warnings of requests which exceeded the SQL budgets (see "SQL_BUDGET_STATEMENTS"):
+request_sql_stats = {"routes": {}, "warnings": deque(maxlen=SQL_WARNINGS_KEPT)}
+request_sql_stats_lock = threading.Lock()
+
+# Define the patterns which reduce a SQL statement to its shape, so that statements which differ only in the number of
+# values bound (e.g., "IN (?, ?, ?)" vs. "IN (?, ?)") or in how bound values are marked (e.g., PostgreSQL's "%(name)s")
+# are recognized as the same statement:
+SQL_SHAPE_PATTERNS = ((re.compile(r"%\(\w+\)s"), "?"), (re.compile(r"\?(\s*,\s*\?)+"), "?"), (re.compile(r"\(\?\)(\s*,\s*\(\?\))+"), "(?)"))
+
+# Define the schema migrations which bring a database created by an earlier version of this application up to date.
+# Migrations are applied in version order, each at most once (applied versions are recorded in the "schema_migrations"
+# database table).  Each step of a migration is either a SQL statement or a function run within the migration's database
+# transaction.  New migrations must be appended with the next version number; applied migrations must not be changed:
+SCHEMA_MIGRATIONS = [
+    (1, "Add indexes on foreign keys and on lower-cased names used for lookups and sorting", [
+        "CREATE INDEX IF NOT EXISTS ix_cart_details_user_id ON cart_details (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_cart_details_product_id ON cart_details (product_id)",
+        "CREATE INDEX IF NOT EXISTS ix_cart_details_uom_id ON cart_details (uom_id)",
+        "CREATE INDEX IF NOT EXISTS ix_order_details_order_id ON order_details (order_id)",
+        "CREATE INDEX IF NOT EXISTS ix_order_details_product_id ON order_details (product_id)",
+        "CREATE INDEX IF NOT EXISTS ix_order_details_uom_id ON order_details (uom_id)",
+        "CREATE INDEX IF NOT EXISTS ix_orders_user_id ON orders (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_orders_date_ordered_order_id ON orders (date_ordered, order_id)",
+        "CREATE INDEX IF NOT EXISTS ix_products_category_id ON products (category_id)",
+        "CREATE INDEX IF NOT EXISTS ix_products_uom_id ON products (uom_id)",
+        "CREATE INDEX IF NOT EXISTS ix_products_lower_name ON products (lower(name))",
+        "CREATE INDEX IF NOT EXISTS ix_product_categories_lower_name ON product_categories (lower(name))",
+        "CREATE INDEX IF NOT EXISTS ix_units_of_measure_lower_code ON units_of_measure (lower(code))",
+        "CREATE INDEX IF NOT EXISTS ix_users_lower_name ON users (lower(name))",
+        "CREATE INDEX IF NOT EXISTS ix_users_lower_username ON users (lower(username))",
+    ]),
+    (2, "Add versions of data cached in memory by each worker process (product catalog and quantities in stock)", [
+        "INSERT INTO cache_versions (name, version) VALUES ('catalog', 0)",
+        "INSERT INTO cache_versions (name, version) VALUES ('stock', 0)",
+    ]),
+    (3, "Index orders in the order listed (newest first), for retrieval of the orders list one page at a time", [
+        "CREATE INDEX IF NOT EXISTS ix_orders_date_ordered_desc_order_id ON orders (date_ordered DESC, order_id)",
+        "CREATE INDEX IF NOT EXISTS ix_orders_user_id_date_ordered_desc_order_id ON orders (user_id, date_ordered DESC, order_id)",
+        "DROP INDEX IF EXISTS ix_orders_date_ordered_order_id",
+    ]),
+    (4, "Record the product category of each order detail at the time of ordering (order details which predate this are assigned their product's current category)", [
+        lambda: add_column_if_missing("order_details", "category_id", "INTEGER"),
+        "UPDATE order_details SET category_id = (SELECT products.category_id FROM products WHERE products.product_id = order_details.product_id) WHERE category_id IS NULL",
+    ]),
+    (5, "Build the sales rollups from all existing orders", [
+        lambda: fill_sales_rollups(),
+    ]),
+]
+
 # Create needed class "Base":
 class Base(DeclarativeBase):
     pass
@@ -76,17 +233,304 @@ def admin_only(f):
     return decorated_function
 
 
+# CONFIGURE DATA SHARED BY ALL WEB PAGES (FOR POPULATION OF THE NAVIGATION BAR):
+# ***********************************************************************************************************
+# Implement a context processor which makes navigation-bar data available to all templates.  Values are computed lazily
+# (only if a template actually reads them) and at most once per request, so routes that redirect instead of rendering
+# a template (e.g., "view_product" -> "cart") do not incur the database lookups:
+@app.context_processor
+def inject_navigation_data():
+    return {"active_product_categories": LocalProxy(lambda: get_request_active_product_categories()[0]),
+            "active_prod_cat_count": LocalProxy(lambda: get_request_active_product_categories()[1]),
+            "cart_detail_count": LocalProxy(get_request_cart_detail_count),
+            "admin": admin}
+
+
+# Before each request, discard in-memory copies of data which another worker process has updated:
+@app.before_request
+def sync_shared_caches():
+    """Function to discard in-memory copies of catalog data if another worker process has updated the catalog (checked at most once per CACHE_SYNC_INTERVAL seconds)"""
+    # If a single worker process serves this website, its in-memory copies are always current:
+    if CACHE_SYNC_INTERVAL is None:
+        return
+
+    # Check no more often than configured:
+    with shared_cache_state_lock:
+        now = time.monotonic()
+        if now - shared_cache_state["checked"] < CACHE_SYNC_INTERVAL:
+            return
+        shared_cache_state["checked"] = now
+
+    # Get the current versions of data cached in memory.  If they could not be retrieved, check again at the next request:
+    versions = retrieve_from_database("get_cache_versions")
+    if versions == {}:
+        return
+
+    # Identify which data has been updated since last checked (nothing is discarded upon the first check, since no
+    # data has been cached by this worker process before then):
+    with shared_cache_state_lock:
+        versions_last_seen = shared_cache_state["versions"]
+    updated = set() if versions_last_seen is None else {name for name, version in versions.items() if versions_last_seen.get(name) != version}
+
+    # Discard in-memory copies of updated data (without publishing the update again):
+    if "catalog" in updated:
+        invalidate_active_product_categories_cache()
+        update_catalog_version(publish=False)
+    elif "stock" in updated:
+        refresh_catalog_snapshot()
+
+    # Record the versions seen only once the in-memory copies reflect them (since pages' ETags are built from them):
+    with shared_cache_state_lock:
+        shared_cache_state["versions"] = versions
+
+
+# Implement a template function which renders a page fragment (e.g., "header.html"), reusing cached markup whenever
+# possible.  Markup is cached per active-product-category cache version and user state (anonymous, customer, or admin),
+# with the cart detail count and user's name filled in for each request:
+@app.template_global()
+@pass_context
+def render_cached_fragment(context, template_name):
+    # Determine the user state which the fragment's markup depends upon:
+    user = context.get("current_user")
+    is_authenticated = bool(user is not None and user.is_authenticated)
+    is_admin = bool(context.get("admin") or (is_authenticated and user.id == 1))
+    if is_admin:
+        user_state = "admin"
+    elif is_authenticated:
+        user_state = "customer"
+    else:
+        user_state = "anonymous"
+
+    # Retrieve the fragment's markup from the cache.  If not cached, render it (with placeholders for per-request values) and cache it:
+    key = (template_name, active_prod_cat_cache["version"], is_authenticated, user_state)
+    with fragment_cache_lock:
+        fragment = fragment_cache["fragments"].get(key)
+        if fragment is not None:
+            fragment_cache["hits"] += 1
+        else:
+            fragment_cache["misses"] += 1
+
+    if fragment is None:
+        fragment = app.jinja_env.get_template(template_name).render(dict(context.get_all(), current_user=FragmentUser(is_authenticated), admin=is_admin,
+                                                                        cart_detail_count=FRAGMENT_PLACEHOLDER_CART_DETAIL_COUNT))
+        with fragment_cache_lock:
+            # Discard fragments cached for previous versions of the active-product-category cache:
+            for cached_key in [cached_key for cached_key in fragment_cache["fragments"] if cached_key[1] != key[1]]:
+                del fragment_cache["fragments"][cached_key]
+            fragment_cache["fragments"][key] = fragment
+
+    # Fill in the per-request values and return the fragment's markup:
+    if FRAGMENT_PLACEHOLDER_CART_DETAIL_COUNT in fragment:
+        fragment = fragment.replace(FRAGMENT_PLACEHOLDER_CART_DETAIL_COUNT, str(escape(context.get("cart_detail_count"))))
+    if FRAGMENT_PLACEHOLDER_USER_NAME in fragment:
+        fragment = fragment.replace(FRAGMENT_PLACEHOLDER_USER_NAME, str(escape(user.name)))
+    return Markup(fragment)
+
+
+# Define a stand-in for the current user, used when rendering page fragments for caching (the user's name is a placeholder,
+# and admin status is conveyed via the "admin" template variable):
+class FragmentUser:
+    def __init__(self, is_authenticated):
+        self.is_authenticated = is_authenticated
+        self.id = None
+        self.name = FRAGMENT_PLACEHOLDER_USER_NAME
+
+
+# CONFIGURE INSTRUMENTATION OF THE SQL STATEMENTS RUN ON BEHALF OF EACH REQUEST (SHOWN ON THE "DIAGNOSTICS" WEB PAGE):
+# ***********************************************************************************************************
+# After each request, check the SQL statements run on behalf of the request (as recorded by "record_sql_statement") against
+# the SQL budgets, logging a warning for each budget exceeded, and add them to the statistics for the request's route:
+@app.teardown_request
+def check_request_sql_stats(exception=None):
+    """Function to check the SQL statements run on behalf of the request against the SQL budgets, and add them to the statistics for the request's route"""
+    try:
+        # If the request ran no SQL statements, there is nothing to check:
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return
+
+        # Check the request against each SQL budget, including whether any statement was run so many times (with different
+        # parameters) that it is likely run once per row of an earlier result (an "N+1" query pattern):
+        route = request.endpoint or request.path
+        warnings = []
+        if stats["statements"] > SQL_BUDGET_STATEMENTS:
+            warnings.append(f"{stats['statements']} SQL statements were run (budget: {SQL_BUDGET_STATEMENTS}).")
+        if stats["secs"] * 1000 > SQL_BUDGET_MS:
+            warnings.append(f"{stats['secs'] * 1000:.1f} ms were spent running SQL statements (budget: {SQL_BUDGET_MS:g} ms).")
+        for shape, count in stats["shapes"].most_common():
+            if count < SQL_REPEAT_THRESHOLD:
+                break
+            warnings.append(f"The same SQL statement (trans. type: {stats['shape_trans_types'][shape]}) was run {count} times, possibly once per row of an earlier result: {shape}")
+
+        # Add the request to the statistics for its route, and record any warnings:
+        with request_sql_stats_lock:
+            route_stats = request_sql_stats["routes"].setdefault(route, {"requests": 0, "statements": 0, "max_statements": 0, "total_secs": 0.0,
+                                                                         "max_secs": 0.0, "warnings": 0, "trans_types": Counter()})
+            route_stats["requests"] += 1
+            route_stats["statements"] += stats["statements"]
+            route_stats["max_statements"] = max(route_stats["max_statements"], stats["statements"])
+            route_stats["total_secs"] += stats["secs"]
+            route_stats["max_secs"] = max(route_stats["max_secs"], stats["secs"])
+            route_stats["warnings"] += len(warnings)
+            route_stats["trans_types"].update(stats["trans_types"])
+            for warning in warnings:
+                request_sql_stats["warnings"].appendleft((datetime.now(), request.full_path.rstrip("?"), warning))
+
+        for warning in warnings:
+            update_system_log("route: '" + request.path + "' (SQL budget)", "Warning: " + warning)
+
+    except:  # An error has occurred.
+        update_system_log("check_request_sql_stats", traceback.format_exc())
+
+
+# DEFINE THE COMPACT, READ-ONLY RECORDS RETURNED BY DATABASE RETRIEVALS WHICH JOIN SEVERAL TABLES:
+# ***********************************************************************************************************
+# Define base class for compact, read-only records (built from only the columns selected, rather than from database
+# objects).  Fields are stored in slots (rather than a per-record dictionary) and can be read either as attributes
+# (e.g., product.name) or by key (e.g., product["name"]), so records can be used wherever the dictionaries previously
+# returned by "retrieve_from_database" were used:
+class ReadOnlyRecord:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are read-only.")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    # Return a copy of this record with the desired fields replaced:
+    def replace(self, **changes):
+        return type(self)(*[changes.get(field, getattr(self, field)) for field in self.__slots__])
+
+
+# Define record for a cart detail, along with the user, product, and unit of measure it references (fields are listed in
+# the order selected by the database retrievals which return these records):
+class CartDetailRecord(ReadOnlyRecord):
+    __slots__ = ("cart_detail_id", "user_id", "user_name", "user_username", "product_id", "product_name", "product_image", "qty_ordered", "uom_id", "uom_name", "uom_desc", "unit_price", "sales_amt", "unit_price_updated")
+
+
+# Define record for the totals of a user's cart (calculated by "get_cart_totals"):
+class CartTotals(ReadOnlyRecord):
+    __slots__ = ("line_count", "sales_amt", "tax_amt", "ship_amt", "total_amt")
+
+
+# Define record for an order, along with the user who placed it:
+class OrderRecord(ReadOnlyRecord):
+    __slots__ = ("order_id", "date_ordered", "date_paid", "date_shipped", "user_id", "user_name", "user_username", "sales_amt", "tax_amt", "ship_amt", "total_amt", "notes")
+
+
+# Define record for an order detail, along with the product and unit of measure it references:
+class OrderDetailRecord(ReadOnlyRecord):
+    __slots__ = ("order_detail_id", "product_id", "product_name", "qty_ordered", "uom_id", "uom_name", "unit_price", "sales_amt")
+
+
+# Define records for the sales report: sales per day, and sales per product and per product category across a period:
+class SalesCategoryRecord(ReadOnlyRecord):
+    __slots__ = ("category_id", "category_name", "sales_amt", "order_count")
+
+
+class SalesDayRecord(ReadOnlyRecord):
+    __slots__ = ("sales_date", "order_count", "sales_amt", "tax_amt", "ship_amt", "total_amt")
+
+
+class SalesProductRecord(ReadOnlyRecord):
+    __slots__ = ("product_id", "product_name", "qty_ordered", "sales_amt", "order_count")
+
+
+# DEFINE THE IN-MEMORY CATALOG SNAPSHOT (SERVES READ-ONLY CATALOG LOOKUPS WITHOUT QUERYING THE DATABASE):
+# ***********************************************************************************************************
+# Define record for a product category held by the catalog snapshot:
+class CatalogProductCategory(ReadOnlyRecord):
+    __slots__ = ("category_id", "name", "description", "active")
+
+
+# Define record for a product held by the catalog snapshot (fields are listed in the order selected by the
+# "get_catalog_snapshot" database retrieval):
+class CatalogProduct(ReadOnlyRecord):
+    __slots__ = ("product_id", "name", "category_id", "category_name", "unit_price_regular", "unit_price_discounted", "qty_in_stock", "uom_id", "uom_name", "uom_desc", "description", "active", "product_image")
+
+    # Provide the UOM code under the field name used by the home page:
+    @property
+    def uom(self):
+        return self.uom_name
+
+
+# Define record for a unit of measure held by the catalog snapshot:
+class CatalogUOM(ReadOnlyRecord):
+    __slots__ = ("uom_id", "code", "description")
+
+
+# Define the catalog snapshot, which indexes its records by ID and by lower-cased name.  Products
+# are supplied sorted by product category name and product name, and that order is preserved by all product indexes:
+class CatalogSnapshot:
+    __slots__ = ("products", "product_positions", "products_by_id", "products_by_name", "active_products_with_category",
+                 "prod_cats_by_id", "prod_cats_by_name", "uoms_by_id", "uoms_by_code")
+
+    def __init__(self, prod_cats, uoms, products):
+        self.products = tuple(products)
+        self.prod_cats_by_id = {prod_cat.category_id: prod_cat for prod_cat in prod_cats}
+        self.uoms_by_id = {uom.uom_id: uom for uom in uoms}
+
+        # Index by lower-cased name (should names differ only by case, the first record retrieved is used, consistent
+        # with the database lookups this snapshot replaces):
+        self.products_by_name = {}
+        for product in self.products:
+            self.products_by_name.setdefault(product.name.lower(), product)
+        self.prod_cats_by_name = {}
+        for prod_cat in prod_cats:
+            self.prod_cats_by_name.setdefault(prod_cat.name.lower(), prod_cat)
+        self.uoms_by_code = {}
+        for uom in uoms:
+            self.uoms_by_code.setdefault(uom.code.lower(), uom)
+
+        # Index by ID, and capture the position of each product within the list of all products:
+        self.product_positions = {product.product_id: position for position, product in enumerate(self.products)}
+        self.products_by_id = {product.product_id: product for product in self.products}
+
+        # Capture all active products belonging to active product categories (for population of the home page):
+        self.active_products_with_category = tuple(product for product in self.products if product.active and self.prod_cats_by_id[product.category_id].active)
+
+    # Return a copy of this snapshot with the quantities in stock of the desired products replaced (keyed by product ID):
+    def with_qty_in_stock(self, qty_in_stock_by_product_id):
+        products = [product if product.product_id not in qty_in_stock_by_product_id else product.replace(qty_in_stock=qty_in_stock_by_product_id[product.product_id])
+                    for product in self.products]
+        return CatalogSnapshot(self.prod_cats_by_id.values(), self.uoms_by_id.values(), products)
+
+
 # CONFIGURE ROUTES FOR WEB PAGES (LISTED IN HIERARCHICAL ORDER STARTING WITH HOME PAGE, THEN ALPHABETICALLY):
 # ***********************************************************************************************************
 # Configure route for home page:
 @app.route('/',methods=["GET", "POST"])
 def home():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
+        # Capture the catalog version before any catalog data is retrieved, so that this page's rendering is only cached if
+        # the catalog has not been updated while the page was being rendered:
+        catalog_version = catalog_state["version"]
+
+        # If the visitor's cached copy of this page is still current, tell the browser to reuse it (without querying the database or rendering the page):
+        etag, last_modified = get_page_validators("home")
+        not_modified_response = get_not_modified_response(etag, last_modified)
+        if not_modified_response is not None:
+            return not_modified_response
 
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
+        # If visitor is not logged in, return the cached rendering of this page (if one exists for the current catalog version):
+        if not current_user.is_authenticated:
+            cached_page = get_cached_page("home")
+            if cached_page is not None:
+                return set_page_validators(make_response(cached_page), etag, last_modified)
+
+        # Retrieve info. on active product categories (shared with the navigation bar for the duration of this request):
+        active_product_categories, active_prod_cat_count = get_request_active_product_categories()
 
         # Build list of tabs so as to display products by each active product category:
         product_tab_dict = {}
@@ -95,42 +539,60 @@ def home():
             product_tab_dict[item.name] = f"tab-{i}"
             i += 1
 
-        # Build a dictionary containing active products (along with counts) for active product categories:
-        active_prod_dict = {}
-        for item in active_product_categories:
-            active_products, active_prod_count = get_active_products_by_category(item.category_id)
-            active_prod_dict[item.name] = {"count": active_prod_count, "records": active_products}
+        # Build a dictionary containing active products (along with counts) for active product categories
+        # (all active products are retrieved from the database in a single query):
+        active_prod_dict = get_active_products_for_all_categories(active_product_categories)
+
+        # Render the home page.  If visitor is not logged in, cache the rendering for use by subsequent anonymous visitors:
+        page = render_template("index.html", product_tab_dict=product_tab_dict, active_prod_dict=active_prod_dict)
+        if not current_user.is_authenticated:
+            store_cached_page("home", page, catalog_version)
 
         # Go to the home page:
-        return render_template("index.html", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, product_tab_dict=product_tab_dict, active_prod_dict=active_prod_dict, admin=admin)
+        return set_page_validators(make_response(page), etag, last_modified)
 
     except:
         # Log error into system log file:
         update_system_log("route: '/'", traceback.format_exc())
 
         # Go to the home page and display error details to the user:
-        return render_template("index.html", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, product_tab_dict=product_tab_dict, active_prod_dict=active_prod_dict, admin=admin)
+        return render_template("index.html", error_msg=f"{traceback.format_exc()}", product_tab_dict=product_tab_dict, active_prod_dict=active_prod_dict)
 
 
 # Configure route for "About" web page:
 @app.route('/about')
 def about():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
+        # Capture the catalog version before any catalog data is retrieved, so that this page's rendering is only cached if
+        # the catalog has not been updated while the page was being rendered:
+        catalog_version = catalog_state["version"]
+
+        # If the visitor's cached copy of this page is still current, tell the browser to reuse it (without querying the database or rendering the page):
+        etag, last_modified = get_page_validators("about")
+        not_modified_response = get_not_modified_response(etag, last_modified)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        # If visitor is not logged in, return the cached rendering of this page (if one exists for the current catalog version):
+        if not current_user.is_authenticated:
+            cached_page = get_cached_page("about")
+            if cached_page is not None:
+                return set_page_validators(make_response(cached_page), etag, last_modified)
+
+        # Render the "About" page.  If visitor is not logged in, cache the rendering for use by subsequent anonymous visitors:
+        page = render_template("about.html")
+        if not current_user.is_authenticated:
+            store_cached_page("about", page, catalog_version)
 
         # Go to the "About" page:
-        return render_template("about.html", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return set_page_validators(make_response(page), etag, last_modified)
 
     except:
         # Log error into system log:
         update_system_log("route: '/about'", traceback.format_exc())
 
         # Go to the "About" page and display error details to the user:
-        return render_template("about.html", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("about.html", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Add Product Category" web page:
@@ -138,12 +600,6 @@ def about():
 @admin_only
 def add_prod_cat():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Instantiate an instance of the "AddOrEditUOMForm" class:
         form = AddOrEditProductCategoryForm()
 
@@ -167,17 +623,17 @@ def add_prod_cat():
                     msg_status = "Product category has been successfully added."
 
             # Go to the product-category administration page and display the results of database update:
-            return render_template("admin_prod_cat.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_prod_cat.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg)
 
         # Go to the product-category administration page:
-        return render_template("admin_prod_cat.html", trans_type="Add", form=form, msg_status=None, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Add", form=form, msg_status=None)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/add_prod_cat'", traceback.format_exc())
 
         # Go to the product-category administration page and display error details to the user:
-        return render_template("admin_prod_cat.html", trans_type="Add", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Add", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Add Product" web page:
@@ -185,12 +641,6 @@ def add_prod_cat():
 @admin_only
 def add_product():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Instantiate an instance of the "AddOrEditProductForm" class:
         form = AddOrEditProductForm()
 
@@ -246,17 +696,17 @@ def add_product():
                         msg_status = "Product has been successfully added."
 
             # Go to the user administration page and display the results of database update:
-            return render_template("admin_product.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_product.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg)
 
         # Go to the user administration page:
-        return render_template("admin_product.html", trans_type="Add", form=form, error_msg=error_msg, msg_status=msg_status, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Add", form=form, error_msg=error_msg, msg_status=msg_status)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/add_product'", traceback.format_exc())
 
         # Go to the user administration page and display error details to the user:
-        return render_template("admin_product.html", trans_type="Add", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Add", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Add UOM" web page:
@@ -264,12 +714,6 @@ def add_product():
 @admin_only
 def add_uom():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Instantiate an instance of the "AddOrEditUOMForm" class:
         form = AddOrEditUOMForm()
 
@@ -293,17 +737,17 @@ def add_uom():
                     msg_status = "UOM has been successfully added."
 
             # Go to the UOM administration page and display the results of database update:
-            return render_template("admin_uom.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_uom.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg)
 
         # Go to the UOM administration page:
-        return render_template("admin_uom.html", trans_type="Add", form=form, msg_status=None, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Add", form=form, msg_status=None)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/add_uom'", traceback.format_exc())
 
         # Go to the UOM administration page and display error details to the user:
-        return render_template("admin_uom.html", trans_type="Add", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Add", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Add User" web page:
@@ -311,12 +755,6 @@ def add_uom():
 @admin_only
 def add_user():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Instantiate an instance of the "AddOrEditUserForm" class:
         form = AddOrEditUserForm()
 
@@ -340,17 +778,17 @@ def add_user():
                     msg_status = "User has been successfully added."
 
             # Go to the user administration page and display the results of database update:
-            return render_template("admin_user.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_user.html", trans_type="Add", msg_status=msg_status, error_msg=error_msg)
 
         # Go to the user administration page:
-        return render_template("admin_user.html", trans_type="Add", form=form, msg_status=None, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Add", form=form, msg_status=None)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/add_user'", traceback.format_exc())
 
         # Go to the user administration page and display error details to the user:
-        return render_template("admin_user.html", trans_type="Add", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Add", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Cart" web page:
@@ -358,12 +796,6 @@ def add_user():
 @login_required
 def cart():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track whether existing cart detail records were successfully obtained or if an error has occurred:
         success = False
         error_msg = ""
@@ -384,33 +816,29 @@ def cart():
         else:
             cart_details_count = len(existing_cart_details)  # Record count of existing cart details.
 
-            # Total the sales_amt values across cart details:
-            for detail in existing_cart_details:
-                sum_sales_amt += detail["sales_amt"]
-
-            # Calculate the totaL tax and shipping amounts applicable to the cart contents:
-            sum_tax_amt = round(sum_sales_amt * RATE_SALES_TAX, 2)
-            sum_ship_amt = round(sum_sales_amt * RATE_SHIPPING, 2)
-
-            # Calculate the grand total amt applicable to the cart contents:
-            sum_total_amt = sum_sales_amt + sum_tax_amt + sum_ship_amt
+            # Get the total sales, tax, shipping, and grand total amounts applicable to the cart contents:
+            cart_totals = get_cart_totals(current_user.id)
+            if cart_totals is None:
+                error_msg = "An error has occurred. Cart totals cannot be obtained at this time."
+            else:
+                sum_sales_amt = cart_totals.sales_amt
+                sum_tax_amt = cart_totals.tax_amt
+                sum_ship_amt = cart_totals.ship_amt
+                sum_total_amt = cart_totals.total_amt
 
-            # Indicate that record retrieval has been successfully executed:
-            success = True
+                # Indicate that record retrieval has been successfully executed:
+                success = True
 
         # Go to the "Cart" web page to render the results:
         return render_template("cart.html", cart_details=existing_cart_details, cart_details_count=cart_details_count, sum_sales_amt=sum_sales_amt, sum_tax_amt=sum_tax_amt, sum_ship_amt=sum_ship_amt, sum_total_amt=sum_total_amt, success=success,
-                               error_msg=error_msg, active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/cart'", traceback.format_exc())
 
         # Go to the "Cart" web page and display error details to the user:
-        return render_template("cart.html", error_msg=f"{traceback.format_exc()}", success=False,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("cart.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for cart checkout:
@@ -418,12 +846,6 @@ def cart():
 @login_required
 def checkout():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track success of completing preliminary steps prior to checkout:
         msg_status = None
         success = False
@@ -465,6 +887,12 @@ def checkout():
                             msg_status = f"Sorry, for product '{desired_product[0]["name"]}', we only have {desired_product[0]["qty_in_stock"]} {uom_desc.lower()} in stock.  Please go back and adjust quantity to buy."
                             break
 
+            # Get the total sales, tax, shipping, and grand total amounts applicable to the cart contents (shared with the "Cart" page):
+            if error_msg == "":
+                cart_totals = get_cart_totals(current_user.id)
+                if cart_totals is None:
+                    error_msg = "Cart totals could not be obtained.  Checkout cannot proceed at this time."
+
         # If no anomalies have been detected with the preliminary checks above, indicate successful completion of same,
         # which would clear the way for proceeding with checkout completion:
         if msg_status == None and error_msg == "":
@@ -473,16 +901,8 @@ def checkout():
         # If the preliminary steps above do not impede successful checkout, proceed with preparing the components of the
         # checkout instructions to pass along to Stripe for prompting payment:
         if success:
-            # Initialize variable for total sales and shipping amts. across cart details:
-            sum_sales_amt = 0
-            sum_ship_amt = 0
-
-            # Total the sales_amt values across cart details:
-            for detail in existing_cart_details:
-                sum_sales_amt += detail["sales_amt"]
-
-            # Calculate the totaL shipping amount applicable to the cart contents:
-            sum_ship_amt = round(sum_sales_amt * RATE_SHIPPING, 2)
+            # Capture the total shipping amount applicable to the cart contents:
+            sum_ship_amt = cart_totals.ship_amt
 
             # Assign secret API key to the Stripe object:
             stripe.api_key = API_STRIPE_KEY_TEST_SECRET
@@ -573,17 +993,14 @@ def checkout():
         else:
             # Go to the cart detail administration page to render the results:
             return render_template("admin_cart_detail.html", success=success, msg_status=msg_status,
-                                   error_msg=error_msg, active_product_categories=active_product_categories,
-                                   active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                                   error_msg=error_msg)
 
     except:
         # Log error into system log:
         update_system_log("route: '/checkout'", traceback.format_exc())
 
         # Go to the cart detail administration page and display error details to the user:
-        return render_template("admin_cart_detail.html", trans_type="Checkout", error_msg=f"{traceback.format_exc()}",
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Checkout", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Checkout cancelled" web page:
@@ -591,29 +1008,19 @@ def checkout():
 @login_required
 def checkout_cancelled():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Prepare user feedback:
         msg_status = "Checkout has been cancelled."
 
         # Go to the cart detail administration web page to render user feedback:
         return render_template("admin_cart_detail.html", trans_type="Checkout",
-                               msg_status=msg_status,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               msg_status=msg_status)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/checkout_cancelled'", traceback.format_exc())
 
         # Go to the cart detail administration page and display error details to the user:
-        return render_template("admin_cart_detail.html", trans_type="Checkout", error_msg=f"{traceback.format_exc()}",
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Checkout", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Checkout successful" web page:
@@ -621,12 +1028,6 @@ def checkout_cancelled():
 @login_required
 def checkout_successful():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to be used in processing add request:
         msg_status = ""
         error_msg = ""
@@ -637,38 +1038,25 @@ def checkout_successful():
         if new_order_id == False:
             error_msg = "While payment was successful, an error has occurred with creating and updating an order for this purchase.  Please contact this site's administrator as soon as possible."
         else:
-            # Update cart detail count to 0 (for navigation bar), since successful order execution results in emptying of cart contents:
-            cart_detail_count = 0
-
-            # Prepare user feedback:
+            # Prepare user feedback (the navigation bar's cart detail count reflects the emptied cart, since it is retrieved upon rendering):
             msg_status = f"Checkout has been successful. The order ID for this purchase is '{new_order_id}'. Thank you for your order!"
 
         # Go to the cart detail administration web page to render user feedback:
         return render_template("admin_cart_detail.html", trans_type="Checkout Successful",
-                               msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/checkout_successful'", traceback.format_exc())
 
         # Go to the cart detail administration page and display error details to the user:
-        return render_template("admin_cart_detail.html", trans_type="Checkout", error_msg=f"{traceback.format_exc()}",
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Checkout", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Contact Us" web page:
 @app.route('/contact',methods=["GET", "POST"])
 def contact():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Instantiate an instance of the "ContactForm" class:
         form = ContactForm()
 
@@ -678,7 +1066,7 @@ def contact():
             msg_status = email_from_contact_page(form)
 
             # Go to the "Contact Us" page and display the results of e-mail execution attempt:
-            return render_template("contact.html", msg_status=msg_status, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("contact.html", msg_status=msg_status)
 
         # If a user is logged in, pre-populate the contact form with current user's name and e-mail address:
         if current_user.is_authenticated:
@@ -686,14 +1074,14 @@ def contact():
             form.txt_email.data = current_user.username
 
         # Go to the "Contact Us" page:
-        return render_template("contact.html", form=form, msg_status=None, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("contact.html", form=form, msg_status=None)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/contact'", traceback.format_exc())
 
         # Go to the "Contact Us" web page and display error details to the user:
-        return render_template("contact.html", error_msg=traceback.format_exc(), active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("contact.html", error_msg=traceback.format_exc())
 
 
 # Configure route for "Delete Cart Detail" web page:
@@ -701,12 +1089,6 @@ def contact():
 @login_required
 def delete_cart_detail():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         cart_detail_id = request.args.get("cart_detail_id",None)
 
@@ -724,16 +1106,14 @@ def delete_cart_detail():
             record_to_delete = record_to_delete[0]
 
         # Go to the cart detail administration web page to confirm record deletion:
-        return render_template("admin_cart_detail.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_cart_detail'", traceback.format_exc())
 
         # Go to the cart detail administration page and display error details to the user:
-        return render_template("admin_cart_detail.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Cart detail deletion result" web page:
@@ -741,12 +1121,6 @@ def delete_cart_detail():
 @login_required
 def delete_cart_detail_result():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         cart_detail_id = request.args.get("cart_detail_id",None)
 
@@ -758,23 +1132,18 @@ def delete_cart_detail_result():
         if not update_database("delete_cart_detail_by_id", cart_detail_id=cart_detail_id):
             error_msg = "An error has occurred in deleting the item from the cart."
         else:
-            # Deduct cart detail count to update navigation bar in prep. for user feedback):
-            cart_detail_count -= 1
-
             # Prepare successful-execution feedback for user:
             msg_status = "Item has been successfully deleted from cart."
 
         # Go to the cart detail administration page and display the results of database update:
-        return render_template("admin_cart_detail.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_cart_detail_result'", traceback.format_exc())
 
         # Go to the cart detail administration page and display error details to the user:
-        return render_template("admin_cart_detail.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Delete Product Category" web page:
@@ -782,12 +1151,6 @@ def delete_cart_detail_result():
 @admin_only
 def delete_prod_cat():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         prod_cat_id = request.args.get("prod_cat_id",None)
 
@@ -803,16 +1166,14 @@ def delete_prod_cat():
             msg_status = "No matching record was retrieved.  Deletion cannot proceed."
 
         # Go to the product-category administration web page to confirm record deletion:
-        return render_template("admin_prod_cat.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_prod_cat'", traceback.format_exc())
 
         # Go to the product-category administration page and display error details to the user:
-        return render_template("admin_prod_cat.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Product category deletion result" web page:
@@ -820,12 +1181,6 @@ def delete_prod_cat():
 @admin_only
 def delete_prod_cat_result():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         prod_cat_id = request.args.get("prod_cat_id",None)
 
@@ -846,16 +1201,14 @@ def delete_prod_cat_result():
             msg_status = "Validation check failed. " + msg_status
 
         # Go to the product-category administration page and display the results of database update:
-        return render_template("admin_prod_cat.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_prod_cat_result'", traceback.format_exc())
 
         # Go to the product-category administration page and display error details to the user:
-        return render_template("admin_prod_cat.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Delete Product" web page:
@@ -863,12 +1216,6 @@ def delete_prod_cat_result():
 @admin_only
 def delete_product():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         product_id = request.args.get("product_id",None)
 
@@ -884,16 +1231,14 @@ def delete_product():
             msg_status = "No matching record was retrieved.  Deletion cannot proceed."
 
         # Go to the product administration web page to confirm record deletion:
-        return render_template("admin_product.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_product'", traceback.format_exc())
 
         # Go to the product administration page and display error details to the user:
-        return render_template("admin_product.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Product deletion result" web page:
@@ -901,12 +1246,6 @@ def delete_product():
 @admin_only
 def delete_product_result():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         product_id = request.args.get("product_id",None)
 
@@ -927,16 +1266,14 @@ def delete_product_result():
             msg_status = "Validation check failed. " + msg_status
 
         # Go to the product administration page and display the results of database update:
-        return render_template("admin_product.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_product_result'", traceback.format_exc())
 
         # Go to the product administration page and display error details to the user:
-        return render_template("admin_product.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Delete UOM" web page:
@@ -944,12 +1281,6 @@ def delete_product_result():
 @admin_only
 def delete_uom():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         uom_id = request.args.get("uom_id",None)
 
@@ -965,16 +1296,14 @@ def delete_uom():
             msg_status = "No matching record was retrieved.  Deletion cannot proceed."
 
         # Go to the UOM administration web page to confirm record deletion:
-        return render_template("admin_uom.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_uom'", traceback.format_exc())
 
         # Go to the UOM administration page and display error details to the user:
-        return render_template("admin_uom.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "UOM deletion result" web page:
@@ -982,12 +1311,6 @@ def delete_uom():
 @admin_only
 def delete_uom_result():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         uom_id = request.args.get("uom_id",None)
 
@@ -1008,16 +1331,14 @@ def delete_uom_result():
             msg_status = "Validation check failed. " + msg_status
 
         # Go to the UOM administration page and display the results of database update:
-        return render_template("admin_uom.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_uom_result'", traceback.format_exc())
 
         # Go to the UOM administration page and display error details to the user:
-        return render_template("admin_uom.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Delete User" web page:
@@ -1025,12 +1346,6 @@ def delete_uom_result():
 @admin_only
 def delete_user():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         user_id = request.args.get("user_id",None)
 
@@ -1046,16 +1361,14 @@ def delete_user():
             msg_status = "No matching record was retrieved.  Deletion cannot proceed."
 
         # Go to the user administration web page to confirm record deletion:
-        return render_template("admin_user.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Delete", record_to_delete=record_to_delete, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_user'", traceback.format_exc())
 
         # Go to the user administration page and display error details to the user:
-        return render_template("admin_user.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "User deletion result" web page:
@@ -1063,12 +1376,6 @@ def delete_user():
 @admin_only
 def delete_user_result():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         user_id = request.args.get("user_id",None)
 
@@ -1089,16 +1396,44 @@ def delete_user_result():
             msg_status = "Validation check failed. " + msg_status
 
         # Go to the user administration page and display the results of database update:
-        return render_template("admin_user.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Delete", msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/delete_user_result'", traceback.format_exc())
 
         # Go to the user administration page and display error details to the user:
-        return render_template("admin_user.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Delete", error_msg=f"{traceback.format_exc()}")
+
+
+# Configure route for "Diagnostics" web page:
+@app.route('/diagnostics')
+@admin_only
+def diagnostics():
+    try:
+        # Get the SQL statements run per request for each route (along with the most recent SQL budget warnings), and the
+        # time taken by each registered database query which has been run (slowest in total first):
+        sql_stats_by_route, sql_warnings = get_request_sql_stats()
+        query_stats = sorted(((trans_type, stats) for trans_type, stats in get_query_stats().items() if stats["calls"]), key=lambda item: -item[1]["total_ms"])
+
+        # Get the effectiveness of each in-memory cache, and the reads served by the primary database and each read replica:
+        cache_stats = [("Active product categories", get_active_product_categories_cache_stats()),
+                       ("Cart totals", get_cart_totals_cache_stats()),
+                       ("Catalog snapshot", get_catalog_snapshot_stats()),
+                       ("Page fragments", get_fragment_cache_stats()),
+                       ("Pages (anonymous visitors)", get_page_cache_stats()),
+                       ("Read replicas", get_replica_stats())]
+
+        # Go to the "Diagnostics" web page to render the results:
+        return render_template("diagnostics.html", sql_stats_by_route=sql_stats_by_route, sql_warnings=sql_warnings, query_stats=query_stats, cache_stats=cache_stats,
+                               sql_budget_statements=SQL_BUDGET_STATEMENTS, sql_budget_ms=SQL_BUDGET_MS, sql_repeat_threshold=SQL_REPEAT_THRESHOLD, success=True)
+
+    except:  # An error has occurred.
+        # Log error into system log file:
+        update_system_log("route: '/diagnostics'", traceback.format_exc())
+
+        # Go to the "Diagnostics" web page and display error details to the user:
+        return render_template("diagnostics.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for "Edit Cart Detail" web page:
@@ -1106,12 +1441,6 @@ def delete_user_result():
 @login_required
 def edit_cart_detail():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameters passed to this route:
         cart_detail_id = request.args.get("cart_detail_id", None)
         product_id = request.args.get("product_id", None)
@@ -1154,9 +1483,7 @@ def edit_cart_detail():
                     msg_status = "Cart detail has been successfully updated."
 
             # Go to the cart detail administration page and display the results of database update:
-            return render_template("admin_cart_detail.html", msg_status=msg_status, error_msg=error_msg,
-                                   active_product_categories=active_product_categories,
-                                   active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_cart_detail.html", msg_status=msg_status, error_msg=error_msg)
 
         # Initialize variables to be used in processing edit request:
         msg_status = ""
@@ -1179,18 +1506,14 @@ def edit_cart_detail():
 
         # Go to the cart detail administration web page to confirm record updating:
         return render_template("admin_cart_detail.html", trans_type="Edit", form=form, msg_status=msg_status,
-                               error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/edit_cart_detail'", traceback.format_exc())
 
         # Go to the cart detail administration page and display error details to the user:
-        return render_template("admin_cart_detail.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}",
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_cart_detail.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Edit Order" web page:
@@ -1198,12 +1521,6 @@ def edit_cart_detail():
 @admin_only
 def edit_order():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameters passed to this route:
         order_id = request.args.get("order_id", None)
 
@@ -1223,9 +1540,7 @@ def edit_order():
                 msg_status = "Order has been successfully updated."
 
             # Go to the order administration page and display the results of database update:
-            return render_template("admin_order.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg,
-                                   active_product_categories=active_product_categories,
-                                   active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_order.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg)
 
         # Initialize variables to be used in processing edit request:
         msg_status = ""
@@ -1251,18 +1566,14 @@ def edit_order():
 
         # Go to the order administration web page to confirm record updating:
         return render_template("admin_order.html", trans_type="Edit", form=form, msg_status=msg_status,
-                               error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/edit_order'", traceback.format_exc())
 
         # Go to the order administration page and display error details to the user:
-        return render_template("admin_order.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}",
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_order.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Edit Product Category" web page:
@@ -1270,12 +1581,6 @@ def edit_order():
 @admin_only
 def edit_prod_cat():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         prod_cat_id = request.args.get("prod_cat_id",None)
 
@@ -1313,7 +1618,7 @@ def edit_prod_cat():
                         msg_status = "Product category has been successfully edited."
 
             # Go to the product-category administration page and display the results of database update:
-            return render_template("admin_prod_cat.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_prod_cat.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg)
 
         # Initialize variables to be used in processing edit request:
         msg_status = ""
@@ -1332,16 +1637,14 @@ def edit_prod_cat():
             form.chk_active.data = record_to_edit.active
 
         # Go to the product-category administration web page to confirm record updating:
-        return render_template("admin_prod_cat.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/edit_prod_cat'", traceback.format_exc())
 
         # Go to the product-category administration page and display error details to the user:
-        return render_template("admin_prod_cat.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_prod_cat.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Edit Product" web page:
@@ -1349,12 +1652,6 @@ def edit_prod_cat():
 @admin_only
 def edit_product():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         product_id = request.args.get("product_id",None)
 
@@ -1422,7 +1719,7 @@ def edit_product():
                         msg_status = "Product record has been successfully edited."
 
             # Go to the product administration page and display the results of database update:
-            return render_template("admin_product.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_product.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg)
 
         # Initialize variables to be used in processing edit request:
         msg_status = ""
@@ -1447,16 +1744,14 @@ def edit_product():
             form.chk_active.data = record_to_edit.active
 
         # Go to the product administration web page to confirm record updating:
-        return render_template("admin_product.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/edit_product'", traceback.format_exc())
 
         # Go to the product administration page and display error details to the user:
-        return render_template("admin_product.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_product.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Edit UOM" web page:
@@ -1464,12 +1759,6 @@ def edit_product():
 @admin_only
 def edit_uom():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         uom_id = request.args.get("uom_id",None)
 
@@ -1507,7 +1796,7 @@ def edit_uom():
                         msg_status = "UOM has been successfully edited."
 
             # Go to the UOM administration page and display the results of database update:
-            return render_template("admin_uom.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_uom.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg)
 
         # Initialize variables to be used in processing edit request:
         msg_status = ""
@@ -1525,16 +1814,14 @@ def edit_uom():
             form.txt_description.data = record_to_edit.description
 
         # Go to the UOM administration web page to confirm record updating:
-        return render_template("admin_uom.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/edit_uom'", traceback.format_exc())
 
         # Go to the UOM administration page and display error details to the user:
-        return render_template("admin_uom.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_uom.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Edit User" web page:
@@ -1542,12 +1829,6 @@ def edit_uom():
 @admin_only
 def edit_user():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         user_id = request.args.get("user_id",None)
 
@@ -1585,7 +1866,7 @@ def edit_user():
                         msg_status = "User record has been successfully edited."
 
             # Go to the user administration page and display the results of database update:
-            return render_template("admin_user.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+            return render_template("admin_user.html", trans_type="Edit", msg_status=msg_status, error_msg=error_msg)
 
         # Initialize variables to be used in processing edit request:
         msg_status = ""
@@ -1605,16 +1886,14 @@ def edit_user():
             form.chk_active.data = record_to_edit.active
 
         # Go to the user administration web page to confirm record updating:
-        return render_template("admin_user.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Edit", form=form, msg_status=msg_status, error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/edit_user'", traceback.format_exc())
 
         # Go to the user administration page and display error details to the user:
-        return render_template("admin_user.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("admin_user.html", trans_type="Edit", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "user login: web page:
@@ -1709,43 +1988,34 @@ def logout():
 def orders():
     global admin
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track whether existing order records were successfully obtained or if an error has occurred:
         success = False
         error_msg = ""
         order_count = 0
 
-        # Get information on existing orders in the database for the user currently logged in. If user is the admin,
-        # get all orders across all users. Capture feedback to relay to end user:
-        existing_orders = retrieve_from_database("get_orders_by_user_id_with_added_details", user_id=current_user.id)
+        # Get one page of existing orders in the database for the user currently logged in. If user is the admin,
+        # get orders across all users. Capture feedback to relay to end user:
+        existing_orders, previous_cursor, next_cursor = get_page("get_orders_page" if admin else "get_orders_by_user_id_page", request.args.get("cursor"), user_id=current_user.id)
         if existing_orders == {}:
             error_msg = f"An error has occurred. Orders cannot be obtained at this time."
         elif existing_orders == []:
             error_msg = ""
         else:
-            order_count = len(existing_orders)  # Record count of existing orders.
+            order_count = len(existing_orders)  # Record count of existing orders on this page.
 
             # Indicate that record retrieval has been successfully executed:
             success = True
 
         # Go to the "Orders" web page to render the results:
         return render_template("orders.html", orders=existing_orders, order_count=order_count, success=success,
-                               error_msg=error_msg, active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg, previous_cursor=previous_cursor, next_cursor=next_cursor)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/orders'", traceback.format_exc())
 
         # Go to the "Orders" web page and display error details to the user:
-        return render_template("orders.html", error_msg=f"{traceback.format_exc()}", success=False,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("orders.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for "Product Categories" web page:
@@ -1753,38 +2023,33 @@ def orders():
 @admin_only
 def product_categories():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track whether existing product categories were successfully obtained or if an error has occurred:
         success = False
         error_msg = ""
         cat_count = 0
 
-        # Get information on existing product categories in the database. Capture feedback to relay to end user:
-        existing_categories = retrieve_from_database("get_all_product_categories")
+        # Get one page of existing product categories in the database. Capture feedback to relay to end user:
+        existing_categories, previous_cursor, next_cursor = get_page("get_prod_cats_page", request.args.get("cursor"))
         if existing_categories == {}:
             error_msg = f"An error has occurred. Product category information cannot be obtained at this time."
         elif existing_categories == []:
             error_msg = ""
         else:
-            cat_count = len(existing_categories)  # Record count of existing product categories.
+            cat_count = len(existing_categories)  # Record count of existing product categories on this page.
 
             # Indicate that record retrieval has been successfully executed:
             success = True
 
         # Go to the "Product Categories" page:
-        return render_template("product_categories.html", categories=existing_categories, cat_count=cat_count, success=success, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("product_categories.html", categories=existing_categories, cat_count=cat_count, success=success, error_msg=error_msg,
+                               previous_cursor=previous_cursor, next_cursor=next_cursor)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/product_categories'", traceback.format_exc())
 
         # Go to the "Product Categories" page and display error details to the user:
-        return render_template("product_categories.html", error_msg=f"{traceback.format_exc()}", active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("product_categories.html", error_msg=f"{traceback.format_exc()}")
 
 
 # Configure route for "Products" web page:
@@ -1792,42 +2057,33 @@ def product_categories():
 @admin_only
 def products():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track whether existing product records were successfully obtained or if an error has occurred:
         success = False
         error_msg = ""
         prod_count = 0
 
-        # Get information on existing products in the database. Capture feedback to relay to end user:
-        existing_products = retrieve_from_database("get_all_products")
+        # Get one page of existing products. Capture feedback to relay to end user:
+        existing_products, previous_cursor, next_cursor = get_page("get_products_page", request.args.get("cursor"))
         if existing_products == {}:
             error_msg = f"An error has occurred. Product information cannot be obtained at this time."
         elif existing_products == []:
             error_msg = ""
         else:
-            prod_count = len(existing_products)  # Record count of existing products.
+            prod_count = len(existing_products)  # Record count of existing products on this page.
 
             # Indicate that record retrieval has been successfully executed:
             success = True
 
         # Go to the "Products" web page to render the results:
         return render_template("products.html", products=existing_products, prod_count=prod_count, success=success,
-                               error_msg=error_msg, active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg, previous_cursor=previous_cursor, next_cursor=next_cursor)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/products'", traceback.format_exc())
 
         # Go to the "Products" web page and display error details to the user:
-        return render_template("products.html", error_msg=f"{traceback.format_exc()}", success=False,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("products.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for "new user registration" web page:
@@ -1889,43 +2145,81 @@ def register():
         return render_template("register.html", error_msg=f"{traceback.format_exc()}")
 
 
+# Configure route for "Sales Report" web page:
+@app.route('/sales_report')
+@admin_only
+def sales_report():
+    try:
+        # Initialize variables to track whether sales were successfully obtained or if an error has occurred:
+        success = False
+        error_msg = ""
+        period_totals = {}
+
+        # Capture the period (in days) for which the report is desired, using the default period if none (or an unsupported one) is specified:
+        days = request.args.get("days", SALES_REPORT_DEFAULT_PERIOD, type=int)
+        if days not in SALES_REPORT_PERIODS:
+            days = SALES_REPORT_DEFAULT_PERIOD
+        start_date = date.today() - timedelta(days=days - 1)
+
+        # Get sales per day, per product category, and per product across the period from the sales rollups (so the
+        # time taken depends on the number of days and products sold, rather than on the number of orders). Capture
+        # feedback to relay to end user:
+        sales_by_day = retrieve_from_database("get_sales_by_day", start_date=start_date)
+        sales_by_category = retrieve_from_database("get_sales_by_category", start_date=start_date)
+        sales_by_product = retrieve_from_database("get_sales_by_product", start_date=start_date)
+        if sales_by_day == {} or sales_by_category == {} or sales_by_product == {}:
+            error_msg = "An error has occurred. Sales cannot be obtained at this time."
+        else:
+            # Total the sales across the period:
+            period_totals = {field: sum(day[field] for day in sales_by_day) for field in ("order_count", "sales_amt", "tax_amt", "ship_amt", "total_amt")}
+
+            # Indicate that record retrieval has been successfully executed:
+            success = True
+
+        # Go to the "Sales Report" web page to render the results:
+        return render_template("sales_report.html", sales_by_day=sales_by_day, sales_by_category=sales_by_category, sales_by_product=sales_by_product,
+                               period_totals=period_totals, days=days, periods=SALES_REPORT_PERIODS, start_date=start_date, success=success, error_msg=error_msg)
+
+    except:  # An error has occurred.
+        # Log error into system log file:
+        update_system_log("route: '/sales_report'", traceback.format_exc())
+
+        # Go to the "Sales Report" web page and display error details to the user:
+        return render_template("sales_report.html", error_msg=f"{traceback.format_exc()}", success=False)
+
+
 # Configure route for "Units of Measure" web page:
 @app.route('/uom')
 @admin_only
 def uom():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track whether existing units of measure were successfully obtained or if an error has occurred:
         success = False
         error_msg = ""
         uom_count = 0
 
-        # Get information on existing units of measure in the database. Capture feedback to relay to end user:
-        existing_uoms = retrieve_from_database("get_all_uoms")
+        # Get one page of existing units of measure in the database. Capture feedback to relay to end user:
+        existing_uoms, previous_cursor, next_cursor = get_page("get_uoms_page", request.args.get("cursor"))
         if existing_uoms == {}:
             error_msg = f"An error has occurred. Unit-of-measure information cannot be obtained at this time."
         elif existing_uoms == []:
             error_msg = ""
         else:
-            uom_count = len(existing_uoms)  # Record count of existing units of measure.
+            uom_count = len(existing_uoms)  # Record count of existing units of measure on this page.
 
             # Indicate that record retrieval has been successfully executed:
             success = True
 
         # Go to the "Units of Measure" page:
-        return render_template("uom.html", uoms=existing_uoms, uom_count=uom_count, success=success, error_msg=error_msg, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("uom.html", uoms=existing_uoms, uom_count=uom_count, success=success, error_msg=error_msg,
+                               previous_cursor=previous_cursor, next_cursor=next_cursor)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/uom'", traceback.format_exc())
 
         # Go to the "Units of Measure" page and display error details to the user:
-        return render_template("uom.html", error_msg=f"{traceback.format_exc()}", success=False, active_product_categories=active_product_categories, active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("uom.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for "Users" web page:
@@ -1933,42 +2227,33 @@ def uom():
 @admin_only
 def users():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Initialize variables to track whether existing user records were successfully obtained or if an error has occurred:
         success = False
         error_msg = ""
         user_count = 0
 
-        # Get information on existing users in the database. Capture feedback to relay to end user:
-        existing_users = retrieve_from_database("get_all_users")
+        # Get one page of existing users in the database. Capture feedback to relay to end user:
+        existing_users, previous_cursor, next_cursor = get_page("get_users_page", request.args.get("cursor"))
         if existing_users == {}:
             error_msg = f"An error has occurred. User information cannot be obtained at this time."
         elif existing_users == []:
             error_msg = ""
         else:
-            user_count = len(existing_users)  # Record count of existing users.
+            user_count = len(existing_users)  # Record count of existing users on this page.
 
             # Indicate that record retrieval has been successfully executed:
             success = True
 
         # Go to the "Users" web page to render the results:
         return render_template("users.html", users=existing_users, user_count=user_count, success=success,
-                               error_msg=error_msg, active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg, previous_cursor=previous_cursor, next_cursor=next_cursor)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/users'", traceback.format_exc())
 
         # Go to the "Users" web page and display error details to the user:
-        return render_template("users.html", error_msg=f"{traceback.format_exc()}", success=False,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("users.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for "View Order" web page:
@@ -1976,12 +2261,6 @@ def users():
 @login_required
 def view_order():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         order_id = request.args.get("order_id",None)
 
@@ -2013,17 +2292,14 @@ def view_order():
 
         # Go to the "view order" web page to render the results:
         return render_template("view_order.html", order=desired_order, order_details=existing_order_details, order_details_count=order_details_count, success=success,
-                               error_msg=error_msg, active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                               error_msg=error_msg)
 
     except:  # An error has occurred.
         # Log error into system log file:
         update_system_log("route: '/view_order'", traceback.format_exc())
 
         # Go to the "Cart" web page and display error details to the user:
-        return render_template("view_order.html", error_msg=f"{traceback.format_exc()}", success=False,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("view_order.html", error_msg=f"{traceback.format_exc()}", success=False)
 
 
 # Configure route for "View Product" web page:
@@ -2031,15 +2307,15 @@ def view_order():
 @login_required
 def view_product():
     try:
-        # Retrieve info. on active product categories (for population of the navigation bar):
-        active_product_categories, active_prod_cat_count = get_active_product_categories()
-
-        # Retrieve # of items currently in cart (for population of the navigation bar):
-        cart_detail_count = get_cart_detail_count()
-
         # Capture parameter passed to this route:
         product_id = request.args.get("product_id",None)
 
+        # If the visitor's cached copy of this page is still current, tell the browser to reuse it (without querying the database or rendering the page):
+        etag, last_modified = get_page_validators("view_product", product_id=product_id, has_form=True)
+        not_modified_response = get_not_modified_response(etag, last_modified)
+        if not_modified_response is not None:
+            return not_modified_response
+
         # Instantiate an instance of the "AddProductToCartForm" class:
         form = AddProductToCartForm()
 
@@ -2086,15 +2362,14 @@ def view_product():
                     if not update_database("add_prod_to_cart", form=form, user_id=current_user.id, product=desired_product[0]):
                         error_msg = "An error has occurred. Product has not been added to cart."
                     else:
-                        # Update cart detail count (to update navigation bar in prep. for user feedback:
-                        cart_detail_count += 1
-
                         # Indicate that cart update has been successful:
                         msg_status = ""
                         successful_cart_update = True
 
                 elif update_type == "Edit":
-                    if not update_database("edit_prod_in_cart", cart_detail_id=cart_detail_with_prod.cart_detail_id, qty_updated=cart_detail_with_prod.qty_ordered + form.txt_qty_ordered.data):
+                    # Capture the quantity already in cart (the cart detail record is updated in place, as it shares this request's database session):
+                    qty_already_in_cart = cart_detail_with_prod.qty_ordered
+                    if not update_database("edit_prod_in_cart", cart_detail_id=cart_detail_with_prod.cart_detail_id, qty_updated=qty_already_in_cart + form.txt_qty_ordered.data):
                         error_msg = "An error has occurred. Cart has not been updated."
                     else:
                         # If uom code = "EA", it doesn't need to be included in out-of-stock feedback to user.
@@ -2102,7 +2377,7 @@ def view_product():
                             uom_desc = ""
                         else:
                             uom_desc = desired_product[0]["uom_desc"]
-                        msg_status = f"Since {cart_detail_with_prod.qty_ordered} {uom_desc.lower()} was already in cart, quantity has been updated to add {form.txt_qty_ordered.data} {uom_desc.lower()} to existing cart entry."
+                        msg_status = f"Since {qty_already_in_cart} {uom_desc.lower()} was already in cart, quantity has been updated to add {form.txt_qty_ordered.data} {uom_desc.lower()} to existing cart entry."
                         successful_cart_update = True
 
             # If item was successfully added and no feedback to user is required, go to cart:
@@ -2110,9 +2385,7 @@ def view_product():
                 return redirect(url_for("cart"))
             else:
                 # Go to the "View Product" page and display feedback to user:
-                return render_template("view_product.html", msg_status=msg_status, error_msg=error_msg, successful_cart_update=successful_cart_update,
-                                       active_product_categories=active_product_categories,
-                                       active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+                return render_template("view_product.html", msg_status=msg_status, error_msg=error_msg, successful_cart_update=successful_cart_update)
 
         # Initialize variables to track whether existing product record was successfully obtained or if an error has occurred:
         success = False
@@ -2131,27 +2404,52 @@ def view_product():
             # Indicate that record retrieval has been successfully executed:
             success = True
 
-        # Go to the "View Product" web page to continue with product-purchase attempt:
-        return render_template("view_product.html", product=desired_product, form=form, success=success,
-                               error_msg=error_msg,
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        # Go to the "View Product" web page to continue with product-purchase attempt (the page can only be revalidated
+        # by browsers if it was retrieved, rather than returned after an unsuccessful form submission):
+        response = make_response(render_template("view_product.html", product=desired_product, form=form, success=success,
+                                                 error_msg=error_msg))
+        if request.method == "GET":
+            set_page_validators(response, etag, last_modified)
+        return response
 
     except:  # An error has occurred.
         # Log error into system log:
         update_system_log("route: '/view_product'", traceback.format_exc())
 
         # Go to the "View Product" page and display error details to the user:
-        return render_template("view_product.html", error_msg=f"{traceback.format_exc()}",
-                               active_product_categories=active_product_categories,
-                               active_prod_cat_count=active_prod_cat_count, cart_detail_count=cart_detail_count, admin=admin)
+        return render_template("view_product.html", error_msg=f"{traceback.format_exc()}")
+
+
+# CONFIGURE COMMAND-LINE COMMANDS (RUN VIA "flask --app main <command>", LISTED IN ALPHABETICAL ORDER):
+# ***********************************************************************************************************
+# Configure command for rebuilding the sales rollups from all existing orders (e.g., to correct the rollups after orders
+# have been edited directly in the database.  The rollups are first built by schema migration 5, upon upgrading):
+@app.cli.command("rebuild-sales-rollups")
+def rebuild_sales_rollups_command():
+    """Rebuild the sales rollups (used by the sales report) from all existing orders."""
+    if rebuild_sales_rollups():
+        print("Sales rollups have been rebuilt from all existing orders.")
+    else:
+        print("An error has occurred in rebuilding the sales rollups (see system log).")
+
+
+# Configure command for bringing the SQLite read replicas of the database (see "DATABASE_REPLICA_URIS") up to date, by copying
+# the primary database into each of them (e.g., run periodically when testing read replicas locally):
+@app.cli.command("sync-sqlite-replicas")
+def sync_sqlite_replicas_command():
+    """Copy the primary SQLite database into each SQLite read replica."""
+    replica_count = refresh_sqlite_replicas()
+    if replica_count is None:
+        print("An error has occurred in copying the database to its read replicas (see system log).")
+    else:
+        print(f"The database has been copied to {replica_count} read replica(s).")
 
 
 # DEFINE FUNCTIONS TO BE USED FOR THIS APPLICATION (LISTED IN ALPHABETICAL ORDER BY FUNCTION NAME):
 # *************************************************************************************************
 def config_database():
     """Function for configuring the database tables supporting this website"""
-    global db, app, CartDetails, OrderDetails, Orders, ProductCategories, Products, UnitsOfMeasure, Users
+    global db, app, CacheVersions, CartDetails, OrderDetails, Orders, ProductCategories, Products, SalesByCategory, SalesByDay, SalesByProduct, SchemaMigrations, UnitsOfMeasure, Users
 
     try:
         # Create the database object using the SQLAlchemy constructor:
@@ -2160,7 +2458,21 @@ def config_database():
         # Initialize the app with the extension:
         db.init_app(app)
 
+        # If the database (or any of its read replicas) is a SQLite database, apply the configured tuning profile to each new
+        # database connection.  Also, time and record each SQL statement run on behalf of a request (see "record_sql_statement"):
+        with app.app_context():
+            for engine in db.engines.values():
+                if engine.dialect.name == "sqlite":
+                    event.listen(engine, "connect", set_sqlite_pragmas)
+                event.listen(engine, "before_cursor_execute", start_sql_statement_timer)
+                event.listen(engine, "after_cursor_execute", record_sql_statement)
+
         # Configure database tables (listed in alphabetical order; class names are sufficiently descriptive):
+        class CacheVersions(db.Model):
+            __tablename__ = "cache_versions"
+            name: Mapped[str] = mapped_column(String(30), primary_key=True)
+            version: Mapped[int] = mapped_column(Integer, nullable=False)
+
         class CartDetails(db.Model):
             __tablename__ = "cart_details"
             cart_detail_id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -2187,6 +2499,7 @@ def config_database():
             uom = relationship("UnitsOfMeasure", back_populates="order_details")  # Child of "units_of_measure" table.
             unit_price: Mapped[float] = mapped_column(Float, nullable=False)
             sales_amt: Mapped[float] = mapped_column(Float, nullable=False)
+            category_id: Mapped[int] = mapped_column(Integer, nullable=True)  # Product category at the time of ordering (kept, as is, should the product or category change).
 
         class Orders(db.Model):
             __tablename__ = "orders"
@@ -2228,6 +2541,38 @@ def config_database():
             cart_details = relationship("CartDetails", back_populates="product")  # Parent to "cart_details" table.
             product_image: Mapped[str] = mapped_column(String(1000), nullable=False)
 
+        # Sales rollup tables (built from all existing orders by schema migration 5, then kept up to date as each order is
+        # created).  Each aggregates, per day ordered, the orders and order details concerned:
+        class SalesByCategory(db.Model):
+            __tablename__ = "sales_by_category"
+            sales_date: Mapped[date] = mapped_column(Date, primary_key=True)
+            category_id: Mapped[int] = mapped_column(Integer, primary_key=True)  # Product category at the time of ordering (see "order_details").
+            sales_amt: Mapped[float] = mapped_column(Float, nullable=False)
+            order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+        class SalesByDay(db.Model):
+            __tablename__ = "sales_by_day"
+            sales_date: Mapped[date] = mapped_column(Date, primary_key=True)
+            order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+            sales_amt: Mapped[float] = mapped_column(Float, nullable=False)
+            tax_amt: Mapped[float] = mapped_column(Float, nullable=False)
+            ship_amt: Mapped[float] = mapped_column(Float, nullable=False)
+            total_amt: Mapped[float] = mapped_column(Float, nullable=False)
+
+        class SalesByProduct(db.Model):
+            __tablename__ = "sales_by_product"
+            sales_date: Mapped[date] = mapped_column(Date, primary_key=True)
+            product_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+            qty_ordered: Mapped[int] = mapped_column(Integer, nullable=False)
+            sales_amt: Mapped[float] = mapped_column(Float, nullable=False)
+            order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+        class SchemaMigrations(db.Model):
+            __tablename__ = "schema_migrations"
+            version: Mapped[int] = mapped_column(Integer, primary_key=True)
+            description: Mapped[str] = mapped_column(String(200), nullable=False)
+            date_applied: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
         class UnitsOfMeasure(UserMixin, db.Model):
             __tablename__ = "units_of_measure"
             uom_id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -2251,6 +2596,11 @@ def config_database():
         with app.app_context():
             db.create_all()
 
+        # Bring the database schema up to date (e.g., add indexes missing from tables created by earlier versions of this
+        # application).  If function failed, return failed-execution indication to the calling function:
+        if not migrate_database():
+            return False
+
         # At this point, function is presumed to have executed successfully.  Return
         # successful-execution indication to the calling function:
         return True
@@ -2262,6 +2612,282 @@ def config_database():
         return False
 
 
+def config_queries():
+    """Function for building the database queries (one per transaction type) run by the "retrieve_from_database" function"""
+    global query_registry, query_stats
+
+    try:
+        # Define functions for returning query results which need no reshaping:
+        def all_records(query_results):
+            return query_results.scalars().all()
+
+        def first_record(query_results):
+            return query_results.scalar()
+
+        # Define the query for each transaction type (listed in alphabetical order).  Each query specifies its statement (or
+        # tuple of statements), the names of the bound parameters it takes (supplied as keyword arguments to
+        # "retrieve_from_database"), and the function which returns the records to the calling function:
+        queries = {
+            # Retrieve all active product categories, sorted by name (as read-only records rather than database objects,
+            # since they are cached in memory across requests):
+            "get_active_product_categories": {
+                "statement": db.select(ProductCategories.category_id, ProductCategories.name, ProductCategories.description, ProductCategories.active).where(ProductCategories.active == True).order_by(func.lower(ProductCategories.name)),
+                "params": (),
+                "result": lambda query_results: [CatalogProductCategory(*prod_cat) for prod_cat in query_results]},
+
+            # Retrieve all existing product categories, sorted by name:
+            "get_all_product_categories": {
+                "statement": db.select(ProductCategories).order_by(func.lower(ProductCategories.name)),
+                "params": (),
+                "result": all_records},
+
+            # Retrieve all existing units of measure, sorted by code:
+            "get_all_uoms": {
+                "statement": db.select(UnitsOfMeasure).order_by(func.lower(UnitsOfMeasure.code)),
+                "params": (),
+                "result": all_records},
+
+            # Retrieve the versions of data cached in memory by worker processes, keyed by name:
+            "get_cache_versions": {
+                "statement": db.select(CacheVersions.name, CacheVersions.version),
+                "params": (),
+                "result": lambda query_results: dict(query_results.all())},
+
+            # Retrieve the record for the desired cart detail ID:
+            "get_cart_detail_by_id": {
+                "statement": db.select(CartDetails.cart_detail_id, CartDetails.user_id, Users.name, Users.username, CartDetails.product_id, Products.name, Products.product_image, CartDetails.qty_ordered, CartDetails.uom_id, UnitsOfMeasure.code, UnitsOfMeasure.description, CartDetails.unit_price, CartDetails.sales_amt, CartDetails.unit_price_updated).join(Products, CartDetails.product_id == Products.product_id).join(UnitsOfMeasure, CartDetails.uom_id == UnitsOfMeasure.uom_id).join(Users, CartDetails.user_id == Users.id).where(CartDetails.cart_detail_id == bindparam("cart_detail_id")),
+                "params": ("cart_detail_id",),
+                "result": lambda query_results: [CartDetailRecord(*cart_detail) for cart_detail in query_results]},
+
+            # Retrieve the cart detail record where the desired user ID and product ID is referenced:
+            "get_cart_detail_by_user_id_and_prod_id": {
+                "statement": db.select(CartDetails).where(and_(CartDetails.product_id == bindparam("product_id"), CartDetails.user_id == bindparam("user_id"))),
+                "params": ("product_id", "user_id"),
+                "result": first_record},
+
+            # Retrieve the number of cart details for the desired user ID:
+            "get_cart_detail_count_by_user_id": {
+                "statement": db.select(func.count()).select_from(CartDetails).where(CartDetails.user_id == bindparam("user_id")),
+                "params": ("user_id",),
+                "result": first_record},
+
+            # Retrieve the IDs of all products in the cart of the desired user ID:
+            "get_cart_product_ids_by_user_id": {
+                "statement": db.select(CartDetails.product_id).where(CartDetails.user_id == bindparam("user_id")).distinct(),
+                "params": ("user_id",),
+                "result": lambda query_results: set(query_results.scalars().all())},
+
+            # Retrieve the number of cart details, and the total of their sales amounts, for the desired user ID:
+            "get_cart_totals_by_user_id": {
+                "statement": db.select(func.count(), func.coalesce(func.sum(CartDetails.sales_amt), 0)).where(CartDetails.user_id == bindparam("user_id")),
+                "params": ("user_id",),
+                "result": lambda query_results: tuple(query_results.one())},
+
+            # Retrieve all existing cart details for the desired user ID, sorted by product name:
+            "get_cart_details_by_user_id_with_added_details": {
+                "statement": db.select(CartDetails.cart_detail_id, CartDetails.user_id, Users.name, Users.username, CartDetails.product_id, Products.name, Products.product_image, CartDetails.qty_ordered, CartDetails.uom_id, UnitsOfMeasure.code, UnitsOfMeasure.description, CartDetails.unit_price, CartDetails.sales_amt, CartDetails.unit_price_updated).join(Products, CartDetails.product_id == Products.product_id).join(UnitsOfMeasure, CartDetails.uom_id == UnitsOfMeasure.uom_id).join(Users, CartDetails.user_id == Users.id).where(CartDetails.user_id == bindparam("user_id")).order_by(func.lower(Products.name)),
+                "params": ("user_id",),
+                "result": lambda query_results: [CartDetailRecord(*cart_detail) for cart_detail in query_results]},
+
+            # Retrieve all product categories, units of measure, and products (sorted by product category name and product name),
+            # selecting only the columns held by the catalog snapshot, and return a new catalog snapshot built from them:
+            "get_catalog_snapshot": {
+                "statement": (db.select(ProductCategories.category_id, ProductCategories.name, ProductCategories.description, ProductCategories.active).order_by(func.lower(ProductCategories.name)),
+                              db.select(UnitsOfMeasure.uom_id, UnitsOfMeasure.code, UnitsOfMeasure.description).order_by(func.lower(UnitsOfMeasure.code)),
+                              db.select(Products.product_id, Products.name, Products.category_id, ProductCategories.name, Products.unit_price_regular, Products.unit_price_discounted, Products.qty_in_stock, Products.uom_id, UnitsOfMeasure.code, UnitsOfMeasure.description, Products.description, Products.active, Products.product_image).join(ProductCategories, Products.category_id == ProductCategories.category_id).join(UnitsOfMeasure, Products.uom_id == UnitsOfMeasure.uom_id).order_by(func.lower(ProductCategories.name), func.lower(Products.name))),
+                "params": (),
+                "result": lambda prod_cats, uoms, products: CatalogSnapshot(prod_cats=[CatalogProductCategory(*prod_cat) for prod_cat in prod_cats],
+                                                                            uoms=[CatalogUOM(*uom) for uom in uoms],
+                                                                            products=[CatalogProduct(*product) for product in products])},
+
+            # Retrieve the desired order:
+            "get_order_by_order_id_with_added_details": {
+                "statement": db.select(Orders.order_id, Orders.date_ordered, Orders.date_paid, Orders.date_shipped, Orders.user_id, Users.name, Users.username, Orders.sales_amt, Orders.tax_amt, Orders.ship_amt, Orders.total_amt, Orders.notes).join(Users, Orders.user_id == Users.id).where(Orders.order_id == bindparam("order_id")),
+                "params": ("order_id",),
+                "result": lambda query_results: [OrderRecord(*order) for order in query_results]},
+
+            # Retrieve all order details, sorted by product name, which belong to the desired order ID:
+            "get_order_details_by_order_id": {
+                "statement": db.select(OrderDetails.order_detail_id, OrderDetails.product_id, Products.name, OrderDetails.qty_ordered, OrderDetails.uom_id, UnitsOfMeasure.code, OrderDetails.unit_price, OrderDetails.sales_amt).join(Products, OrderDetails.product_id == Products.product_id).join(UnitsOfMeasure, OrderDetails.uom_id == UnitsOfMeasure.uom_id).where(OrderDetails.order_id == bindparam("order_id")).order_by(func.lower(Products.name)),
+                "params": ("order_id",),
+                "result": lambda query_results: [OrderDetailRecord(*order_detail) for order_detail in query_results]},
+
+            # Retrieve the record for the desired product ID:
+            "get_prod_by_id": {
+                "statement": db.select(Products).where(Products.product_id == bindparam("product_id")),
+                "params": ("product_id",),
+                "result": first_record},
+
+            # Retrieve the record for the desired product category ID:
+            "get_prod_cat_by_id": {
+                "statement": db.select(ProductCategories).where(ProductCategories.category_id == bindparam("prod_cat_id")),
+                "params": ("prod_cat_id",),
+                "result": first_record},
+
+            # Retrieve the quantity in stock of each of the desired product IDs, keyed by product ID:
+            "get_qty_in_stock_by_product_ids": {
+                "statement": db.select(Products.product_id, Products.qty_in_stock).where(Products.product_id.in_(bindparam("product_ids", expanding=True))),
+                "params": ("product_ids",),
+                "result": lambda query_results: dict(query_results.all())},
+
+            # Retrieve, from the sales rollups, sales per product category since the desired start date, sorted by sales
+            # (descending order).  Product categories deleted since are included, without a name:
+            "get_sales_by_category": {
+                "statement": db.select(SalesByCategory.category_id, ProductCategories.name, func.sum(SalesByCategory.sales_amt), func.sum(SalesByCategory.order_count)).outerjoin(ProductCategories, SalesByCategory.category_id == ProductCategories.category_id).where(SalesByCategory.sales_date >= bindparam("start_date", type_=Date)).group_by(SalesByCategory.category_id, ProductCategories.name).order_by(func.sum(SalesByCategory.sales_amt).desc(), SalesByCategory.category_id),
+                "params": ("start_date",),
+                "result": lambda query_results: [SalesCategoryRecord(*sales) for sales in query_results]},
+
+            # Retrieve, from the sales rollups, sales per day since the desired start date, sorted by date (descending order):
+            "get_sales_by_day": {
+                "statement": db.select(SalesByDay.sales_date, SalesByDay.order_count, SalesByDay.sales_amt, SalesByDay.tax_amt, SalesByDay.ship_amt, SalesByDay.total_amt).where(SalesByDay.sales_date >= bindparam("start_date", type_=Date)).order_by(SalesByDay.sales_date.desc()),
+                "params": ("start_date",),
+                "result": lambda query_results: [SalesDayRecord(*sales) for sales in query_results]},
+
+            # Retrieve, from the sales rollups, sales per product since the desired start date, sorted by sales (descending order):
+            "get_sales_by_product": {
+                "statement": db.select(SalesByProduct.product_id, Products.name, func.sum(SalesByProduct.qty_ordered), func.sum(SalesByProduct.sales_amt), func.sum(SalesByProduct.order_count)).outerjoin(Products, SalesByProduct.product_id == Products.product_id).where(SalesByProduct.sales_date >= bindparam("start_date", type_=Date)).group_by(SalesByProduct.product_id, Products.name).order_by(func.sum(SalesByProduct.sales_amt).desc(), SalesByProduct.product_id),
+                "params": ("start_date",),
+                "result": lambda query_results: [SalesProductRecord(*sales) for sales in query_results]},
+
+            # Retrieve the record for the desired unit-of-measure ID:
+            "get_uom_by_id": {
+                "statement": db.select(UnitsOfMeasure).where(UnitsOfMeasure.uom_id == bindparam("uom_id")),
+                "params": ("uom_id",),
+                "result": first_record},
+
+            # Retrieve the record for the desired user ID:
+            "get_user_by_id": {
+                "statement": db.select(Users).where(Users.id == bindparam("user_id")),
+                "params": ("user_id",),
+                "result": first_record},
+
+            # Retrieve the record for the desired username (compared in lower case, so that the index on lower-cased usernames is used):
+            "get_user_by_username": {
+                "statement": db.select(Users).where(func.lower(Users.username) == func.lower(bindparam("username", type_=String))),
+                "params": ("username",),
+                "result": first_record},
+        }
+
+        # Define function for adding the queries which retrieve one page of a list, sorted by a sort key and then by ID (each
+        # backed by an index).  Three queries are added: one for the first page, one for the page after a given row, and one
+        # for the page before a given row (retrieved in reverse order).  The given row is identified by its sort key and ID
+        # ("key" and "id" bound parameters), and the number of rows retrieved by the "page_limit" bound parameter:
+        def add_page_queries(trans_type, statement, sort_key, key, id_column, descending, params, result):
+            record_id = bindparam("id")
+            page_limit = bindparam("page_limit")
+            if descending:
+                after = and_(sort_key <= key, or_(sort_key < key, id_column > record_id))
+                before = and_(sort_key >= key, or_(sort_key > key, id_column < record_id))
+                order, reverse_order = (sort_key.desc(), id_column), (sort_key, id_column.desc())
+            else:
+                after = and_(sort_key >= key, or_(sort_key > key, id_column > record_id))
+                before = and_(sort_key <= key, or_(sort_key < key, id_column < record_id))
+                order, reverse_order = (sort_key, id_column), (sort_key.desc(), id_column.desc())
+
+            queries[trans_type] = {"statement": statement.order_by(*order).limit(page_limit),
+                                   "params": params + ("page_limit",),
+                                   "result": result}
+            queries[trans_type + "_after"] = {"statement": statement.where(after).order_by(*order).limit(page_limit),
+                                              "params": params + ("key", "id", "page_limit"),
+                                              "result": result}
+            queries[trans_type + "_before"] = {"statement": statement.where(before).order_by(*reverse_order).limit(page_limit),
+                                               "params": params + ("key", "id", "page_limit"),
+                                               "result": result}
+
+        # Add the queries which retrieve one page of each admin list (listed in alphabetical order):
+        # - Orders placed by the desired user ID, sorted by order date (descending order) and order ID (ascending order):
+        add_page_queries("get_orders_by_user_id_page",
+                         db.select(Orders.order_id, Orders.date_ordered, Orders.date_paid, Orders.date_shipped, Orders.user_id, Users.name, Users.username, Orders.sales_amt, Orders.tax_amt, Orders.ship_amt, Orders.total_amt, Orders.notes).join(Users, Orders.user_id == Users.id).where(Orders.user_id == bindparam("user_id")),
+                         Orders.date_ordered, bindparam("key", type_=DateTime(timezone=True)), Orders.order_id, True, ("user_id",),
+                         lambda query_results: [OrderRecord(*order) for order in query_results])
+
+        # - Orders placed by all users, sorted by order date (descending order) and order ID (ascending order):
+        add_page_queries("get_orders_page",
+                         db.select(Orders.order_id, Orders.date_ordered, Orders.date_paid, Orders.date_shipped, Orders.user_id, Users.name, Users.username, Orders.sales_amt, Orders.tax_amt, Orders.ship_amt, Orders.total_amt, Orders.notes).join(Users, Orders.user_id == Users.id),
+                         Orders.date_ordered, bindparam("key", type_=DateTime(timezone=True)), Orders.order_id, True, (),
+                         lambda query_results: [OrderRecord(*order) for order in query_results])
+
+        # - Product categories, sorted by name (compared in lower case, so that the index on lower-cased names is used):
+        add_page_queries("get_prod_cats_page", db.select(ProductCategories),
+                         func.lower(ProductCategories.name), func.lower(bindparam("key", type_=String)), ProductCategories.category_id, False, (),
+                         all_records)
+
+        # - Units of measure, sorted by code (compared in lower case, so that the index on lower-cased codes is used):
+        add_page_queries("get_uoms_page", db.select(UnitsOfMeasure),
+                         func.lower(UnitsOfMeasure.code), func.lower(bindparam("key", type_=String)), UnitsOfMeasure.uom_id, False, (),
+                         all_records)
+
+        # - Users, sorted by name (compared in lower case, so that the index on lower-cased names is used):
+        add_page_queries("get_users_page", db.select(Users),
+                         func.lower(Users.name), func.lower(bindparam("key", type_=String)), Users.id, False, (),
+                         all_records)
+
+        # Define function for adding the queries which check whether records of an entity (e.g., "product") are referenced
+        # by other database records (and so cannot be deleted), given the columns which reference the entity's ID:
+        # - "get_<entity>_references" checks one ID, returning a flag per referencing table, via a single query of "EXISTS"
+        #   subqueries (each of which stops at the first referencing row found, rather than retrieving every one).
+        # - "get_referenced_<entity>_ids" checks a batch of IDs, returning the set of those referenced by any table (via the
+        #   same "EXISTS" subqueries, run for each of the entity's records with one of the desired IDs).
+        def add_reference_queries(entity, param, id_column, referencing_columns):
+            queries[f"get_{entity}_references"] = {
+                "statement": db.select(*[exists().where(column == bindparam(param)).label(table_name) for table_name, column in referencing_columns]),
+                "params": (param,),
+                "result": lambda query_results: dict(query_results.mappings().one())}
+            queries[f"get_referenced_{entity}_ids"] = {
+                "statement": db.select(id_column).where(and_(id_column.in_(bindparam(param + "s", expanding=True)), or_(*[exists().where(column == id_column) for _, column in referencing_columns]))),
+                "params": (param + "s",),
+                "result": lambda query_results: set(query_results.scalars().all())}
+
+        # Add the queries which check references to each entity which can be deleted (listed in alphabetical order), with
+        # referencing tables listed in the order in which they are reported:
+        add_reference_queries("prod_cat", "prod_cat_id", ProductCategories.category_id, (("products", Products.category_id),))
+        add_reference_queries("product", "product_id", Products.product_id, (("cart_details", CartDetails.product_id), ("order_details", OrderDetails.product_id)))
+        add_reference_queries("uom", "uom_id", UnitsOfMeasure.uom_id, (("cart_details", CartDetails.uom_id), ("order_details", OrderDetails.uom_id), ("products", Products.uom_id)))
+        add_reference_queries("user", "user_id", Users.id, (("orders", Orders.user_id), ("cart_details", CartDetails.user_id)))
+
+        # Register the queries, and initialize the timing statistics for each:
+        query_registry = queries
+        query_stats = {trans_type: {"calls": 0, "total_secs": 0.0, "max_secs": 0.0} for trans_type in queries}
+
+        # At this point, function is presumed to have executed successfully.  Return
+        # successful-execution indication to the calling function:
+        return True
+
+    except:  # An error has occurred.
+        update_system_log("config_queries", traceback.format_exc())
+
+        # Return failed-execution indication to the calling function:
+        return False
+
+
+def config_templates():
+    """Function for configuring how the templates supporting this website are compiled and reloaded, based on the application's run mode"""
+    try:
+        if APP_MODE == "production":
+            # Cache compiled templates on disk, so that each template is compiled only once (rather than once per worker process):
+            bytecode_cache_dir = TEMPLATE_BYTECODE_CACHE_DIR or os.path.join(app.instance_path, "template_cache")
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+            # Do not check templates for changes each time they are used:
+            app.config["TEMPLATES_AUTO_RELOAD"] = False
+            app.jinja_env.auto_reload = False
+
+            # Compile every template up front (rather than on first use), so that no visitor waits for template compilation:
+            for template_name in app.jinja_env.list_templates(extensions=["html"]):
+                app.jinja_env.get_template(template_name)
+
+        # At this point, function is presumed to have executed successfully.  Return
+        # successful-execution indication to the calling function:
+        return True
+
+    except:  # An error has occurred.
+        update_system_log("config_templates", traceback.format_exc())
+
+        # Return failed-execution indication to the calling function:
+        return False
+
+
 def config_web_forms():
     """Function for configuring the web forms supporting this website"""
     global AddOrEditProductCategoryForm, AddOrEditProductForm, AddOrEditUOMForm, AddOrEditUserForm, AddProductToCartForm, ContactForm, EditCartDetailForm, EditOrderForm, LoginForm, RegisterForm
@@ -2359,6 +2985,24 @@ def config_web_forms():
         return False
 
 
+@contextmanager
+def database_scope():
+    """Function to provide the database session for a unit of data access (the current request's session, if any)"""
+    # Within a request (or any other active app context), share that context's session, which is released at teardown.
+    # Otherwise (e.g., background or command-line callers), push a new app context (and thereby a new session) for the
+    # duration of the unit of data access:
+    if has_app_context():
+        try:
+            yield db.session
+        except:
+            # Roll back the shared session, so that it remains usable for the rest of the request:
+            db.session.rollback()
+            raise
+    else:
+        with app.app_context():
+            yield db.session
+
+
 def email_from_contact_page(form):
     """Function to process a message that user wishes to e-mail from this website to the website administrator."""
     try:
@@ -2393,347 +3037,133 @@ def email_from_contact_page(form):
         return "An error has occurred. Your message was not sent."
 
 
-def retrieve_from_database(trans_type, **kwargs):
-    """Function to retrieve data from this application's database based on the type of transaction"""
-    global app, db
-
+def migrate_database():
+    """Function to bring this application's database schema up to date by applying, in version order, any schema migrations not yet applied"""
     try:
-        with app.app_context():
-            if trans_type == "get_active_product_categories":
-                # Retrieve and return all active product categories, sorted by name, from the "product_categories" database table:
-                return db.session.execute(db.select(ProductCategories).where(ProductCategories.active == True).order_by(func.lower(ProductCategories.name))).scalars().all()
-
-            elif trans_type == "get_active_products_by_category":
-                # Capture optional argument:
-                category_id = kwargs.get("category_id", None)
-
-                # Retrieve and return all active products, sorted by product name, belonging to the referenced product category ID:
-                query_results = Products.query.join(ProductCategories, Products.category_id == ProductCategories.category_id).join(UnitsOfMeasure, Products.uom_id == UnitsOfMeasure.uom_id).filter(and_(Products.active == True, Products.category_id == category_id)).order_by(func.lower(Products.name)).with_entities(Products.product_id, Products.name, Products.unit_price_regular, Products.unit_price_discounted, Products.qty_in_stock, Products.description, Products.product_image, UnitsOfMeasure.code).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "product_id": product.product_id,
-                    "name": product.name,
-                    "unit_price_regular": product.unit_price_regular,
-                    "unit_price_discounted": product.unit_price_discounted,
-                    "qty_in_stock": product.qty_in_stock,
-                    "uom": product.code,
-                    "description": product.description,
-                    "product_image": product.product_image
-                    } for product in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_all_product_categories":
-                # Retrieve and return all existing product categories, sorted by name, from the "product_categories" database table:
-                return db.session.execute(db.select(ProductCategories).order_by(func.lower(ProductCategories.name))).scalars().all()
-
-            elif trans_type == "get_all_products":
-                # Retrieve and return all existing products, sorted by product category name and product name:
-                query_results = db.session.execute(db.select(Products, ProductCategories, UnitsOfMeasure).join(ProductCategories, Products.category_id == ProductCategories.category_id).join(UnitsOfMeasure, Products.uom_id == UnitsOfMeasure.uom_id).order_by(func.lower(ProductCategories.name), func.lower(Products.name))).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "product_id": product.Products.product_id,
-                    "name": product.Products.name,
-                    "category_id": product.Products.category_id,
-                    "category_name": product.ProductCategories.name,
-                    "unit_price_regular": product.Products.unit_price_regular,
-                    "unit_price_discounted": product.Products.unit_price_discounted,
-                    "qty_in_stock": product.Products.qty_in_stock,
-                    "uom_id": product.Products.uom_id,
-                    "uom_name": product.UnitsOfMeasure.code,
-                    "description": product.Products.description,
-                    "active": product.Products.active,
-                    "product_image": product.Products.product_image
-                    } for product in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_all_uoms":
-                # Retrieve and return all existing units of measure, sorted by code, from the "units_of_measure" database table:
-                return db.session.execute(db.select(UnitsOfMeasure).order_by(func.lower(UnitsOfMeasure.code))).scalars().all()
-
-            elif trans_type == "get_all_users":
-                # Retrieve and return all existing users, sorted by name, from the "users" database table:
-                return db.session.execute(db.select(Users).order_by(func.lower(Users.name))).scalars().all()
-
-            elif trans_type == "get_cart_detail_by_id":
-                # Capture optional argument:
-                cart_detail_id = kwargs.get("cart_detail_id", None)
-
-                # Retrieve the record for the desired cart detail ID:
-                query_results = db.session.execute(db.select(CartDetails, Products, UnitsOfMeasure).join(Products, CartDetails.product_id == Products.product_id).join(UnitsOfMeasure, CartDetails.uom_id == UnitsOfMeasure.uom_id).where(CartDetails.cart_detail_id == cart_detail_id)).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "cart_detail_id": cart_detail.CartDetails.cart_detail_id,
-                    "product_id": cart_detail.CartDetails.product_id,
-                    "product_name": cart_detail.Products.name,
-                    "product_image": cart_detail.Products.product_image,
-                    "qty_ordered": cart_detail.CartDetails.qty_ordered,
-                    "uom_id": cart_detail.CartDetails.uom_id,
-                    "uom_name": cart_detail.UnitsOfMeasure.code,
-                    "unit_price": cart_detail.CartDetails.unit_price,
-                    "sales_amt": cart_detail.CartDetails.sales_amt,
-                    "unit_price_updated": cart_detail.CartDetails.unit_price_updated
-                    } for cart_detail in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_cart_detail_by_user_id_and_prod_id":
-                # Capture optional arguments:
-                product_id = kwargs.get("product_id", None)
-                user_id = kwargs.get("user_id", None)
-
-                # Retrieve and return cart detail record where the desired user ID and product ID is referenced:
-                return db.session.execute(db.select(CartDetails).where(and_(CartDetails.product_id == product_id, CartDetails.user_id == user_id))).scalar()
-
-            elif trans_type == "get_cart_details_by_product_id":
-                # Capture optional argument:
-                product_id = kwargs.get("product_id", None)
-
-                # Retrieve and return all cart detail records where the desired product ID is referenced:
-                return db.session.execute(db.select(CartDetails).where(CartDetails.product_id == product_id)).scalars().all()
-
-            elif trans_type == "get_cart_details_by_uom_id":
-                # Capture optional argument:
-                uom_id = kwargs.get("uom_id", None)
-
-                # Retrieve and return all cart detail records where the desired UOM ID is referenced:
-                return db.session.execute(db.select(CartDetails).where(CartDetails.uom_id == uom_id)).scalars().all()
-
-            elif trans_type == "get_cart_details_by_user_id":
-                # Capture optional argument:
-                user_id = kwargs.get("user_id", None)
-
-                # Retrieve and return all cart details for the desired user ID:
-                return db.session.execute(db.select(CartDetails).where(CartDetails.user_id == user_id)).scalars().all()
-
-            elif trans_type == "get_cart_details_by_user_id_with_added_details":
-                # Capture optional argument:
-                user_id = kwargs.get("user_id", None)
-
-                # Retrieve and return all existing cart_details for the desired user ID, sorted by product name, from the "cart_details" database table:
-                query_results = db.session.execute(db.select(CartDetails, Products, UnitsOfMeasure, Users).join(Products, CartDetails.product_id == Products.product_id).join(UnitsOfMeasure, CartDetails.uom_id == UnitsOfMeasure.uom_id).join(Users, CartDetails.user_id == Users.id).where(CartDetails.user_id == user_id).order_by(func.lower(Products.name))).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "cart_detail_id": cart_detail.CartDetails.cart_detail_id,
-                    "user_id": cart_detail.CartDetails.user_id,
-                    "user_name": cart_detail.Users.name,
-                    "user_username": cart_detail.Users.username,
-                    "product_id": cart_detail.CartDetails.product_id,
-                    "product_name": cart_detail.Products.name,
-                    "product_image": cart_detail.Products.product_image,
-                    "qty_ordered": cart_detail.CartDetails.qty_ordered,
-                    "uom_id": cart_detail.CartDetails.uom_id,
-                    "uom_name": cart_detail.UnitsOfMeasure.code,
-                    "uom_desc": cart_detail.UnitsOfMeasure.description,
-                    "unit_price": cart_detail.CartDetails.unit_price,
-                    "sales_amt": cart_detail.CartDetails.sales_amt,
-                    "unit_price_updated": cart_detail.CartDetails.unit_price_updated
-                    } for cart_detail in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_order_by_order_id_with_added_details":
-                # Capture optional argument:
-                order_id = kwargs.get("order_id", None)
-
-                # Retrieve and return desired order:
-                query_results = db.session.execute(db.select(Orders, Users).join(Users, Orders.user_id == Users.id).where(Orders.order_id == order_id)).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "order_id": order.Orders.order_id,
-                    "date_ordered": order.Orders.date_ordered,
-                    "date_paid": order.Orders.date_paid,
-                    "date_shipped": order.Orders.date_shipped,
-                    "user_id": order.Orders.user_id,
-                    "user_name": order.Users.name,
-                    "user_username": order.Users.username,
-                    "sales_amt": order.Orders.sales_amt,
-                    "tax_amt": order.Orders.tax_amt,
-                    "ship_amt": order.Orders.ship_amt,
-                    "total_amt": order.Orders.total_amt,
-                    "notes": order.Orders.notes
-                    } for order in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_order_details_by_order_id":
-                # Capture optional argument:
-                order_id = kwargs.get("order_id", None)
-
-                # Retrieve all order details, sorted by product name, which belong to the desired order ID:
-                query_results = db.session.execute(db.select(OrderDetails, Products, UnitsOfMeasure).join(Products, OrderDetails.product_id == Products.product_id).join(UnitsOfMeasure, OrderDetails.uom_id == UnitsOfMeasure.uom_id).where(OrderDetails.order_id == order_id).order_by(func.lower(Products.name))).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "order_detail_id": order_detail.OrderDetails.order_detail_id,
-                    "product_id": order_detail.OrderDetails.product_id,
-                    "product_name": order_detail.Products.name,
-                    "qty_ordered": order_detail.OrderDetails.qty_ordered,
-                    "uom_id": order_detail.OrderDetails.uom_id,
-                    "uom_name": order_detail.UnitsOfMeasure.code,
-                    "unit_price": order_detail.OrderDetails.unit_price,
-                    "sales_amt": order_detail.OrderDetails.sales_amt
-                    } for order_detail in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_order_details_by_product_id":
-                # Capture optional argument:
-                product_id = kwargs.get("product_id", None)
-
-                # Retrieve and return all order detail records where the desired product ID is referenced:
-                return db.session.execute(db.select(OrderDetails).where(OrderDetails.product_id == product_id)).scalars().all()
-
-            elif trans_type == "get_order_details_by_uom_id":
-                # Capture optional argument:
-                uom_id = kwargs.get("uom_id", None)
-
-                # Retrieve and return all order detail records where the desired UOM ID is referenced:
-                return db.session.execute(db.select(OrderDetails).where(OrderDetails.uom_id == uom_id)).scalars().all()
-
-            elif trans_type == "get_orders_by_user_id":
-                # Capture optional argument:
-                user_id = kwargs.get("user_id", None)
+        with database_scope():
+            # Identify the schema migrations which have already been applied:
+            applied_versions = set(db.session.execute(db.select(SchemaMigrations.version)).scalars().all())
+
+            # Apply each outstanding migration, along with a record of same, within its own database transaction:
+            for version, description, statements in sorted(SCHEMA_MIGRATIONS):
+                if version in applied_versions:
+                    continue
+
+                for statement in statements:
+                    if callable(statement):
+                        statement()
+                    else:
+                        db.session.execute(text(statement))
+                db.session.add(SchemaMigrations(version=version, description=description, date_applied=datetime.now()))
+                db.session.commit()
 
-                # Retrieve and return all orders for the desired user ID:
-                return db.session.execute(db.select(Orders).where(Orders.user_id == user_id)).scalars().all()
+        # At this point, function is presumed to have executed successfully.  Return
+        # successful-execution indication to the calling function:
+        return True
 
-            elif trans_type == "get_orders_by_user_id_with_added_details":
-                # Capture optional argument:
-                user_id = kwargs.get("user_id", None)
+    except:  # An error has occurred.
+        update_system_log("migrate_database", traceback.format_exc())
 
-                # Retrieve and return all existing orders, sorted by order date (descending order) and order ID (ascending order).
-                # - If non-admin user is logged in, only that user's orders should be retrieved.
-                # - If admin is logged in, orders for ALL users should be retrieved.:
-                if admin:
-                    query_results = db.session.execute(db.select(Orders, Users).join(Users, Orders.user_id == Users.id).order_by(Orders.date_ordered.desc(), Orders.order_id)).all()
-                else:
-                    query_results = db.session.execute(db.select(Orders, Users).join(Users, Orders.user_id == Users.id).where(Orders.user_id == user_id).order_by(Orders.date_ordered.desc(), Orders.order_id)).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "order_id": order.Orders.order_id,
-                    "date_ordered": order.Orders.date_ordered,
-                    "date_paid": order.Orders.date_paid,
-                    "date_shipped": order.Orders.date_shipped,
-                    "user_id": order.Orders.user_id,
-                    "user_name": order.Users.name,
-                    "user_username": order.Users.username,
-                    "sales_amt": order.Orders.sales_amt,
-                    "tax_amt": order.Orders.tax_amt,
-                    "ship_amt": order.Orders.ship_amt,
-                    "total_amt": order.Orders.total_amt,
-                    "notes": order.Orders.notes
-                    } for order in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_prod_by_id":
-                # Capture optional argument:
-                product_id = kwargs.get("product_id", None)
+        # Return failed-execution indication to the calling function:
+        return False
 
-                # Retrieve and return the record for the desired product ID:
-                return db.session.execute(db.select(Products).where(Products.product_id == product_id)).scalar()
 
-            elif trans_type == "get_prod_by_id_with_uom":
-                # Capture optional argument:
-                product_id = kwargs.get("product_id", None)
+def retrieve_from_catalog_snapshot(trans_type, **kwargs):
+    """Function to retrieve catalog data from the in-memory catalog snapshot (rather than the database) based on the type of transaction"""
+    try:
+        # Get the current catalog snapshot.  If it could not be obtained, return failed-execution indication to the calling function:
+        catalog = get_catalog_snapshot()
+        if catalog is None:
+            return {}
 
-                # Retrieve and return desired product record, along with UOM code:
-                query_results = db.session.execute(db.select(Products, UnitsOfMeasure).join(UnitsOfMeasure, Products.uom_id == UnitsOfMeasure.uom_id).where(Products.product_id == product_id)).all()
-
-                # Specify what fields to return to the calling function for each record retrieved:
-                records_to_return = [{
-                    "product_id": product.Products.product_id,
-                    "name": product.Products.name,
-                    "unit_price_regular": product.Products.unit_price_regular,
-                    "unit_price_discounted": product.Products.unit_price_discounted,
-                    "qty_in_stock": product.Products.qty_in_stock,
-                    "uom_id": product.Products.uom_id,
-                    "uom_name": product.UnitsOfMeasure.code,
-                    "uom_desc": product.UnitsOfMeasure.description,
-                    "description": product.Products.description,
-                    "product_image": product.Products.product_image
-                    }  for product in query_results]
-
-                # Return the retrieved records (with identified fields) to the calling function:
-                return records_to_return
-
-            elif trans_type == "get_prod_by_name":
-                # Capture optional argument:
-                name = kwargs.get("name", None)
+        if trans_type == "get_active_products_with_category":
+            # Return all active products belonging to active product categories, sorted by product category name and product name:
+            return list(catalog.active_products_with_category)
 
-                # Retrieve and return the record for the desired product name:
-                return db.session.execute(db.select(Products).where(Products.name.ilike(name))).scalar()
+        elif trans_type == "get_prod_by_id_with_uom":
+            # Capture optional argument:
+            product_id = kwargs.get("product_id", None)
 
-            elif trans_type == "get_prod_by_prod_cat_id":
-                # Capture optional argument:
-                prod_cat_id = kwargs.get("prod_cat_id", None)
+            # Return desired product record (as a list containing the record, or an empty list if no such product exists):
+            product = catalog.products_by_id.get(get_catalog_id(product_id))
+            return [] if product is None else [product]
 
-                # Retrieve and return all products belonging to the desired product category ID:
-                return db.session.execute(db.select(ProductCategories).join(Products, ProductCategories.category_id == Products.category_id).where(ProductCategories.category_id == prod_cat_id)).scalars().all()
+        elif trans_type == "get_prod_by_name":
+            # Capture optional argument:
+            name = kwargs.get("name", None)
 
-            elif trans_type == "get_prod_cat_by_id":
-                # Capture optional argument:
-                prod_cat_id = kwargs.get("prod_cat_id", None)
+            # Return the record for the desired product name (case-insensitive):
+            return None if name is None else catalog.products_by_name.get(name.lower())
 
-                # Retrieve and return the record for the desired product category ID:
-                return db.session.execute(db.select(ProductCategories).where(ProductCategories.category_id == prod_cat_id)).scalar()
+        elif trans_type in ("get_products_page", "get_products_page_after", "get_products_page_before"):
+            # Capture optional arguments:
+            product_id = kwargs.get("id", None)
+            page_limit = kwargs.get("page_limit", None)
+
+            # Return one page of all existing products (sorted by product category name and product name), located via the
+            # position of the referenced product, consistent with the database retrievals of one page of a list: the first
+            # page, the page after the referenced product, or the page before it (in reverse order).  Should the referenced
+            # product no longer exist, the first page is returned:
+            position = catalog.product_positions.get(product_id)
+            if trans_type == "get_products_page" or position is None:
+                return list(catalog.products[:page_limit])
+            elif trans_type == "get_products_page_after":
+                return list(catalog.products[position + 1:position + 1 + page_limit])
+            else:
+                return list(reversed(catalog.products[max(position - page_limit, 0):position]))
 
-            elif trans_type == "get_prod_cat_by_name":
-                # Capture optional argument:
-                prod_cat_name = kwargs.get("prod_cat_name", None)
+        elif trans_type == "get_prod_cat_by_name":
+            # Capture optional argument:
+            prod_cat_name = kwargs.get("prod_cat_name", None)
 
-                # Retrieve and return the record for the desired product category name:
-                return db.session.execute(db.select(ProductCategories).where(ProductCategories.name.ilike(prod_cat_name))).scalar()
+            # Return the record for the desired product category name (case-insensitive):
+            return None if prod_cat_name is None else catalog.prod_cats_by_name.get(prod_cat_name.lower())
 
-            elif trans_type == "get_products_by_uom_id":
-                # Capture optional argument:
-                uom_id = kwargs.get("uom_id", None)
+        elif trans_type == "get_uom_by_code":
+            # Capture optional argument:
+            code = kwargs.get("code", None)
 
-                # Retrieve and return all product records where the desired UOM ID is referenced:
-                return db.session.execute(db.select(Products).where(Products.uom_id == uom_id)).scalars().all()
+            # Return the record for the desired unit-of-measure code (case-insensitive):
+            return None if code is None else catalog.uoms_by_code.get(code.lower())
 
-            elif trans_type == "get_uom_by_code":
-                # Capture optional argument:
-                code = kwargs.get("code", None)
+    except:  # An error has occurred.
+        update_system_log("retrieve_from_catalog_snapshot (" + trans_type + ")", traceback.format_exc())
 
-                # Retrieve and return the record for the desired unit-of-measure code:
-                return db.session.execute(db.select(UnitsOfMeasure).where(UnitsOfMeasure.code.ilike(code))).scalar()
+        # Return empty dictionary as a failed-execution indication to the calling function:
+        return {}
 
-            elif trans_type == "get_uom_by_id":
-                # Capture optional argument:
-                uom_id = kwargs.get("uom_id", None)
 
-                # Retrieve and return the record for the desired unit-of-measure ID:
-                return db.session.execute(db.select(UnitsOfMeasure).where(UnitsOfMeasure.uom_id == uom_id)).scalar()
+def retrieve_from_database(trans_type, **kwargs):
+    """Function to retrieve data from this application's database based on the type of transaction"""
+    global app, db
 
-            elif trans_type == "get_user_by_id":
-                # Capture optional argument:
-                user_id = kwargs.get("user_id", None)
+    # Serve read-only catalog lookups from the in-memory catalog snapshot (without querying the database):
+    if trans_type in CATALOG_SNAPSHOT_TRANS_TYPES:
+        return retrieve_from_catalog_snapshot(trans_type, **kwargs)
 
-                # Retrieve and return the record for the desired user ID:
-                return db.session.execute(db.select(Users).where(Users.id == user_id)).scalar()
+    try:
+        # Look up the query registered for the transaction type, and capture its bound parameters from the optional arguments:
+        query = query_registry[trans_type]
+        params = {name: kwargs.get(name, None) for name in query["params"]}
 
-            elif trans_type == "get_user_by_username":
-                # Capture optional argument:
-                username = kwargs.get("username", None)
+        # Identify the database to serve the read (a read replica, if the transaction type allows, or else the primary database):
+        bind_key = get_read_bind_key(trans_type)
 
-                # Retrieve and return the record for the desired username:
-                return db.session.execute(db.select(Users).where(Users.username.ilike(username))).scalar()
+        # Run the query's statement(s), and return the retrieved records (reshaped as needed) to the calling function.  If a
+        # read replica fails to serve the read (e.g., it is unavailable), serve the read from the primary database instead:
+        start = time.perf_counter()
+        with database_scope():
+            try:
+                records_to_return = run_query(trans_type, params, bind_key)
+            except:
+                if bind_key is None:
+                    raise
+                update_system_log("retrieve_from_database (" + trans_type + ", " + bind_key + ")", traceback.format_exc())
+                with replica_state_lock:
+                    replica_state["fallbacks"] += 1
+                records_to_return = run_query(trans_type, params, None)
+        update_query_stats(trans_type, time.perf_counter() - start)
+        return records_to_return
 
     except:  # An error has occurred.
         update_system_log("retrieve_from_database (" + trans_type + ")", traceback.format_exc())
@@ -2750,8 +3180,20 @@ def run_app():
         # Set base directory for this application:
         basedir = os.path.abspath(os.path.dirname(__file__))
 
-        # Configure the SQLite database, relative to the app instance folder:
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///shop.db"
+        # Configure the database (by default, the SQLite database relative to the app instance folder):
+        app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
+
+        # Configure the pool of connections to the database, if it is served by a database server (e.g., PostgreSQL):
+        if not DATABASE_URI.startswith("sqlite"):
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": DATABASE_POOL_SIZE,
+                                                       "max_overflow": DATABASE_MAX_OVERFLOW,
+                                                       "pool_timeout": DATABASE_POOL_TIMEOUT,
+                                                       "pool_recycle": DATABASE_POOL_RECYCLE,
+                                                       "pool_pre_ping": True}
+
+        # Configure the read replicas of the database, if any (each as a separate database engine, or "bind", named in turn
+        # "replica_1", "replica_2", etc.):
+        app.config["SQLALCHEMY_BINDS"] = {f"replica_{i}": replica_uri for i, replica_uri in enumerate(DATABASE_REPLICA_URIS, 1)}
 
         # Configure location where product images will be stored:
         app.config["PRODUCT_IMAGES"] = os.path.join(basedir,"static/product_images")
@@ -2768,20 +3210,104 @@ def run_app():
             update_system_log("run_app", "Error: Database configuration failed.")
             return False
 
+        # Configure database queries.  If function failed, update system log and return
+        # failed-execution indication to the calling function:
+        if not config_queries():
+            update_system_log("run_app", "Error: Database query configuration failed.")
+            return False
+
         # Configure web forms.  If function failed, update system log and return
         # failed-execution indication to the calling function:
         if not config_web_forms():
             update_system_log("run_app", "Error: Web forms configuration failed.")
             return False
 
+        # Configure template compilation and reloading.  If function failed, update system log and return
+        # failed-execution indication to the calling function:
+        if not config_templates():
+            update_system_log("run_app", "Error: Template configuration failed.")
+            return False
+
     except:  # An error has occurred.
         update_system_log("run_app", traceback.format_exc())
         return False
 
 
+def run_query(trans_type, params, bind_key=None):
+    """Function to run a registered query's statement(s) against the desired database (the read replica identified by the bind key, or else the primary database), and return the retrieved records"""
+    # Tag the statement(s) with the transaction type, so that the SQL statements recorded for each request can be attributed to it:
+    query = query_registry[trans_type]
+    execution_options = {"trans_type": trans_type}
+    bind_arguments = None if bind_key is None else {"bind": db.engines[bind_key]}
+    if type(query["statement"]) is tuple:
+        return query["result"](*[db.session.execute(statement, params, execution_options=execution_options, bind_arguments=bind_arguments) for statement in query["statement"]])
+    return query["result"](db.session.execute(query["statement"], params, execution_options=execution_options, bind_arguments=bind_arguments))
+
+
+def add_column_if_missing(table_name, column_name, column_type):
+    """Function to add a column to a database table, within the current database transaction, unless the table already has it (e.g., since the table was created with it)"""
+    connection = db.session.connection()
+    if column_name not in [column["name"] for column in inspect(connection).get_columns(table_name)]:
+        connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+
+
+def begin_write_transaction():
+    """Function to begin a database transaction which writes to the database, acquiring the database's write lock up front (SQLite only)"""
+    # Under SQLite, a transaction which reads before it writes cannot wait for the write lock if another transaction has
+    # written in the meantime (its first write fails at once with "database is locked").  Acquiring the write lock as the
+    # transaction begins waits for the lock instead (up to the busy timeout of the configured SQLite tuning profile):
+    connection = db.session.connection()
+    if connection.dialect.name == "sqlite" and not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def decode_page_cursor(cursor):
+    """Function to decode a cursor identifying a page of an admin list (returns direction, sort key, and ID, or Nones if cursor is absent or invalid)"""
+    if not cursor:
+        return None, None, None
+
+    try:
+        direction, key, record_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if direction not in ("after", "before") or not isinstance(record_id, int):
+            return None, None, None
+        if isinstance(key, dict):
+            key = datetime.fromisoformat(key["datetime"])
+
+        # Return result to the calling function:
+        return direction, key, record_id
+
+    except:  # Cursor is invalid (e.g., has been edited by hand), so the first page will be retrieved.
+        return None, None, None
+
+
+def encode_page_cursor(direction, key, record_id):
+    """Function to encode the page after/before a row of an admin list (identified by its sort key and ID) as an opaque cursor for use in URLs"""
+    if isinstance(key, datetime):
+        key = {"datetime": key.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps([direction, key, record_id]).encode()).decode().rstrip("=")
+
+
+def fill_sales_rollups():
+    """Function to replace the contents of each sales rollup table with the aggregates of all existing orders, within the current database transaction (not committed)"""
+    for model, columns, query in get_sales_rollup_queries(true()):
+        db.session.execute(db.delete(model))
+        db.session.execute(db.insert(model).from_select(columns, query))
+
+
 def get_active_product_categories():
-    """Function to retrieve all active product categories"""
+    """Function to retrieve all active product categories (served from the in-memory cache whenever it is current)"""
     try:
+        # If the cache of active product categories is current, return its contents without querying the database:
+        with active_prod_cat_cache_lock:
+            if active_prod_cat_cache["cached_version"] == active_prod_cat_cache["version"]:
+                active_prod_cat_cache["hits"] += 1
+                active_product_categories = active_prod_cat_cache["records"]
+                return active_product_categories, len(active_product_categories)
+
+            # Record the cache miss, along with the cache version in effect prior to querying the database:
+            active_prod_cat_cache["misses"] += 1
+            version_before_retrieval = active_prod_cat_cache["version"]
+
         # Initialize variable to capture number of active product categories retrieved from the database:
         active_prod_cat_count = 0
 
@@ -2790,6 +3316,14 @@ def get_active_product_categories():
         if not(active_product_categories == {} or active_product_categories == []):
             active_prod_cat_count = len(active_product_categories)  # Record count of active product categories retrieved from the database.
 
+        # Populate the cache with the retrieved records, unless an error has occurred or the cache has been
+        # invalidated (by a product category update) while the database was being queried:
+        if active_product_categories != {}:
+            with active_prod_cat_cache_lock:
+                if active_prod_cat_cache["version"] == version_before_retrieval:
+                    active_prod_cat_cache["records"] = active_product_categories
+                    active_prod_cat_cache["cached_version"] = version_before_retrieval
+
         # Return results to the calling function:
         return active_product_categories, active_prod_cat_count
 
@@ -2801,41 +3335,98 @@ def get_active_product_categories():
         return {},0
 
 
-def get_active_products_by_category(category_id):
-    """Function to retrieve all active products for a particular product category"""
-    try:
-        # Initialize variable to capture number of active products retrieved from the database:
-        active_prod_count = 0
+def get_active_product_categories_cache_stats():
+    """Function to report the hit/miss counters and current version of the active-product-category cache"""
+    with active_prod_cat_cache_lock:
+        return {"version": active_prod_cat_cache["version"],
+                "hits": active_prod_cat_cache["hits"],
+                "misses": active_prod_cat_cache["misses"],
+                "current": active_prod_cat_cache["cached_version"] == active_prod_cat_cache["version"]}
 
-        # Get information on active products in the database for the referenced product category:
-        active_products = retrieve_from_database("get_active_products_by_category", category_id=category_id)
-        if not(active_products == {} or active_products == []):
-            active_prod_count = len(active_products)  # Record count of active products retrieved from the database for the reference product category.
+
+def get_active_products_for_all_categories(active_product_categories):
+    """Function to retrieve all active products (with counts), grouped by active product category, using a single database query"""
+    try:
+        # Initialize a dictionary entry (keyed by product category name) for each active product category:
+        active_prod_dict = {}
+        records_by_category_id = {}
+        for item in active_product_categories:
+            active_prod_dict[item.name] = {"count": 0, "records": []}
+            records_by_category_id[item.category_id] = active_prod_dict[item.name]
+
+        # Get information on all active products in the database (already sorted by product category name and product name):
+        active_products = retrieve_from_database("get_active_products_with_category")
+        if active_products == {}:
+            # Indicate failed retrieval for each product category via an empty dictionary (the failure indication returned by
+            # "retrieve_from_database"), so that each category is shown without products:
+            for item in active_prod_dict.values():
+                item["records"] = {}
+            return active_prod_dict
+
+        # Group the retrieved products by product category:
+        for product in active_products:
+            category_entry = records_by_category_id.get(product["category_id"])
+            if category_entry is not None:
+                category_entry["records"].append(product)
+                category_entry["count"] += 1
 
         # Return results to the calling function:
-        return active_products, active_prod_count
+        return active_prod_dict
 
     except:  # An error has occurred.
         # Log error into system log file:
-        update_system_log("get_active_products_by_category", traceback.format_exc())
+        update_system_log("get_active_products_for_all_categories", traceback.format_exc())
 
         # Return failed-execution indication to the calling function:
-        return {},0
+        return {}
+
+
+def get_cached_page(route):
+    """Function to retrieve the cached rendering of a page for anonymous visitors (returns None if no current rendering is cached)"""
+    with page_cache_lock:
+        page = page_cache["pages"].get((route, catalog_state["version"], admin))
+        if page is None:
+            page_cache["misses"] += 1
+            return None
+
+        # Mark the page as most recently used:
+        page_cache["pages"].move_to_end((route, catalog_state["version"], admin))
+        page_cache["hits"] += 1
+        return page
 
 
 def get_cart_detail_count():
     """Function to retrieve count of cart detail records in cart for user currently logged in"""
     try:
+        # If no user is logged in, there is no cart to count, so skip querying the database:
+        if not current_user.is_authenticated:
+            return 0
+
+        # Capture ID of the user currently logged in:
+        user_id = current_user.id
+
+        # If the cart detail count for the user is already being tracked in memory, return it without querying the database.
+        # Counts are only tracked in memory if a single worker process serves this website (otherwise, the user's cart
+        # may be updated by another worker process):
+        with cart_detail_counts_lock:
+            if CACHE_SYNC_INTERVAL is None and user_id in cart_detail_counts["counts"]:
+                return cart_detail_counts["counts"][user_id]
+
+            # Capture the number of cart updates performed prior to querying the database:
+            writes_before_retrieval = cart_detail_counts["writes"]
+
         # Initialize variable to capture number of cart details retrieved from the database:
         cart_detail_count = 0
 
-        # Get information on cart detail records in the database for user currently logged in.
-        # If no user is logged in (which would trigger an attribute error since there would be
-        # no "current_user" as referenced below), return a count of zero (via "AttributeError"
-        # exception handler below):
-        cart_details = retrieve_from_database("get_cart_details_by_user_id", user_id=current_user.id)
-        if not(cart_details == {} or cart_details == []):
-            cart_detail_count = len(cart_details)  # Record count of cart details in cart.
+        # Get count of cart detail records in the database for user currently logged in:
+        cart_detail_count_in_db = retrieve_from_database("get_cart_detail_count_by_user_id", user_id=user_id)
+        if cart_detail_count_in_db != {}:
+            cart_detail_count = cart_detail_count_in_db
+
+            # Begin tracking the count in memory, unless a cart update took place while the database was being queried:
+            with cart_detail_counts_lock:
+                if CACHE_SYNC_INTERVAL is None and cart_detail_counts["writes"] == writes_before_retrieval:
+                    cart_detail_counts["counts"][user_id] = cart_detail_count
 
         # Return result to the calling function:
         return cart_detail_count
@@ -2851,6 +3442,202 @@ def get_cart_detail_count():
         return "ERROR"
 
 
+def get_cart_totals(user_id, use_cache=True):
+    """Function to calculate the total sales, tax, shipping, and grand total amounts applicable to the contents of a user's cart (reusing the totals last calculated, if the cart has not changed since)"""
+    try:
+        # If the totals for the current version of the user's cart have already been calculated, return them without querying
+        # the database.  Totals are only cached in memory if a single worker process serves this website (otherwise, the
+        # user's cart may be updated by another worker process):
+        use_cache = use_cache and CACHE_SYNC_INTERVAL is None
+        with cart_totals_cache_lock:
+            cart_version = (cart_totals_cache["versions"].get(user_id, 0), cart_totals_cache["price_version"])
+            if use_cache:
+                cached_version, cached_totals = cart_totals_cache["totals"].get(user_id, (None, None))
+                if cached_version == cart_version:
+                    cart_totals_cache["hits"] += 1
+                    return cached_totals
+                cart_totals_cache["misses"] += 1
+
+        # Total the sales amounts across the user's cart details, via one aggregate query:
+        query_results = retrieve_from_database("get_cart_totals_by_user_id", user_id=user_id)
+        if query_results == {}:
+            return None
+        line_count, sum_sales_amt = query_results
+
+        # Calculate the total tax, shipping, and grand total amounts (each rounded to the cent):
+        sum_sales_amt = round(sum_sales_amt, 2)
+        sum_tax_amt = round(sum_sales_amt * RATE_SALES_TAX, 2)
+        sum_ship_amt = round(sum_sales_amt * RATE_SHIPPING, 2)
+        sum_total_amt = round(sum_sales_amt + sum_tax_amt + sum_ship_amt, 2)
+        cart_totals = CartTotals(line_count, sum_sales_amt, sum_tax_amt, sum_ship_amt, sum_total_amt)
+
+        # Cache the totals, unless the user's cart was updated while the database was being queried:
+        if use_cache:
+            with cart_totals_cache_lock:
+                if (cart_totals_cache["versions"].get(user_id, 0), cart_totals_cache["price_version"]) == cart_version:
+                    cart_totals_cache["totals"][user_id] = (cart_version, cart_totals)
+
+        # Return result to the calling function:
+        return cart_totals
+
+    except:  # An error has occurred.
+        # Log error into system log file:
+        update_system_log("get_cart_totals", traceback.format_exc())
+
+        # Return failed-execution indication to the calling function:
+        return None
+
+
+def get_cart_totals_cache_stats():
+    """Function to report the effectiveness of the in-memory cache of cart totals"""
+    with cart_totals_cache_lock:
+        return {"hits": cart_totals_cache["hits"], "misses": cart_totals_cache["misses"], "carts": len(cart_totals_cache["totals"])}
+
+
+def get_catalog_id(value):
+    """Function to convert an ID supplied to a catalog lookup (e.g., from a URL argument) to the integer used to index the catalog snapshot"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_catalog_snapshot():
+    """Function to retrieve the current in-memory catalog snapshot (building it first, if it has not been built yet)"""
+    catalog = catalog_snapshot_state["snapshot"]
+    if catalog is None:
+        catalog = refresh_catalog_snapshot()
+
+    # Return result to the calling function:
+    return catalog
+
+
+def get_catalog_snapshot_stats():
+    """Function to report the size and number of builds of the in-memory catalog snapshot"""
+    catalog = catalog_snapshot_state["snapshot"]
+    return {"builds": catalog_snapshot_state["builds"],
+            "patches": catalog_snapshot_state["patches"],
+            "products": 0 if catalog is None else len(catalog.products),
+            "prod_cats": 0 if catalog is None else len(catalog.prod_cats_by_id),
+            "uoms": 0 if catalog is None else len(catalog.uoms_by_id)}
+
+
+def get_fragment_cache_stats():
+    """Function to report the size and hit/miss counters of the cache of rendered page fragments (header and footer)"""
+    with fragment_cache_lock:
+        return {"fragments": len(fragment_cache["fragments"]),
+                "hits": fragment_cache["hits"],
+                "misses": fragment_cache["misses"]}
+
+
+def get_page_cache_stats():
+    """Function to report the size and hit/miss/eviction counters of the cache of pages rendered for anonymous visitors"""
+    with page_cache_lock:
+        return {"catalog_version": catalog_state["version"],
+                "pages": len(page_cache["pages"]),
+                "bytes": page_cache["bytes"],
+                "hits": page_cache["hits"],
+                "misses": page_cache["misses"],
+                "evictions": page_cache["evictions"]}
+
+
+def get_not_modified_response(etag, last_modified):
+    """Function to build a "304 Not Modified" response if the visitor's cached copy of a page is still current (returns None otherwise)"""
+    # Only requests which retrieve a page can be answered with a "304 Not Modified" response:
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    # If the request identifies the cached copy by its ETag, compare ETags.  Otherwise, compare the time the cached copy
+    # was last modified, which only identifies the cached copy reliably for visitors who are not logged in (since
+    # the navigation bar for logged-in users reflects changes, e.g., to the cart, which are not tracked by time):
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif request.if_modified_since is None or current_user.is_authenticated or request.if_modified_since < last_modified:
+        return None
+
+    # Return a "304 Not Modified" response to the calling function:
+    return set_page_validators(make_response("", 304), etag, last_modified)
+
+
+def get_page(trans_type, cursor=None, **kwargs):
+    """Function to retrieve one page of an admin list, along with cursors for the previous and next pages (None if there is no such page)"""
+    # Identify the page to retrieve from the cursor (the first page, if no valid cursor was supplied):
+    direction, key, record_id = decode_page_cursor(cursor)
+    page_trans_type = trans_type if direction is None else f"{trans_type}_{direction}"
+
+    # Retrieve the page, along with one more row (which indicates whether the list continues beyond the page).  If an error
+    # has occurred, return failed-execution indication to the calling function:
+    records = retrieve_from_database(page_trans_type, key=key, id=record_id, page_limit=ADMIN_PAGE_SIZE + 1, **kwargs)
+    if records == {}:
+        return {}, None, None
+
+    more_records = len(records) > ADMIN_PAGE_SIZE
+    records = records[:ADMIN_PAGE_SIZE]
+    if direction == "before":
+        # If the page before the row is the first page, retrieve a full first page instead:
+        if not more_records:
+            return get_page(trans_type, **kwargs)
+
+        # Pages before a row are retrieved in reverse order:
+        records.reverse()
+        has_previous, has_next = True, True
+    else:
+        has_previous, has_next = direction == "after", more_records
+
+    # Build the cursors for the pages before the first row and after the last row of the page (as applicable):
+    key_field, id_field = PAGE_KEYS[trans_type]
+    previous_cursor = encode_page_cursor("before", getattr(records[0], key_field), getattr(records[0], id_field)) if has_previous and records else None
+    next_cursor = encode_page_cursor("after", getattr(records[-1], key_field), getattr(records[-1], id_field)) if has_next and records else None
+
+    # Return results to the calling function:
+    return records, previous_cursor, next_cursor
+
+
+def get_page_validators(route, product_id=None, has_form=False):
+    """Function to build the ETag and Last-Modified time for a catalog page, without querying the database or rendering the page"""
+    # Capture the catalog version, along with the revision of the product displayed on the page (if any).  Since catalog
+    # versions and product revisions are kept per worker process (and restart from zero), they are qualified by when this
+    # worker process was started:
+    with page_cache_lock:
+        catalog_version = ("started", catalog_state["started"], catalog_state["version"])
+        last_modified = catalog_state["last_modified"]
+        product_revision = 0
+        if product_id is not None:
+            product_id = get_catalog_id(product_id)
+            product_revision, product_last_modified = catalog_state["product_revisions"].get(product_id, (0, last_modified))
+            last_modified = max(last_modified, product_last_modified)
+
+    # If several worker processes serve this website, use the versions shared by all worker processes instead, so that
+    # a page's ETag is the same whichever worker process serves it (the shared "stock" version stands in for the product's
+    # revision, since it is bumped whenever any quantity in stock is reduced):
+    if CACHE_SYNC_INTERVAL is not None:
+        with shared_cache_state_lock:
+            shared_versions = shared_cache_state["versions"]
+        if shared_versions is not None:
+            catalog_version = ("shared", shared_versions.get("catalog"))
+            product_revision = shared_versions.get("stock") if product_id is not None else 0
+
+    # Capture the visitor's state, as reflected in the navigation bar:
+    if current_user.is_authenticated:
+        user_state = (current_user.id, current_user.name, admin, get_request_cart_detail_count())
+    else:
+        user_state = (None, None, admin, 0)
+
+    # For pages containing a form, capture the session's CSRF token, along with the period (half the token's time limit)
+    # in which the page was rendered, so that cached copies of the page do not hold expired CSRF tokens:
+    form_state = None
+    if has_form:
+        csrf_time_limit = app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+        form_state = (session.get("csrf_token"), None if not csrf_time_limit else int(datetime.now().timestamp() // (csrf_time_limit / 2)))
+
+    # Build the ETag:
+    etag = hashlib.sha1(repr((route, catalog_version, product_id, product_revision, user_state, form_state)).encode("utf-8")).hexdigest()
+
+    # Return results to the calling function:
+    return etag, last_modified
+
+
 def get_product_categories_for_selection():
     """Function to retrieve all product categories for populating selection fields on input form(s)"""
     try:
@@ -2873,6 +3660,102 @@ def get_product_categories_for_selection():
         return {},0
 
 
+def get_query_stats():
+    """Function to report the number of calls and the total, average, and maximum time taken by each registered database query"""
+    with query_stats_lock:
+        return {trans_type: {"calls": stats["calls"],
+                             "total_ms": stats["total_secs"] * 1000,
+                             "avg_ms": stats["total_secs"] * 1000 / stats["calls"] if stats["calls"] else 0.0,
+                             "max_ms": stats["max_secs"] * 1000} for trans_type, stats in query_stats.items()}
+
+
+def get_read_bind_key(trans_type):
+    """Function to select the database to serve a read: the next read replica in turn (identified by its bind key), or else the primary database (None)"""
+    # Serve the read from the primary database if no read replica is configured, if the transaction type requires data to be
+    # up to date, or if the user has updated the database recently (since the replicas may have yet to catch up):
+    if not DATABASE_REPLICA_URIS or trans_type not in REPLICA_TRANS_TYPES or \
+            (has_request_context() and time.time() - session.get("last_database_update", 0) < DATABASE_REPLICA_LAG_SECS):
+        with replica_state_lock:
+            replica_state["primary_reads"] += 1
+        return None
+
+    # Otherwise, serve the read from the next read replica in turn:
+    with replica_state_lock:
+        bind_key = f"replica_{replica_state['next'] % len(DATABASE_REPLICA_URIS) + 1}"
+        replica_state["next"] += 1
+        replica_state["replica_reads"][bind_key] = replica_state["replica_reads"].get(bind_key, 0) + 1
+    return bind_key
+
+
+def get_referenced_ids(entity, ids):
+    """Function to identify which of the desired record IDs of an entity (e.g., "product") are referenced by other database records, and so cannot be deleted"""
+    referenced_ids = retrieve_from_database(f"get_referenced_{entity}_ids", **{f"{entity}_ids": [int(record_id) for record_id in ids]})
+
+    # Return result to the calling function (None if the check failed):
+    return None if referenced_ids == {} else referenced_ids
+
+
+def get_replica_stats():
+    """Function to report the number of reads served by the primary database and by each read replica, and the number of replica reads which failed"""
+    with replica_state_lock:
+        return {"replicas": len(DATABASE_REPLICA_URIS),
+                "primary_reads": replica_state["primary_reads"],
+                "replica_reads": dict(replica_state["replica_reads"]),
+                "fallbacks": replica_state["fallbacks"]}
+
+
+def get_request_active_product_categories():
+    """Function to retrieve all active product categories, at most once per request (for population of the navigation bar)"""
+    if "active_product_categories" not in g:
+        g.active_product_categories, g.active_prod_cat_count = get_active_product_categories()
+
+    # Return results to the calling function:
+    return g.active_product_categories, g.active_prod_cat_count
+
+
+def get_request_cart_detail_count():
+    """Function to retrieve count of cart detail records in cart for user currently logged in, at most once per request (for population of the navigation bar)"""
+    if "cart_detail_count" not in g:
+        g.cart_detail_count = get_cart_detail_count()
+
+    # Return result to the calling function:
+    return g.cart_detail_count
+
+
+def get_request_sql_stats():
+    """Function to report, for each route, the number of requests and the SQL statements run (and time spent running them) per request, along with the most recent SQL budget warnings"""
+    with request_sql_stats_lock:
+        routes = {route: {"requests": stats["requests"],
+                          "avg_statements": stats["statements"] / stats["requests"],
+                          "max_statements": stats["max_statements"],
+                          "avg_ms": stats["total_secs"] * 1000 / stats["requests"],
+                          "max_ms": stats["max_secs"] * 1000,
+                          "warnings": stats["warnings"],
+                          "trans_types": dict(stats["trans_types"].most_common())} for route, stats in sorted(request_sql_stats["routes"].items())}
+        return routes, list(request_sql_stats["warnings"])
+
+
+def get_sales_rollup_queries(order_filter):
+    """Function to build, for each sales rollup table, the columns it holds and the query which aggregates them from the desired orders (and their order details)"""
+    # Identify the day each order was placed (SQLite's "date" function returns the date as text in the same format as
+    # SQLite stores dates):
+    if db.session.get_bind().dialect.name == "sqlite":
+        sales_date = func.date(Orders.date_ordered)
+    else:
+        sales_date = db.cast(Orders.date_ordered, Date)
+
+    # Return, for each sales rollup table, the table, its columns, and the query which aggregates them (in key order, so
+    # that concurrent checkouts adding to the same sales rollup records lock them in the same order, rather than deadlock):
+    return [
+        (SalesByCategory, ("sales_date", "category_id", "sales_amt", "order_count"),
+         db.select(sales_date, OrderDetails.category_id, func.sum(OrderDetails.sales_amt), func.count(func.distinct(Orders.order_id))).join(OrderDetails, Orders.order_id == OrderDetails.order_id).where(order_filter).group_by(sales_date, OrderDetails.category_id).order_by(sales_date, OrderDetails.category_id)),
+        (SalesByDay, ("sales_date", "order_count", "sales_amt", "tax_amt", "ship_amt", "total_amt"),
+         db.select(sales_date, func.count(), func.sum(Orders.sales_amt), func.sum(Orders.tax_amt), func.sum(Orders.ship_amt), func.sum(Orders.total_amt)).where(order_filter).group_by(sales_date).order_by(sales_date)),
+        (SalesByProduct, ("sales_date", "product_id", "qty_ordered", "sales_amt", "order_count"),
+         db.select(sales_date, OrderDetails.product_id, func.sum(OrderDetails.qty_ordered), func.sum(OrderDetails.sales_amt), func.count(func.distinct(Orders.order_id))).join(OrderDetails, Orders.order_id == OrderDetails.order_id).where(order_filter).group_by(sales_date, OrderDetails.product_id).order_by(sales_date, OrderDetails.product_id)),
+    ]
+
+
 def get_uoms_for_selection():
     """Function to retrieve all units of measure for populating selection fields on input form(s)"""
     try:
@@ -2895,10 +3778,278 @@ def get_uoms_for_selection():
         return {},0
 
 
+def invalidate_active_product_categories_cache():
+    """Function to invalidate the in-memory cache of active product categories (called after product categories are updated)"""
+    with active_prod_cat_cache_lock:
+        active_prod_cat_cache["version"] += 1
+        active_prod_cat_cache["records"] = None
+
+
+def publish_cache_update(name):
+    """Function to bump the version of data cached in memory (e.g., "catalog"), so that other worker processes discard their copies of same"""
+    # If a single worker process serves this website, there are no other worker processes to notify:
+    if CACHE_SYNC_INTERVAL is None:
+        return
+
+    try:
+        with database_scope():
+            db.session.execute(db.update(CacheVersions).where(CacheVersions.name == name).values(version=CacheVersions.version + 1))
+            version = db.session.execute(db.select(CacheVersions.version).where(CacheVersions.name == name)).scalar()
+            db.session.commit()
+
+        # Record the new version as seen by this worker process (which has already updated its own in-memory copies), so that
+        # its pages' ETags reflect the update at once.  If another worker process has also updated the data since last
+        # checked, check again at the next request instead, so that this worker process discards its copies of that update too:
+        with shared_cache_state_lock:
+            versions = shared_cache_state["versions"]
+            if versions is not None:
+                if version is not None and versions.get(name) == version - 1:
+                    shared_cache_state["versions"] = {**versions, name: version}
+                else:
+                    shared_cache_state["checked"] = 0.0
+
+    except:  # An error has occurred.
+        # Log error into system log file:
+        update_system_log("publish_cache_update (" + name + ")", traceback.format_exc())
+
+
+def rebuild_sales_rollups():
+    """Function to rebuild the sales rollups from all existing orders, within one database transaction (called by the "rebuild-sales-rollups" command)"""
+    try:
+        with database_scope():
+            # Begin the database transaction as a write transaction (so that orders created meanwhile wait their turn):
+            begin_write_transaction()
+
+            # Replace the contents of each sales rollup table with the aggregates of all existing orders:
+            fill_sales_rollups()
+            db.session.commit()
+
+        # At this point, function is presumed to have executed successfully.  Return
+        # successful-execution indication to the calling function:
+        return True
+
+    except:  # An error has occurred.
+        update_system_log("rebuild_sales_rollups", traceback.format_exc())
+
+        # Return failed-execution indication to the calling function:
+        return False
+
+
+def record_database_update():
+    """Function to record when the current user last updated the database, so that the user's reads are served by the primary database for a while afterwards"""
+    if DATABASE_REPLICA_URIS and has_request_context():
+        session["last_database_update"] = time.time()
+
+
+def record_sql_statement(conn, cursor, statement, parameters, context, executemany):
+    """Function to record a SQL statement run on behalf of the current request: its shape, the time taken, and the transaction type of the registered query which ran it, if any (engine event listener)"""
+    elapsed_secs = time.perf_counter() - context.sql_statement_start
+
+    # Only statements run on behalf of a request are recorded:
+    if not has_request_context():
+        return
+
+    # Reduce the statement to its shape, so that repeats of the statement with different parameters can be counted:
+    shape = statement
+    for pattern, replacement in SQL_SHAPE_PATTERNS:
+        shape = pattern.sub(replacement, shape)
+
+    # Record the statement in the request's SQL statistics (checked against the SQL budgets once the request has been handled):
+    stats = g.get("sql_stats")
+    if stats is None:
+        stats = g.sql_stats = {"statements": 0, "secs": 0.0, "shapes": Counter(), "shape_trans_types": {}, "trans_types": Counter()}
+    trans_type = context.execution_options.get("trans_type", "(unregistered)")
+    stats["statements"] += 1
+    stats["secs"] += elapsed_secs
+    stats["shapes"][shape] += 1
+    stats["shape_trans_types"].setdefault(shape, trans_type)
+    stats["trans_types"][trans_type] += 1
+
+
+def refresh_catalog_snapshot(product_ids=None):
+    """Function to rebuild the in-memory catalog snapshot from the database (or, if product IDs are supplied, patch only those products' quantities in stock) and swap it in for the previous one (called after catalog updates are committed)"""
+    try:
+        # Build the new snapshot while holding the lock, so that concurrent rebuilds are serialized and the last one to
+        # complete always reflects the most recently committed catalog updates:
+        with catalog_snapshot_lock:
+            # If only quantities in stock have been updated (and a snapshot exists), re-read just those quantities and
+            # patch them into a copy of the current snapshot, rather than rebuilding the entire snapshot:
+            catalog = catalog_snapshot_state["snapshot"]
+            if product_ids is not None and catalog is not None:
+                qty_in_stock_by_product_id = retrieve_from_database("get_qty_in_stock_by_product_ids", product_ids=list(product_ids))
+                if qty_in_stock_by_product_id != {}:
+                    catalog = catalog.with_qty_in_stock(qty_in_stock_by_product_id)
+                    catalog_snapshot_state["snapshot"] = catalog
+                    catalog_snapshot_state["patches"] += 1
+
+                    # Return result to the calling function:
+                    return catalog
+
+            catalog = retrieve_from_database("get_catalog_snapshot")
+            if not isinstance(catalog, CatalogSnapshot):
+                catalog = None
+
+            # Swap in the new snapshot (readers holding the previous snapshot continue to use it, unchanged).  If the
+            # rebuild failed, the previous snapshot is discarded, so that it is rebuilt when next needed:
+            catalog_snapshot_state["snapshot"] = catalog
+            if catalog is not None:
+                catalog_snapshot_state["builds"] += 1
+
+        # Return result to the calling function:
+        return catalog
+
+    except:  # An error has occurred.
+        # Log error into system log file:
+        update_system_log("refresh_catalog_snapshot", traceback.format_exc())
+
+        # Return failed-execution indication to the calling function:
+        return None
+
+
+def refresh_sqlite_replicas():
+    """Function to bring each SQLite read replica up to date by copying the primary SQLite database into it (returns the number of replicas copied, or None if an error has occurred)"""
+    try:
+        with database_scope():
+            # Only a SQLite database can be copied to its read replicas:
+            if db.engine.dialect.name != "sqlite":
+                update_system_log("refresh_sqlite_replicas", "Error: The primary database is not a SQLite database.")
+                return None
+
+            # Copy the primary database into each SQLite read replica, via SQLite's online backup (which copies a consistent
+            # snapshot of the primary database, even while it is being updated):
+            replica_engines = [engine for bind_key, engine in db.engines.items() if bind_key is not None and engine.dialect.name == "sqlite"]
+            source = sqlite3.connect(db.engine.url.database)
+            try:
+                for engine in replica_engines:
+                    target = sqlite3.connect(engine.url.database)
+                    try:
+                        source.backup(target)
+                    finally:
+                        target.close()
+            finally:
+                source.close()
+
+        # Return the number of replicas copied to the calling function:
+        return len(replica_engines)
+
+    except:  # An error has occurred.
+        update_system_log("refresh_sqlite_replicas", traceback.format_exc())
+
+        # Return failed-execution indication to the calling function:
+        return None
+
+
+def set_page_validators(response, etag, last_modified):
+    """Function to attach the ETag and Last-Modified time of a catalog page to a response, requiring browsers and proxies to revalidate cached copies"""
+    # ETags are weak, since pages containing a form differ by CSRF token each time they are rendered:
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+
+    # Require cached copies to be revalidated before use.  Pages for logged-in users may only be cached by their browsers:
+    response.cache_control.no_cache = True
+    if current_user.is_authenticated:
+        response.cache_control.private = True
+    response.vary.add("Cookie")
+
+    # Return the response to the calling function:
+    return response
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Function to apply the configured SQLite tuning profile to a new database connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PROFILES[SQLITE_PROFILE].items():
+        cursor.execute(f"PRAGMA {pragma} = {value}")
+    cursor.close()
+
+
+def start_sql_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    """Function to note when a SQL statement starts running, for timing by "record_sql_statement" (engine event listener)"""
+    context.sql_statement_start = time.perf_counter()
+
+
+def store_cached_page(route, page, catalog_version):
+    """Function to cache the rendering of a page for anonymous visitors (rendered from the desired catalog version), evicting least recently used pages as needed"""
+    page_size = len(page.encode("utf-8"))
+
+    # Pages too large to ever fit in the cache are not cached:
+    if page_size > PAGE_CACHE_MAX_BYTES:
+        return
+
+    with page_cache_lock:
+        # If the catalog has been updated since the page began to be rendered, the page may reflect the previous version of
+        # the catalog, so it is not cached:
+        if catalog_state["version"] != catalog_version:
+            return
+
+        # Cache the page (replacing any existing rendering of same):
+        key = (route, catalog_version, admin)
+        existing_page = page_cache["pages"].pop(key, None)
+        if existing_page is not None:
+            page_cache["bytes"] -= len(existing_page.encode("utf-8"))
+        page_cache["pages"][key] = page
+        page_cache["bytes"] += page_size
+
+        # Evict least recently used pages until the cache is within its size limits:
+        while len(page_cache["pages"]) > PAGE_CACHE_MAX_ENTRIES or page_cache["bytes"] > PAGE_CACHE_MAX_BYTES:
+            evicted_key, evicted_page = page_cache["pages"].popitem(last=False)
+            page_cache["bytes"] -= len(evicted_page.encode("utf-8"))
+            page_cache["evictions"] += 1
+
+
+def update_cart_detail_count(user_id, change=None, new_count=None):
+    """Function to keep the in-memory cart detail count for a user in step with updates to that user's cart"""
+    with cart_detail_counts_lock:
+        # Record that a cart update has taken place:
+        cart_detail_counts["writes"] += 1
+
+        # Apply the update to the user's count.  Changes are only applied to counts already being tracked
+        # (untracked counts are retrieved from the database when next needed):
+        if new_count is not None:
+            cart_detail_counts["counts"][user_id] = new_count
+        elif change is not None and user_id in cart_detail_counts["counts"]:
+            cart_detail_counts["counts"][user_id] += change
+        else:
+            cart_detail_counts["counts"].pop(user_id, None)
+
+
+def update_cart_version(user_id=None):
+    """Function to bump the version of a user's cart (or, if no user ID is supplied, of every cart, e.g., after a price update), so that cached cart totals are recalculated"""
+    with cart_totals_cache_lock:
+        if user_id is None:
+            cart_totals_cache["price_version"] += 1
+            cart_totals_cache["totals"].clear()
+        else:
+            cart_totals_cache["versions"][user_id] = cart_totals_cache["versions"].get(user_id, 0) + 1
+            cart_totals_cache["totals"].pop(user_id, None)
+
+
+def update_catalog_version(publish=True):
+    """Function to bump the product catalog version (called after products, product categories, or units of measure are updated)"""
+    # Rebuild the catalog snapshot first, so that any page rendered once the version has been bumped (and cached under the
+    # new version) reflects the update:
+    refresh_catalog_snapshot()
+
+    with page_cache_lock:
+        catalog_state["version"] += 1
+        catalog_state["last_modified"] = datetime.now(timezone.utc).replace(microsecond=0)
+
+        # Discard cached renderings of pages, since they reflect the previous version of the catalog:
+        page_cache["pages"].clear()
+        page_cache["bytes"] = 0
+
+    # Publish the update to any other worker processes serving this website:
+    if publish:
+        publish_cache_update("catalog")
+
+
 def update_database(trans_type, **kwargs):
     """Function to update this application's database based on the type of transaction"""
     try:
-        with app.app_context():
+        # Record the update, so that the user's reads are served by the primary database until the read replicas catch up:
+        record_database_update()
+
+        with database_scope():
             if trans_type == "add_prod":
                 # Capture optional argument:
                 form = kwargs.get("form", None)
@@ -2944,6 +4095,9 @@ def update_database(trans_type, **kwargs):
                 db.session.add_all(new_records)
                 db.session.commit()
 
+                # Invalidate the cache of active product categories (used for population of the navigation bar):
+                invalidate_active_product_categories_cache()
+
             elif trans_type == "add_prod_to_cart":
                 # Capture optional arguments:
                 form = kwargs.get("form", None)
@@ -2973,6 +4127,10 @@ def update_database(trans_type, **kwargs):
                 db.session.add_all(new_records)
                 db.session.commit()
 
+                # Update the user's cart detail count (used for population of the navigation bar) and cart version:
+                update_cart_detail_count(int(user_id), change=1)
+                update_cart_version(int(user_id))
+
             elif trans_type == "add_uom":
                 # Capture optional argument:
                 form = kwargs.get("form", None)
@@ -3030,10 +4188,18 @@ def update_database(trans_type, **kwargs):
                 # Capture optional argument:
                 cart_detail_id = kwargs.get("cart_detail_id", None)
 
+                # Capture the ID of the user whose cart contains the cart detail to be deleted:
+                user_id = db.session.execute(db.select(CartDetails.user_id).where(CartDetails.cart_detail_id == cart_detail_id)).scalar()
+
                 # Delete the cart detail record associated with the selected ID:
-                db.session.query(CartDetails).where(CartDetails.cart_detail_id == cart_detail_id).delete()
+                deleted_count = db.session.query(CartDetails).where(CartDetails.cart_detail_id == cart_detail_id).delete()
                 db.session.commit()
 
+                # Update the user's cart detail count (used for population of the navigation bar) and cart version:
+                if user_id is not None:
+                    update_cart_detail_count(user_id, change=-deleted_count)
+                    update_cart_version(user_id)
+
             elif trans_type == "delete_prod_by_id":
                 # Capture optional argument:
                 product_id = kwargs.get("product_id", None)
@@ -3050,6 +4216,9 @@ def update_database(trans_type, **kwargs):
                 db.session.query(ProductCategories).where(ProductCategories.category_id == prod_cat_id).delete()
                 db.session.commit()
 
+                # Invalidate the cache of active product categories (used for population of the navigation bar):
+                invalidate_active_product_categories_cache()
+
             elif trans_type == "delete_uom_by_id":
                 # Capture optional argument:
                 uom_id = kwargs.get("uom_id", None)
@@ -3098,6 +4267,9 @@ def update_database(trans_type, **kwargs):
 
                 db.session.commit()
 
+                # Invalidate the cache of active product categories (used for population of the navigation bar):
+                invalidate_active_product_categories_cache()
+
             elif trans_type == "edit_prod_in_cart":
                 # Capture optional arguments:
                 cart_detail_id = kwargs.get("cart_detail_id", None)
@@ -3110,6 +4282,9 @@ def update_database(trans_type, **kwargs):
 
                 db.session.commit()
 
+                # Update the user's cart version:
+                update_cart_version(record_to_edit.user_id)
+
             elif trans_type == "edit_uom":
                 # Capture optional arguments:
                 form = kwargs.get("form", None)
@@ -3136,6 +4311,10 @@ def update_database(trans_type, **kwargs):
 
                 db.session.commit()
 
+        # If the product catalog has been updated, bump its version (which invalidates cached renderings of catalog pages and rebuilds the catalog snapshot):
+        if trans_type in ("add_prod", "add_prod_cat", "add_uom", "delete_prod_by_id", "delete_prod_cat_by_id", "delete_uom_by_id", "edit_prod_cat", "edit_uom"):
+            update_catalog_version()
+
         # Return successful-execution indication to the calling function:
         return True
 
@@ -3149,49 +4328,55 @@ def update_database(trans_type, **kwargs):
 def update_database_with_trans(trans_type, **kwargs):
     """Function to perform a multi-step database update (wrapped inside a database transaction) based on the type of transaction"""
     try:
+        # Record the update, so that the user's reads are served by the primary database until the read replicas catch up:
+        record_database_update()
+
         if trans_type == "create_order":
             # Capture optional argument:
             user_id = kwargs.get("user_id", None)
 
+            # Begin the database transaction as a write transaction (so that concurrent checkouts wait their turn rather than fail):
+            begin_write_transaction()
+
             # Initialize a "savepoint" object which will allow nesting of multiple db update steps within one transaction so that
             # either all steps execute successfully and are committed OR are all rolled back:
             savepoint = db.session.begin_nested()
 
-            # Retrieve order record with the highest order ID number:
-            existing_orders = db.session.query(Orders).order_by(Orders.order_id.desc()).first()
-            if existing_orders == None:
-                new_order_id = 1
-            else:  # No orders were retrieved:
-                new_order_id = existing_orders.order_id + 1
-
-            # Retrieve existing cart details:
-            existing_cart_details = retrieve_from_database("get_cart_details_by_user_id_with_added_details", user_id=user_id)
-            if existing_cart_details == {} or existing_cart_details == []:
-                savepoint.rollback()
+            # Retrieve the IDs of the products in the cart, and the cart's totals (calculated afresh within this transaction,
+            # rather than reused from the cache, so that they reflect exactly the cart contents being ordered):
+            ordered_product_ids = retrieve_from_database("get_cart_product_ids_by_user_id", user_id=user_id)
+            cart_totals = get_cart_totals(user_id, use_cache=False)
+            if ordered_product_ids == {} or ordered_product_ids == set() or cart_totals is None:
+                db.session.rollback()
                 return False
 
             else:
-                # Initialize variables for total sales, tax, shipping, and grand total values across cart details:
-                sum_sales_amt = 0
-                sum_tax_amt = 0
-                sum_ship_amt = 0
-                sum_total_amt = 0
-
-                # Total the sales_amt values across cart details:
-                for detail in existing_cart_details:
-                    sum_sales_amt += detail["sales_amt"]
-
-                # Calculate the totaL tax and shipping amounts applicable to the cart contents:
-                sum_tax_amt = round(sum_sales_amt * RATE_SALES_TAX, 2)
-                sum_ship_amt = round(sum_sales_amt * RATE_SHIPPING, 2)
-
-                # Calculate the grand total amt applicable to the cart contents:
-                sum_total_amt = sum_sales_amt + sum_tax_amt + sum_ship_amt
-
-                # Create a new order for this purchase:
-                new_records = []
-                new_record = Orders(
-                    order_id=new_order_id,
+                # Capture the total sales, tax, shipping, and grand total amounts applicable to the cart contents:
+                sum_sales_amt = cart_totals.sales_amt
+                sum_tax_amt = cart_totals.tax_amt
+                sum_ship_amt = cart_totals.ship_amt
+                sum_total_amt = cart_totals.total_amt
+
+                # Under PostgreSQL, lock the records of the products ordered in product ID order before updating them, so that
+                # concurrent checkouts of the same products wait their turn rather than deadlock (by locking the records in the
+                # differing orders in which they are updated).  The lock taken is the one the update takes ("FOR NO KEY UPDATE"),
+                # which does not block records referencing the products (e.g., cart details) from being inserted meanwhile.
+                # Under SQLite, the write transaction has already serialized checkouts:
+                if db.session.get_bind().dialect.name != "sqlite":
+                    db.session.execute(db.select(Products.product_id).where(Products.product_id.in_(ordered_product_ids)).order_by(Products.product_id).with_for_update(key_share=True))
+
+                # Reduce the quantity in stock of every product ordered, via one statement which only does so where enough
+                # remains in stock.  Should any product fall short (e.g., bought by a concurrent buyer since being added to
+                # the cart), fewer products are updated than ordered, so roll back the entire order:
+                qty_ordered = db.select(func.sum(CartDetails.qty_ordered)).where(and_(CartDetails.user_id == user_id, CartDetails.product_id == Products.product_id)).scalar_subquery()
+                stock_update = db.session.execute(db.update(Products).where(and_(Products.product_id.in_(ordered_product_ids), Products.qty_in_stock >= qty_ordered)).values(qty_in_stock=Products.qty_in_stock - qty_ordered).execution_options(synchronize_session=False))
+                if stock_update.rowcount != len(ordered_product_ids):
+                    db.session.rollback()
+                    return False
+
+                # Create a new order for this purchase.  Its order ID is assigned by the database as the order is inserted
+                # (so concurrent checkouts can never be assigned the same order ID):
+                new_order = Orders(
                     date_ordered=datetime.date(datetime.now()),
                     date_paid=datetime.date(datetime.now()),
                     user_id=user_id,
@@ -3200,45 +4385,46 @@ def update_database_with_trans(trans_type, **kwargs):
                     ship_amt=sum_ship_amt,
                     total_amt=sum_total_amt
                 )
-                new_records.append(new_record)
-                db.session.add_all(new_records)
+                db.session.add(new_order)
+                db.session.flush()
+                new_order_id = new_order.order_id
 
-                # Upload, to the "order_details" database table, existing cart details:
-                new_records = []
-                for detail in existing_cart_details:
-                    new_record = OrderDetails(
-                        order_id=new_order_id,
-                        product_id=int(detail["product_id"]),
-                        qty_ordered=detail["qty_ordered"],
-                        uom_id=int(detail["uom_id"]),
-                        unit_price=detail["unit_price"],
-                        sales_amt=detail["sales_amt"],
-                    )
-                    new_records.append(new_record)
-                    db.session.add_all(new_records)
-
-                # Update quantity in stock for each product involved in this order:
-                for detail in existing_cart_details:
-                    ordered_product = retrieve_from_database("get_prod_by_id", product_id=detail["product_id"])
-                    if ordered_product == {} or ordered_product == None:
-                        return False
-                    else:
-                        record_to_edit = db.session.query(Products).filter(Products.product_id == detail["product_id"]).first()
-                        if record_to_edit == None:
-                            return False
-                        else:
-                            record_to_edit.qty_in_stock -= detail["qty_ordered"]
+                # Upload, to the "order_details" database table, existing cart details along with each product's current
+                # category (copied by the database in one statement, however many cart details there are):
+                db.session.execute(db.insert(OrderDetails).from_select(
+                    ["order_id", "product_id", "qty_ordered", "uom_id", "unit_price", "sales_amt", "category_id"],
+                    db.select(literal(new_order_id), CartDetails.product_id, CartDetails.qty_ordered, CartDetails.uom_id, CartDetails.unit_price, CartDetails.sales_amt, Products.category_id).join(Products, CartDetails.product_id == Products.product_id).where(CartDetails.user_id == user_id).order_by(CartDetails.cart_detail_id)))
+
+                # Add the new order to the sales rollups (used for population of the sales report):
+                update_sales_rollups(new_order_id)
 
             # Delete cart contents:
             db.session.query(CartDetails).where(CartDetails.user_id == user_id).delete()
 
-            # Commit the multi-step database transaction:
+            # Commit the multi-step database transaction (releasing the savepoint, then committing the transaction containing it):
             savepoint.commit()
+            db.session.commit()
+
+            # Update the user's cart detail count (used for population of the navigation bar) and cart version, since the cart is now empty:
+            update_cart_detail_count(user_id, new_count=0)
+            update_cart_version(user_id)
+
+            # Patch the catalog snapshot, so that catalog lookups reflect the reduced quantities in stock:
+            refresh_catalog_snapshot(product_ids=ordered_product_ids)
+
+            # Bump the revision of each product ordered, since its quantity in stock has been reduced:
+            update_product_revisions(ordered_product_ids)
+
+            # Publish the update of quantities in stock to any other worker processes serving this website:
+            publish_cache_update("stock")
 
             # Return new order ID to the calling function:
             return new_order_id
 
         elif trans_type == "edit_product":
+            # Begin the database transaction as a write transaction (so that concurrent updates wait their turn rather than fail):
+            begin_write_transaction()
+
             # Initialize a "savepoint" object which will allow nesting of multiple db update steps within one transaction so that
             # either all steps execute successfully and are committed OR are all rolled back:
             savepoint = db.session.begin_nested()
@@ -3290,7 +4476,9 @@ def update_database_with_trans(trans_type, **kwargs):
                 record_to_edit.active = form.chk_active.data
 
             else:
-                # Return failed-execution indication to the calling function:
+                # Roll back the database transaction (releasing the write lock taken as it began), and return failed-execution
+                # indication to the calling function:
+                db.session.rollback()
                 return False
 
             # If price in effect has been changed, perform part 2 of multi-step database transaction:
@@ -3302,15 +4490,26 @@ def update_database_with_trans(trans_type, **kwargs):
                      'unit_price_updated': True
                      })
 
-            # Commit the multi-step database transaction:
+            # Commit the multi-step database transaction (releasing the savepoint, then committing the transaction containing it):
             savepoint.commit()
+            db.session.commit()
+
+            # Bump the product catalog version (which invalidates cached renderings of catalog pages and rebuilds the catalog snapshot):
+            update_catalog_version()
+
+            # Bump the revision of the edited product:
+            update_product_revisions([product_id])
+
+            # If the price in effect has been changed, bump the version of every cart (since carts containing the product have been repriced):
+            if unit_price_before_update != unit_price_after_update:
+                update_cart_version()
 
         # Return successful-execution indication to the calling function:
         return True
 
     except:  # An error has occurred.
-        # Roll back database transaction:
-        savepoint.rollback()
+        # Roll back database transaction (including the savepoint, if one has been created):
+        db.session.rollback()
 
         # Log error into system log file:
         update_system_log("update_database_with_trans (" + trans_type + ")", traceback.format_exc())
@@ -3319,6 +4518,41 @@ def update_database_with_trans(trans_type, **kwargs):
         return False
 
 
+def update_product_revisions(product_ids):
+    """Function to bump the revision of each referenced product (called after product records are updated, e.g., quantities in stock)"""
+    with page_cache_lock:
+        last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        for product_id in set(product_ids):
+            product_id = get_catalog_id(product_id)
+            revision, _ = catalog_state["product_revisions"].get(product_id, (0, last_modified))
+            catalog_state["product_revisions"][product_id] = (revision + 1, last_modified)
+
+
+def update_query_stats(trans_type, elapsed_secs):
+    """Function to record the time taken by a registered database query, and pass it on to any query timing hooks"""
+    with query_stats_lock:
+        stats = query_stats[trans_type]
+        stats["calls"] += 1
+        stats["total_secs"] += elapsed_secs
+        if elapsed_secs > stats["max_secs"]:
+            stats["max_secs"] = elapsed_secs
+
+    for hook in query_timing_hooks:
+        hook(trans_type, elapsed_secs)
+
+
+def update_sales_rollups(order_id):
+    """Function to add an order (and its order details) to the sales rollups, within the database transaction which creates the order"""
+    # Add the order's aggregates to each sales rollup table, adding to any aggregates already held for the same day (and
+    # product or product category).  Errors are left to the calling function, so that the order is rolled back with them:
+    dialect = postgresql if db.session.get_bind().dialect.name == "postgresql" else sqlite
+    for model, columns, query in get_sales_rollup_queries(Orders.order_id == order_id):
+        statement = dialect.insert(model).from_select(columns, query)
+        key_columns = [column.name for column in model.__table__.primary_key.columns]
+        db.session.execute(statement.on_conflict_do_update(index_elements=key_columns,
+                                                           set_={column: getattr(model, column) + statement.excluded[column] for column in columns if column not in key_columns}))
+
+
 def update_system_log(activity, log):
     """Function to update the system log, either to log errors encountered or log successful execution of milestone admin. updates"""
     try:
@@ -3343,81 +4577,20 @@ def update_system_log(activity, log):
 def validate_delete(entity, **kwargs):
     """Function to check if "delete" request meets database requirements prior to deleting desired record"""
     try:
-        if entity == "prod_cat":
-            # Capture optional argument:
-            prod_cat_id = kwargs.get("prod_cat_id", None)
+        # Capture optional argument (the ID of the record to be deleted, e.g., "product_id" for a product):
+        record_id = int(kwargs.get(f"{entity}_id", None))
 
-            # Check if prod_cat_id exists in the "products" database table.  If yes, then deletion cannot proceed:
-            prod_cat_id_in_products = retrieve_from_database("get_prod_by_prod_cat_id", prod_cat_id=prod_cat_id)
-            if prod_cat_id_in_products == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif prod_cat_id_in_products != []:
-                return False, "Product category exists in one or more products.  Deletion cannot be performed."
+        # Check if the record belongs to the admin:
+        if entity == "user" and record_id == 1:
+            return False, "Selected user cannot be deleted."
 
-        elif entity == "product":
-            # Capture optional argument:
-            product_id = kwargs.get("product_id", None)
-
-            # Check if product_id exists in the "cart_details" database table.  If yes, then deletion cannot proceed:
-            product_id_in_cart_details = retrieve_from_database("get_cart_details_by_product_id", product_id=product_id)
-            if product_id_in_cart_details == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif product_id_in_cart_details != []:
-                return False, "Product exists in one or more cart details.  Deletion cannot be performed."
-
-            # Check if product_id exists in the "order_details" database table.  If yes, then deletion cannot proceed:
-            product_id_in_order_details = retrieve_from_database("get_order_details_by_product_id", product_id=product_id)
-            if product_id_in_order_details == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif product_id_in_order_details != []:
-                return False, "Product exists in one or more order details.  Deletion cannot be performed."
-
-        elif entity == "user":
-            # Capture optional argument:
-            user_id = kwargs.get("user_id", None)
-
-            # Check if user_id belongs to the admin.:
-            if user_id == 1:
-                return False, "Selected user cannot be deleted."
-
-            # Check if user_id exists in the "orders" database table.  If yes, then deletion cannot proceed:
-            user_id_in_orders = retrieve_from_database("get_orders_by_user_id", user_id=user_id)
-            if user_id_in_orders == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif user_id_in_orders != []:
-                return False, "User exists in one or more orders.  Deletion cannot be performed."
-
-            # Check if user_id exists in the "cart_details" database table.  If yes, then deletion cannot proceed:
-            user_id_in_cart_details = retrieve_from_database("get_cart_details_by_user_id", user_id=user_id)
-            if user_id_in_cart_details == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif user_id_in_cart_details != []:
-                return False, "User exists in one or more cart details.  Deletion cannot be performed."
-
-        elif entity == "uom":
-            # Capture optional argument:
-            uom_id = int(kwargs.get("uom_id", None))
-
-            # Check if uom_id exists in the "cart_details" database table.  If yes, then deletion cannot proceed:
-            uom_id_in_cart_details = retrieve_from_database("get_cart_details_by_uom_id", uom_id=uom_id)
-            if uom_id_in_cart_details == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif uom_id_in_cart_details != []:
-                return False, "UOM exists in one or more cart details.  Deletion cannot be performed."
-
-            # Check if uom_id exists in the "order_details" database table.  If yes, then deletion cannot proceed:
-            uom_id_in_order_details = retrieve_from_database("get_order_details_by_uom_id", uom_id=uom_id)
-            if uom_id_in_order_details == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif uom_id_in_order_details != []:
-                return False, "UOM exists in one or more order details.  Deletion cannot be performed."
-
-            # Check if uom_id exists in the "products" database table.  If yes, then deletion cannot proceed:
-            uom_id_in_products = retrieve_from_database("get_products_by_uom_id", uom_id=uom_id)
-            if uom_id_in_products == {}:
-                return False, "An error has occurred in validating deletion request."
-            elif uom_id_in_products != []:
-                return False, "UOM exists in one or more products.  Deletion cannot be performed."
+        # Check, via one query, if the record is referenced by any other database table.  If yes, then deletion cannot proceed:
+        references = retrieve_from_database(f"get_{entity}_references", **{f"{entity}_id": record_id})
+        if references == {}:
+            return False, "An error has occurred in validating deletion request."
+        for table_name, referenced in references.items():
+            if referenced:
+                return False, f"{DELETE_ENTITY_NAMES[entity]} exists in one or more {table_name.replace('_', ' ')}.  Deletion cannot be performed."
 
         # At this point, validation is deemed to have passed all validation checks.
         # Return successful-validation indication to the calling function:
@@ -3434,4 +4607,4 @@ run_app()
 dlg.Destroy()
 
 if __name__ == "__main__":
-    app.run(debug=True, port=5003)
+    app.run(debug=(APP_MODE != "production"), port=5003)